@@ -13,6 +13,11 @@ import random
 import argparse
 import sys
 import re
+import time
+import os
+from babel_core import build_page_corpus, mount_corpus
+from babel_tools import iter_search
+from babel_store import SearchLedger, mount_corpus_dir, CORPUS_DIR, CORPUS_SUFFIX
 
 # Fixed character set used by the Library
 ALPHABET = "abcdefghijklmnopqrstuvwxyz ,."
@@ -22,17 +27,14 @@ def generate_page(seed, length=3200):
     rng = random.Random(seed)
     return ''.join(rng.choices(ALPHABET, k=length))
 
-def search_for_phrase(phrase, max_attempts=100000, max_matches=5, page_length=3200):
-    """Search for a phrase in randomly generated pages. Returns a list of (seed, index)."""
-    found = []
-    for i in range(max_attempts):
-        page = generate_page(i, length=page_length)
-        idx = page.find(phrase)
-        if idx != -1:
-            found.append((i, idx))
-            if len(found) >= max_matches:
-                break
-    return found
+def search_for_phrase(phrase, max_attempts=100000, max_matches=5, page_length=3200,
+                      anchored=False, window=None):
+    """Search for a phrase in randomly generated pages. Returns a list of (seed, index).
+
+    With anchored or window set, only the page prefix the phrase may start in is generated.
+    """
+    records = iter_search(phrase, max_attempts, max_matches, page_length, anchored=anchored, window=window)
+    return [(r['seed'], r['index']) for r in records if r['type'] == 'hit']
 
 def format_page_output(page_text, width=80, highlight=None, highlight_index=None):
     """Format the page for display, optionally highlighting a phrase at highlight_index."""
@@ -79,6 +81,15 @@ def main():
     parser.add_argument("--max-matches", type=int, default=5, help="Number of matches to find.")
     parser.add_argument("--max-attempts", type=int, default=100000, help="Maximum number of pages to search.")
     parser.add_argument("--page-length", type=int, default=3200, help="Length of each page.")
+    parser.add_argument("--anchored", action="store_true", help="Only match the phrase at the start of a page.")
+    parser.add_argument("--window", type=int, help="Only match the phrase starting within the first N characters.")
+    parser.add_argument("--timeout", type=float, help="Stop searching after this many seconds.")
+    parser.add_argument("--no-ledger", action="store_true",
+                        help="Search every seed again instead of reusing earlier searches.")
+    parser.add_argument("--corpus", action="append", default=[],
+                        help=f"Read pages from this page corpus as well as those in {CORPUS_DIR}/ (repeatable).")
+    parser.add_argument("--build-corpus", type=str, metavar="NAME",
+                        help=f"Write seeds 0 to --max-attempts into {CORPUS_DIR}/NAME{CORPUS_SUFFIX} and exit.")
     parser.add_argument("--save", type=str, help="File to save results to.")
     parser.add_argument("--test", action="store_true", help="Run tests and exit.")
     args = parser.parse_args()
@@ -87,6 +98,23 @@ def main():
         run_tests()
         sys.exit(0)
 
+    if args.build_corpus:
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        path = os.path.join(CORPUS_DIR, args.build_corpus + CORPUS_SUFFIX)
+        print(f"Building page corpus {path}...")
+        corpus = build_page_corpus(path, 0, args.max_attempts, args.page_length, workers=os.cpu_count())
+        print(f"Wrote {len(corpus)} pages of {corpus.page_length} characters.")
+        sys.exit(0)
+
+    for path, reason in mount_corpus_dir()[1]:
+        print(f"Skipping page corpus {path}: {reason}")
+    try:
+        for path in args.corpus:
+            mount_corpus(path)
+    except (OSError, ValueError) as e:
+        print(e)
+        sys.exit(1)
+
     phrase = args.phrase
     if not phrase:
         phrase = input("Enter a phrase to search for: ").lower()
@@ -99,7 +127,32 @@ def main():
         sys.exit(1)
 
     print(f"Searching for '{phrase}' in random pages...")
-    matches = search_for_phrase(phrase, max_attempts=args.max_attempts, max_matches=args.max_matches, page_length=args.page_length)
+    deadline = time.time() + args.timeout if args.timeout else None
+    matches = []
+    status = None
+    stopped = False
+    ledger = None if args.no_ledger else SearchLedger()
+    try:
+        for record in iter_search(phrase, max_attempts=args.max_attempts, max_matches=args.max_matches,
+                                  page_length=args.page_length, anchored=args.anchored,
+                                  window=args.window, deadline=deadline, ledger=ledger):
+            if record['type'] == 'hit':
+                matches.append((record['seed'], record['index']))
+            else:
+                status = record
+        stopped = status['reason'] == 'deadline'
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nSearch interrupted.")
+        stopped = True
+    finally:
+        if ledger is not None:
+            ledger.close()
+    if stopped:
+        covered = f" Seeds below {status['next_seed']} were fully searched." if status else ""
+        print(f"Search stopped early; showing matches found so far.{covered}")
 
     if matches:
         results = []
@@ -1,14 +1,18 @@
 import time
 import json
 import os
+import argparse
 import datetime
-from babel import generate_page, validate_phrase, ALPHABET
+from babel import validate_phrase, ALPHABET
+from babel_core import generate_pages, GENERATION_BATCH_SIZE
+from babel_tools import PhraseMatcher, ScanProgress
+from babel_store import (open_result_store, write_json_atomic, FlushPolicy,
+                         FLUSH_EVERY_PAGES, FLUSH_INTERVAL, mount_corpus_dir)
 
 TERMS_FILE = 'search_terms.txt'
 PROGRESS_FILE = 'background_progress.json'
-RESULTS_FILE = 'background_results.json'
 PAGE_LENGTH = 3200
-SLEEP_SECONDS = 0  # Time between each page search
+SLEEP_SECONDS = 0  # Time between each page search (slept once per batch)
 
 
 def load_search_terms():
@@ -30,55 +34,77 @@ def load_search_terms():
 def load_progress():
     if os.path.exists(PROGRESS_FILE):
         with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('last_seed', 0)
-    return 0
+            return ScanProgress.from_dict(json.load(f))
+    return ScanProgress()
 
-def save_progress(seed):
-    with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-        json.dump({'last_seed': seed}, f)
+def save_progress(progress, fsync=False):
+    write_json_atomic(PROGRESS_FILE, progress.to_dict(), fsync=fsync)
 
-def append_result(result):
-    results = []
-    if os.path.exists(RESULTS_FILE):
-        with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                results = json.load(f)
-            except Exception:
-                results = []
-    results.append(result)
-    with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
+def flush(store, progress, fsync=False):
+    """Write out hits, then progress, so progress never runs ahead of a hit."""
+    store.commit()
+    save_progress(progress, fsync=fsync)
 
 def main():
+    parser = argparse.ArgumentParser(description="Library of Babel background searcher.")
+    parser.add_argument("--flush-pages", type=int, default=FLUSH_EVERY_PAGES,
+                        help="Save hits and progress after this many pages.")
+    parser.add_argument("--flush-seconds", type=float, default=FLUSH_INTERVAL,
+                        help="Save hits and progress after this many seconds.")
+    parser.add_argument("--fsync", action="store_true",
+                        help="Sync hits and progress to disk on every save.")
+    args = parser.parse_args()
+
     print("[Babel Background Searcher] Starting...")
     terms = load_search_terms()
     if not terms:
         print("No valid search terms found. Exiting.")
         return
     print(f"Loaded {len(terms)} search terms.")
-    seed = load_progress()
-    print(f"Resuming from seed {seed}.")
+    # Seed ranges held in a page corpus are read instead of generated
+    corpora, skipped = mount_corpus_dir()
+    for path, reason in skipped:
+        print(f"Skipping page corpus {path}: {reason}")
+    if corpora:
+        print(f"Reading {sum(len(c) for c in corpora)} pages from {len(corpora)} page corpora.")
+    matcher = PhraseMatcher(terms)
+    store = open_result_store(durable=args.fsync)
+    progress = load_progress()
+    policy = FlushPolicy(args.flush_pages, args.flush_seconds)
+    gaps = progress.gaps()
+    print(f"Resuming from seed {progress.watermark} ({len(gaps)} gaps to rescan first).")
     try:
         while True:
-            page = generate_page(seed, length=PAGE_LENGTH)
-            for term in terms:
-                idx = page.find(term)
-                if idx != -1:
+            # Gaps left by an interrupted GUI run are handed out first
+            start, stop = progress.next_chunk(GENERATION_BATCH_SIZE)
+            seeds = list(range(start, stop))
+            pages = generate_pages(seeds, PAGE_LENGTH)
+            hits_by_row = {}
+            for row, term, indices in matcher.scan_by_phrase(pages):
+                hits_by_row.setdefault(row, []).append((term, indices))
+            for row, seed in enumerate(seeds):
+                for term, indices in hits_by_row.get(row, []):
                     result = {
                         'phrase': term,
                         'seed': seed,
-                        'index': idx,
+                        'index': indices[0],
+                        'indices': indices,
                         'timestamp': datetime.datetime.now().isoformat()
                     }
-                    print(f"[FOUND] '{term}' at seed {seed}, index {idx}")
-                    append_result(result)
-            seed += 1
-            save_progress(seed)
-            time.sleep(SLEEP_SECONDS)
+                    if store.add(result):
+                        print(f"[FOUND] '{term}' at seed {seed}, index {indices[0]}")
+            progress.complete(start, stop)
+            if policy.record(len(seeds)):
+                flush(store, progress, args.fsync)
+                policy.reset()
+            if SLEEP_SECONDS:
+                time.sleep(SLEEP_SECONDS * len(seeds))
     except KeyboardInterrupt:
         print("\n[Babel Background Searcher] Stopped by user.")
-        save_progress(seed)
+    finally:
+        # An interrupted batch is not marked complete, so it is rescanned
+        flush(store, progress, args.fsync)
+        store.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,227 @@
+"""
+babel_bus.py
+
+Shared-scan page bus for the Library of Babel searcher.
+
+Generating pages is far more expensive than matching them, yet several
+searches often walk the same low seed ranges at the same time. A PageBus
+generates each batch of seeds once and hands it to every subscribed
+consumer that still needs those seeds.
+
+The bus sweeps upwards through the seeds its consumers need. A consumer
+that subscribes mid-sweep joins at the current position, and once the
+sweep has passed the top of everyone's range it wraps around to the
+lowest seed still needed, so late joiners catch up on what they missed.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from babel_core import (generate_pages, mounted_corpora, mount_corpora, GENERATION_BATCH_SIZE,
+                        PAGE_LENGTH)
+
+class PageConsumer:
+    """
+    Base class for PageBus subscribers.
+
+    A consumer asks for seeds [start, stop) at a given page length. The bus
+    calls feed() from its scanner thread with every page the consumer still
+    needs and calls finish() once the consumer has received its whole range
+    or has been unsubscribed. If generating or feeding its pages fails, the
+    consumer is finished early with the exception in error. Subclasses
+    implement feed() and may shrink the remaining range with limit() once
+    their stop condition is known.
+    """
+
+    def __init__(self, start: int, stop: int, page_length: int = PAGE_LENGTH):
+        self.start = start
+        self.stop = stop
+        self.page_length = page_length
+        # Seed ranges not delivered yet, sorted and disjoint
+        self.pending = [(start, stop)] if start < stop else []
+        self.finished = threading.Event()
+        self.error = None
+
+    def feed(self, seeds: List[int], codes: np.ndarray) -> None:
+        """
+        Receive a batch of pages.
+
+        Args:
+            seeds: Seeds of the pages, ascending
+            codes: Symbol codes, one row of page_length per seed
+        """
+        raise NotImplementedError
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Called once when the consumer leaves the bus, with the error that made it leave."""
+        if error is not None:
+            self.error = error
+        self.finished.set()
+
+    def limit(self, stop: int) -> None:
+        """Stop needing seeds at or above stop."""
+        self.pending = [(a, min(b, stop)) for a, b in self.pending if a < stop]
+
+    def first_pending(self, seed: Optional[int] = None) -> Optional[int]:
+        """Lowest seed still needed, or the lowest one at or above seed."""
+        for a, b in self.pending:
+            if seed is None or seed < b:
+                return a if seed is None else max(a, seed)
+        return None
+
+    def _take(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """Remove [start, stop) from pending and return the parts that were needed."""
+        taken, remaining = [], []
+        for a, b in self.pending:
+            lo, hi = max(a, start), min(b, stop)
+            if lo < hi:
+                taken.append((lo, hi))
+                if a < lo:
+                    remaining.append((a, lo))
+                if hi < b:
+                    remaining.append((hi, b))
+            else:
+                remaining.append((a, b))
+        self.pending = remaining
+        return taken
+
+class PageBus:
+    """
+    Generates each seed batch once and broadcasts it to all consumers.
+
+    A scanner thread starts when the first consumer subscribes and exits when
+    the last one leaves. With more than one worker, each sweep step covers
+    `workers` batches that are generated in a process pool in parallel;
+    the pool reads from the corpora mounted when the bus was created.
+    """
+
+    def __init__(self, workers: int = 1, batch_size: int = GENERATION_BATCH_SIZE):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.pages_generated = 0
+        self._consumers = []
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=mount_corpora,
+            initargs=([c.path for c in mounted_corpora()],)) if workers > 1 else None
+
+    def subscribe(self, consumer: PageConsumer) -> PageConsumer:
+        """Add a consumer; it starts receiving pages from the current sweep position."""
+        with self._lock:
+            if not consumer.pending:
+                consumer.finish()
+                return consumer
+            self._consumers.append(consumer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return consumer
+
+    def unsubscribe(self, consumer: PageConsumer) -> None:
+        """Remove a consumer before its range is exhausted."""
+        with self._lock:
+            if consumer in self._consumers:
+                self._consumers.remove(consumer)
+                consumer.finish()
+
+    def close(self) -> None:
+        """Drop all consumers and shut down the worker pool."""
+        with self._lock:
+            for consumer in self._consumers:
+                consumer.finish()
+            self._consumers = []
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def _plan(self) -> Optional[Tuple[int, int, List[PageConsumer], List[int], int]]:
+        """Pick the next window, the consumers it serves and the seeds they need."""
+        for consumer in [c for c in self._consumers if not c.pending]:
+            self._consumers.remove(consumer)
+            consumer.finish()
+        if not self._consumers:
+            return None
+
+        # Carry on upwards from the cursor, or wrap to the lowest needed seed
+        ahead = [c.first_pending(self._cursor) for c in self._consumers]
+        ahead = [seed for seed in ahead if seed is not None]
+        start = min(ahead) if ahead else min(c.first_pending() for c in self._consumers)
+        stop = start + self.batch_size * self.workers
+
+        served, needed, length = [], set(), 0
+        for consumer in self._consumers:
+            for a, b in consumer.pending:
+                lo, hi = max(a, start), min(b, stop)
+                if lo < hi:
+                    needed.update(range(lo, hi))
+                    if consumer not in served:
+                        served.append(consumer)
+                    length = max(length, consumer.page_length)
+        self._cursor = stop
+        return start, stop, served, sorted(needed), length
+
+    def _generate(self, seeds: List[int], length: int) -> np.ndarray:
+        """Generate pages, splitting the work over the pool when there is one."""
+        if self._pool is None or len(seeds) <= self.batch_size:
+            return generate_pages(seeds, length)
+        parts = [seeds[i:i + self.batch_size] for i in range(0, len(seeds), self.batch_size)]
+        return np.concatenate(list(self._pool.map(generate_pages, parts, [length] * len(parts))))
+
+    def _fail(self, consumers: List[PageConsumer], error: BaseException) -> None:
+        """Remove consumers whose pages could not be generated or fed."""
+        with self._lock:
+            for consumer in consumers:
+                if consumer in self._consumers:
+                    self._consumers.remove(consumer)
+                    consumer.finish(error)
+
+    def _run(self) -> None:
+        """Scanner thread: generate, broadcast, repeat until nobody is left."""
+        try:
+            while True:
+                with self._lock:
+                    plan = self._plan()
+                    if plan is None:
+                        self._thread = None
+                        return
+                start, stop, served, seeds, length = plan
+                try:
+                    codes = self._generate(seeds, length)
+                except Exception as e:
+                    self._fail(served, e)
+                    continue
+                self.pages_generated += len(seeds)
+                row_of = {seed: row for row, seed in enumerate(seeds)}
+
+                # Consumers that joined after planning wait for the next pass; the
+                # ones planned for can only have lost seeds since, never gained any
+                with self._lock:
+                    deliveries = []
+                    for consumer in served:
+                        if consumer not in self._consumers:
+                            continue
+                        rows = [row_of[seed] for a, b in consumer._take(start, stop)
+                                for seed in range(a, b)]
+                        if rows:
+                            deliveries.append((consumer, rows))
+
+                for consumer, rows in deliveries:
+                    try:
+                        consumer.feed([seeds[row] for row in rows],
+                                      codes[rows, :consumer.page_length])
+                    except Exception as e:
+                        self._fail([consumer], e)
+        except BaseException as e:
+            # Nobody would serve the remaining consumers; fail them rather than
+            # leave them waiting
+            self._fail(list(self._consumers), e)
+            raise
+        finally:
+            with self._lock:
+                # A new scanner may already have started after a normal exit
+                if self._thread is threading.current_thread():
+                    self._thread = None
@@ -8,16 +8,68 @@ This module contains the essential mathematical and algorithmic
 foundations that power the Library of Babel searcher.
 """
 
+import os
 import random
 import hashlib
 import math
-from collections import Counter
-from typing import Dict, Tuple, List, Optional
+import heapq
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Tuple, List, Optional, Iterable, Iterator, Callable
+
+import numpy as np
 
 # Fixed character set used by the Library
 ALPHABET = "abcdefghijklmnopqrstuvwxyz ,."
 PAGE_LENGTH = 3200
 
+# Version of the page generator. Bump it whenever generate_page() output
+# changes, so data derived from pages and persisted by seed is rebuilt.
+GENERATOR_VERSION = 1
+
+# Number of seeds generated together by generate_pages. Large enough to
+# amortise the per-step NumPy overhead, small enough to stay in cache.
+GENERATION_BATCH_SIZE = 512
+
+# Below this many characters per page, seeding dominates and a plain
+# random.Random per seed is cheaper than the vectorized generator.
+SHORT_PAGE_LENGTH = 128
+
+# Default memory budget of the process-wide page cache (about 20000 full pages)
+PAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Page corpus files start with this header, followed by one pack_codes()
+# row of ceil(5 * page_length / 8) bytes per seed
+CORPUS_MAGIC = b'BABELPC1'
+CORPUS_HEADER = np.dtype([('magic', 'S8'), ('generator_version', '<u4'), ('page_length', '<u4'),
+                          ('start', '<u8'), ('count', '<u8')])
+
+# ASCII byte for each symbol code, used to turn code arrays back into text
+ALPHABET_BYTES = np.frombuffer(ALPHABET.encode('ascii'), dtype=np.uint8)
+
+# MinHash sketch of a page: hashes of its SHINGLE_LENGTH-character
+# shingles, split into MINHASH_BANDS LSH bands of MINHASH_ROWS hashes each.
+# Pages whose shingle sets have Jaccard similarity J share at least one
+# band with probability 1 - (1 - J**MINHASH_ROWS)**MINHASH_BANDS.
+SHINGLE_LENGTH = 5
+MINHASH_BANDS = 16
+MINHASH_ROWS = 3
+
+# Longest n-gram that still packs into one int64 as base-29 digits
+PACKED_GRAM_LENGTH = 12
+
+# Symbol code for each ASCII byte (255 for bytes outside the alphabet)
+_SYMBOL_CODES = np.full(256, 255, dtype=np.uint8)
+_SYMBOL_CODES[ALPHABET_BYTES] = np.arange(len(ALPHABET), dtype=np.uint8)
+
+# MT19937 parameters, matching CPython's _randommodule.c
+_MT_N = 624
+_MT_M = 397
+_MT_UPPER = np.uint32(0x80000000)
+_MT_LOWER = np.uint32(0x7fffffff)
+_MT_MATRIX = np.uint32(0x9908b0df)
+
 def generate_page(seed: int, length: int = PAGE_LENGTH) -> str:
     """
     Generate a deterministic page of text using a fixed seed.
@@ -32,6 +84,847 @@ def generate_page(seed: int, length: int = PAGE_LENGTH) -> str:
     rng = random.Random(seed)
     return ''.join(rng.choices(ALPHABET, k=length))
 
+def _mt_init_genrand(s: int) -> np.ndarray:
+    """Initial MT state for a 32-bit seed (init_genrand)."""
+    mt = [s]
+    for i in range(1, _MT_N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xffffffff)
+    return np.array(mt, dtype=np.uint32)
+
+# init_by_array always starts from init_genrand(19650218)
+_MT_BASE_STATE = _mt_init_genrand(19650218)
+
+def _mt_seed_states(keys: np.ndarray) -> np.ndarray:
+    """
+    Vectorized init_by_array for a batch of seeds sharing one key length.
+
+    Args:
+        keys: uint32 array of shape (key_length, batch), one key per column
+
+    Returns:
+        uint32 state array of shape (batch, 624)
+    """
+    key_length, batch = keys.shape
+    # Rows are state words so each sequential step touches contiguous memory
+    mt = np.empty((_MT_N, batch), dtype=np.uint32)
+    mt[:] = _MT_BASE_STATE[:, None]
+    tmp = np.empty(batch, dtype=np.uint32)
+
+    i, j = 1, 0
+    for _ in range(max(_MT_N, key_length)):
+        prev, row = mt[i - 1], mt[i]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= np.uint32(1664525)
+        row ^= tmp
+        row += keys[j]
+        row += np.uint32(j)
+        i += 1
+        j += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+        if j >= key_length:
+            j = 0
+
+    for _ in range(_MT_N - 1):
+        prev, row = mt[i - 1], mt[i]
+        np.right_shift(prev, 30, out=tmp)
+        tmp ^= prev
+        tmp *= np.uint32(1566083941)
+        row ^= tmp
+        row -= np.uint32(i)
+        i += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+
+    mt[0] = _MT_UPPER
+    return np.ascontiguousarray(mt.T)
+
+def _mt_mix(cur: np.ndarray, nxt: np.ndarray, far: np.ndarray, tmp: np.ndarray) -> None:
+    """One block of the MT twist, written in place into cur."""
+    np.bitwise_and(nxt, _MT_LOWER, out=tmp)
+    cur &= _MT_UPPER
+    cur |= tmp
+    np.bitwise_and(cur, np.uint32(1), out=tmp)
+    tmp *= _MT_MATRIX
+    cur >>= np.uint32(1)
+    cur ^= tmp
+    cur ^= far
+
+def _mt_twist(mt: np.ndarray, tmp: np.ndarray) -> None:
+    """
+    Regenerate all 624 state words of every row of mt.
+
+    The reference loop is sequential, but word k only depends on words
+    already rewritten 227 positions earlier, so it splits into blocks of
+    227 columns that can each be updated at once.
+    """
+    k = _MT_N - _MT_M
+    _mt_mix(mt[:, :k], mt[:, 1:k + 1], mt[:, _MT_M:], tmp[:, :k])
+    _mt_mix(mt[:, k:2 * k], mt[:, k + 1:2 * k + 1], mt[:, :k], tmp[:, :k])
+    rest = _MT_N - 1 - 2 * k
+    _mt_mix(mt[:, 2 * k:_MT_N - 1], mt[:, 2 * k + 1:_MT_N], mt[:, k:_MT_M - 1], tmp[:, :rest])
+    _mt_mix(mt[:, _MT_N - 1:], mt[:, :1], mt[:, _MT_M - 1:_MT_M], tmp[:, :1])
+
+def _mt_temper(state: np.ndarray, out: np.ndarray, tmp: np.ndarray) -> None:
+    """Apply MT output tempering to state, writing the result to out."""
+    np.right_shift(state, np.uint32(11), out=out)
+    out ^= state
+    np.left_shift(out, np.uint32(7), out=tmp)
+    tmp &= np.uint32(0x9d2c5680)
+    out ^= tmp
+    np.left_shift(out, np.uint32(15), out=tmp)
+    tmp &= np.uint32(0xefc60000)
+    out ^= tmp
+    np.right_shift(out, np.uint32(18), out=tmp)
+    out ^= tmp
+
+def _generate_page_batch(keys: np.ndarray, length: int) -> np.ndarray:
+    """Generate symbol codes for one batch of seeds with equal key length."""
+    mt = _mt_seed_states(keys)
+    batch = mt.shape[0]
+    pages = np.empty((batch, length), dtype=np.uint8)
+    words = np.empty((batch, _MT_N), dtype=np.uint32)
+    tmp = np.empty((batch, _MT_N), dtype=np.uint32)
+    high = np.empty((batch, _MT_N // 2), dtype=np.uint32)
+    value = np.empty((batch, _MT_N // 2), dtype=np.float64)
+
+    # Each character consumes two 32-bit outputs: random() builds a 53-bit
+    # float from (a >> 5, b >> 6) and choices() takes floor(random() * 29).
+    # Scaling by 29 / 2**53 in one step rounds exactly like CPython does,
+    # because multiplying by a power of two is exact.
+    scale = len(ALPHABET) / 9007199254740992.0
+    pos = 0
+    while pos < length:
+        _mt_twist(mt, tmp)
+        _mt_temper(mt, words, tmp)
+        n = min(_MT_N // 2, length - pos)
+        h, v = high[:, :n], value[:, :n]
+        np.right_shift(words[:, 0:2 * n:2], np.uint32(5), out=h)
+        v[...] = h
+        v *= 67108864.0
+        np.right_shift(words[:, 1:2 * n:2], np.uint32(6), out=h)
+        v += h
+        v *= scale
+        pages[:, pos:pos + n] = v
+        pos += n
+
+    return pages
+
+def generate_pages(seeds: Iterable[int], length: int = PAGE_LENGTH) -> np.ndarray:
+    """
+    Generate many pages at once as arrays of symbol codes.
+
+    This is a NumPy reimplementation of random.Random(seed).choices(),
+    run across many seeds in parallel. Row i is byte-for-byte the page
+    that generate_page(seeds[i], length) returns, encoded as indices
+    into ALPHABET.
+
+    Args:
+        seeds: Integer seeds to generate
+        length: Number of characters per page (default: 3200)
+
+    Returns:
+        uint8 array of shape (len(seeds), length)
+    """
+    seeds = [abs(int(seed)) for seed in seeds]
+    pages = np.empty((len(seeds), length), dtype=np.uint8)
+    if not seeds or length <= 0:
+        return pages
+
+    # Pages held in a mounted corpus are read instead of generated
+    rows = _read_corpora(seeds, length, pages) if _corpora else range(len(seeds))
+
+    # init_by_array splits the seed into 32-bit words; group seeds by
+    # word count so each batch runs the same number of seeding steps.
+    groups = {}
+    for row in rows:
+        seed = seeds[row]
+        key_length = max(1, (seed.bit_length() + 31) // 32)
+        groups.setdefault(key_length, []).append(row)
+
+    for key_length, rows in groups.items():
+        for start in range(0, len(rows), GENERATION_BATCH_SIZE):
+            batch_rows = rows[start:start + GENERATION_BATCH_SIZE]
+            keys = np.array(
+                [[(seeds[row] >> (32 * w)) & 0xffffffff for row in batch_rows]
+                 for w in range(key_length)],
+                dtype=np.uint32)
+            pages[batch_rows] = _generate_page_batch(keys, length)
+
+    return pages
+
+def decode_page(codes: np.ndarray) -> str:
+    """
+    Convert an array of symbol codes back into page text.
+
+    Args:
+        codes: 1-D array of indices into ALPHABET
+
+    Returns:
+        The page as a string
+    """
+    return ALPHABET_BYTES[codes].tobytes().decode('ascii')
+
+def encode_page(page: str) -> np.ndarray:
+    """
+    Convert page text into an array of symbol codes.
+
+    Args:
+        page: Text containing only ALPHABET characters
+
+    Returns:
+        uint8 array of indices into ALPHABET
+    """
+    return _SYMBOL_CODES[np.frombuffer(page.encode('ascii'), dtype=np.uint8)]
+
+def pack_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Pack symbol codes into 5 bits each, 8 symbols per 5 bytes.
+
+    Args:
+        codes: Symbol codes; pages along the last axis
+
+    Returns:
+        uint8 array with the last axis shrunk to ceil(5 * length / 8) bytes
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    lead, length = codes.shape[:-1], codes.shape[-1]
+    groups = (length + 7) // 8
+    c = np.zeros(lead + (groups * 8,), dtype=np.uint8)
+    c[..., :length] = codes
+    c = [c[..., i::8] for i in range(8)]
+    packed = np.empty(lead + (groups, 5), dtype=np.uint8)
+    packed[..., 0] = c[0] << 3 | c[1] >> 2
+    packed[..., 1] = (c[1] & 3) << 6 | c[2] << 1 | c[3] >> 4
+    packed[..., 2] = (c[3] & 15) << 4 | c[4] >> 1
+    packed[..., 3] = (c[4] & 1) << 7 | c[5] << 2 | c[6] >> 3
+    packed[..., 4] = (c[6] & 7) << 5 | c[7]
+    return packed.reshape(lead + (groups * 5,))[..., :(5 * length + 7) // 8]
+
+def unpack_codes(packed: np.ndarray, length: int) -> np.ndarray:
+    """
+    Inverse of pack_codes.
+
+    Works on each 5-byte group with byte-wide shifts, so unpacking a page
+    costs a small fraction of generating it.
+
+    Args:
+        packed: Packed codes; pages along the last axis
+        length: Number of symbols per page
+
+    Returns:
+        uint8 array of symbol codes with length symbols along the last axis
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    lead = packed.shape[:-1]
+    groups = (length + 7) // 8
+    packed = packed[..., :groups * 5]
+    if packed.shape[-1] < groups * 5:
+        packed = np.concatenate((packed, np.zeros(lead + (groups * 5 - packed.shape[-1],),
+                                                  dtype=np.uint8)), axis=-1)
+    b = packed.reshape(lead + (groups, 5))
+    b = [b[..., i] for i in range(5)]
+    codes = np.empty(lead + (groups, 8), dtype=np.uint8)
+    codes[..., 0] = b[0] >> 3
+    codes[..., 1] = (b[0] & 7) << 2 | b[1] >> 6
+    codes[..., 2] = (b[1] >> 1) & 31
+    codes[..., 3] = (b[1] & 1) << 4 | b[2] >> 4
+    codes[..., 4] = (b[2] & 15) << 1 | b[3] >> 7
+    codes[..., 5] = (b[3] >> 2) & 31
+    codes[..., 6] = (b[3] & 3) << 3 | b[4] >> 5
+    codes[..., 7] = b[4] & 31
+    return codes.reshape(lead + (groups * 8,))[..., :length]
+
+class PageCorpus:
+    """
+    Read-only, memory-mapped file of packed pages for a contiguous seed range.
+
+    The file holds every page of seeds [start, stop) at page_length
+    characters, packed by pack_codes() at a fixed stride, so a page is
+    found by arithmetic and read through the page cache of the operating
+    system instead of being generated. Since a shorter page is a prefix of
+    the longer one, the corpus serves any length up to page_length.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a corpus written by build_page_corpus().
+
+        Raises:
+            ValueError: If the file is not a page corpus, is truncated or
+                was written by a different page generator
+        """
+        self.path = path
+        header = np.fromfile(path, dtype=CORPUS_HEADER, count=1)
+        if len(header) != 1 or header['magic'][0] != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a page corpus")
+        header = header[0]
+        if header['generator_version'] != GENERATOR_VERSION:
+            raise ValueError(f"{path} was written by page generator version "
+                             f"{header['generator_version']}, this is version {GENERATOR_VERSION}")
+        self.page_length = int(header['page_length'])
+        self.start = int(header['start'])
+        self.stop = self.start + int(header['count'])
+        self.stride = (5 * self.page_length + 7) // 8
+        if os.path.getsize(path) < CORPUS_HEADER.itemsize + len(self) * self.stride:
+            raise ValueError(f"{path} is truncated")
+        self._pages = np.memmap(path, dtype=np.uint8, mode='r', offset=CORPUS_HEADER.itemsize,
+                                shape=(len(self), self.stride)) if len(self) else \
+            np.zeros((0, self.stride), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __contains__(self, seed: int) -> bool:
+        return self.start <= seed < self.stop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Drop the mapping; views handed out earlier keep it alive."""
+        self._pages = np.zeros((0, self.stride), dtype=np.uint8)
+        self.stop = self.start
+
+    def packed(self, start: int, stop: int) -> np.ndarray:
+        """
+        Packed pages of seeds [start, stop), as a zero-copy view of the file.
+
+        Raises:
+            ValueError: If the range is not inside the corpus
+        """
+        if not self.start <= start <= stop <= self.stop:
+            raise ValueError(f"Seeds {start}-{stop} are not all in the corpus "
+                             f"({self.start}-{self.stop})")
+        return self._pages[start - self.start:stop - self.start]
+
+    def codes(self, seeds: Iterable[int], length: Optional[int] = None) -> np.ndarray:
+        """
+        Symbol codes of pages in the corpus.
+
+        Args:
+            seeds: Seeds inside the corpus
+            length: Number of characters per page (default: page_length)
+
+        Returns:
+            uint8 array of shape (len(seeds), length), the same as generate_pages()
+        """
+        length = self.page_length if length is None else length
+        if length > self.page_length:
+            raise ValueError(f"Corpus pages are only {self.page_length} characters long")
+        offsets = np.asarray(seeds, dtype=np.int64) - self.start
+        if len(offsets) and (offsets.min() < 0 or offsets.max() >= len(self)):
+            raise ValueError(f"Seeds outside the corpus ({self.start}-{self.stop})")
+        width = (5 * length + 7) // 8
+        if len(offsets) > 1 and offsets[-1] - offsets[0] == len(offsets) - 1 \
+                and (np.diff(offsets) == 1).all():
+            # Consecutive seeds unpack straight from the mapping
+            packed = self._pages[offsets[0]:offsets[-1] + 1, :width]
+        else:
+            packed = self._pages[offsets, :width]
+        return unpack_codes(packed, length)
+
+def build_page_corpus(path: str, start: int, stop: int, length: int = PAGE_LENGTH,
+                      workers: int = 1) -> PageCorpus:
+    """
+    Generate seeds [start, stop) once and write them to a page corpus file.
+
+    The file is written next to path and renamed into place when complete,
+    so a corpus is never seen half-written.
+
+    Args:
+        path: Corpus file to create or replace
+        start: First seed
+        stop: Seed after the last one
+        length: Number of characters per page
+        workers: Number of processes generating pages
+
+    Returns:
+        The new corpus, opened
+    """
+    if not 0 <= start <= stop:
+        raise ValueError("Corpus seeds must satisfy 0 <= start <= stop")
+    header = np.zeros(1, dtype=CORPUS_HEADER)
+    header[0] = (CORPUS_MAGIC, GENERATOR_VERSION, length, start, stop - start)
+    batches = [range(a, min(a + GENERATION_BATCH_SIZE, stop))
+               for a in range(start, stop, GENERATION_BATCH_SIZE)]
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.tobytes())
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for codes in pool.map(generate_pages, batches, [length] * len(batches)):
+                    f.write(pack_codes(codes).tobytes())
+        else:
+            for batch in batches:
+                f.write(pack_codes(generate_pages(batch, length)).tobytes())
+    os.replace(tmp_path, path)
+    return PageCorpus(path)
+
+# Corpora that generate_pages() and the page cache read from before
+# generating. Replaced rather than changed in place, so readers need no
+# lock. Worker processes mount them again with mount_corpora(), since
+# only forked workers inherit them.
+_corpora = []
+_corpora_lock = threading.Lock()
+
+def mount_corpus(corpus) -> PageCorpus:
+    """
+    Serve pages from a corpus everywhere in the process.
+
+    Args:
+        corpus: PageCorpus, or the path of a corpus file
+
+    Returns:
+        The mounted PageCorpus
+    """
+    global _corpora
+    if not isinstance(corpus, PageCorpus):
+        corpus = PageCorpus(corpus)
+    with _corpora_lock:
+        _corpora = _corpora + [corpus]
+    return corpus
+
+def unmount_corpus(corpus: PageCorpus) -> None:
+    """Stop serving pages from a mounted corpus."""
+    global _corpora
+    with _corpora_lock:
+        _corpora = [c for c in _corpora if c is not corpus]
+
+def mounted_corpora() -> List[PageCorpus]:
+    """Corpora currently mounted, in the order they are consulted."""
+    return list(_corpora)
+
+def mount_corpora(paths: Iterable[str]) -> None:
+    """
+    Mount corpus files that are not mounted yet.
+
+    Used as, or from, the initializer of worker processes, with the paths
+    of the parent's mounted_corpora().
+    """
+    for path in paths:
+        if not any(corpus.path == path for corpus in _corpora):
+            mount_corpus(path)
+
+def _corpus_for(seed: int, length: int) -> Optional[PageCorpus]:
+    """A mounted corpus holding the page of seed at length, if any."""
+    for corpus in _corpora:
+        if seed in corpus and length <= corpus.page_length:
+            return corpus
+    return None
+
+def _read_corpora(seeds: List[int], length: int, pages: np.ndarray) -> np.ndarray:
+    """Fill the rows of pages that mounted corpora hold; return the rows left to generate."""
+    try:
+        keys = np.array(seeds, dtype=np.int64)
+    except OverflowError:
+        keys = np.array([seed if seed < 1 << 63 else -1 for seed in seeds], dtype=np.int64)
+    pending = np.ones(len(seeds), dtype=bool)
+    for corpus in _corpora:
+        if length > corpus.page_length:
+            continue
+        held = pending & (keys >= corpus.start) & (keys < corpus.stop)
+        if held.all():
+            pages[...] = corpus.codes(keys, length)
+            return np.zeros(0, dtype=np.intp)
+        if held.any():
+            pages[held] = corpus.codes(keys[held], length)
+            pending &= ~held
+    return np.flatnonzero(pending)
+
+class PageCache:
+    """
+    Byte-bounded LRU cache of generated pages, safe to share between threads.
+
+    Pages are kept as uint8 symbol codes. Because a page is a prefix of the
+    same seed's longer pages, one cached page serves every request up to
+    its length by slicing. A longer request extends the cached page: pages
+    shorter than PAGE_LENGTH also keep the generator state they stopped
+    at, so the missing tail is generated on its own, while longer pages
+    are regenerated rather than pay 2.5 KB of state each. Concurrent
+    requests for a seed that is being generated wait for that generation
+    instead of repeating it.
+    """
+
+    def __init__(self, max_bytes: int = PAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # seed -> (codes, packed generator state or None)
+        self._entries = OrderedDict()
+        self._generating = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def codes(self, seed: int, length: int = PAGE_LENGTH) -> np.ndarray:
+        """
+        Symbol codes of a page, generated only if no cached page covers it.
+
+        Args:
+            seed: Page seed
+            length: Number of characters
+
+        Returns:
+            Read-only uint8 array of indices into ALPHABET
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(seed)
+                if entry is not None and len(entry[0]) >= length:
+                    self._entries.move_to_end(seed)
+                    self.hits += 1
+                    return entry[0][:length]
+                done = self._generating.get(seed)
+                if done is None:
+                    done = self._generating[seed] = threading.Event()
+                    self.misses += 1
+                    break
+            # Someone else is generating this seed; use their page if it is long enough
+            done.wait()
+
+        try:
+            codes, state = self._extend(seed, entry, length)
+            with self._lock:
+                self._store(seed, codes, state)
+        finally:
+            with self._lock:
+                del self._generating[seed]
+            done.set()
+        return codes
+
+    def page(self, seed: int, length: int = PAGE_LENGTH) -> str:
+        """Page text, as generate_page(seed, length) returns it."""
+        return decode_page(self.codes(seed, length))
+
+    def _extend(self, seed: int, entry: Optional[Tuple[np.ndarray, Optional[np.ndarray]]],
+                length: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Generate a page, continuing from a shorter cached one when it kept its state."""
+        corpus = _corpus_for(abs(seed), length)
+        if corpus is not None:
+            codes = corpus.codes([abs(seed)], length)[0]
+            codes.flags.writeable = False
+            return codes, None
+        rng = random.Random(seed)
+        head = np.zeros(0, dtype=np.uint8)
+        if entry is not None and entry[1] is not None:
+            head = entry[0]
+            rng.setstate((3, tuple(entry[1].tolist()), None))
+        tail = encode_page(''.join(rng.choices(ALPHABET, k=length - len(head))))
+        codes = np.concatenate((head, tail))
+        codes.flags.writeable = False
+        state = np.array(rng.getstate()[1], dtype=np.uint32) if length < PAGE_LENGTH else None
+        return codes, state
+
+    def _store(self, seed: int, codes: np.ndarray, state: Optional[np.ndarray]) -> None:
+        """Insert a page as most recently used and evict down to the byte budget."""
+        old = self._entries.pop(seed, None)
+        if old is not None:
+            self.bytes -= self._size(old)
+        if old is not None and len(old[0]) > len(codes):
+            # A longer page was stored while this one was generated
+            codes, state = old
+        self._entries[seed] = (codes, state)
+        self.bytes += self._size((codes, state))
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= self._size(evicted)
+
+    @staticmethod
+    def _size(entry: Tuple[np.ndarray, Optional[np.ndarray]]) -> int:
+        return entry[0].nbytes + (entry[1].nbytes if entry[1] is not None else 0)
+
+# Shared by everything in the process that displays or re-reads pages
+page_cache = PageCache()
+
+def cached_page(seed: int, length: int = PAGE_LENGTH) -> str:
+    """
+    Same as generate_page(seed, length), served from the process-wide page cache.
+    
+    Args:
+        seed: Integer seed for reproducible random generation
+        length: Number of characters to generate (default: 3200)
+        
+    Returns:
+        String containing the generated page content
+    """
+    return page_cache.page(seed, length)
+
+class PageView:
+    """
+    Read-only page held as symbol codes instead of a str.
+
+    A view made with from_seed() shares the page cache's buffer, so holding
+    it costs no copy; pack() trades a little CPU for 5 bits per character.
+    Slicing and indexing return text, so code written for page strings
+    (format_page_output, phrase highlighting) works unchanged, while find,
+    hashing, histograms and statistics run on the codes directly. Call
+    str() only where a real string is needed, such as a Tk text widget.
+    """
+
+    __slots__ = ('_data', '_length', '_packed')
+
+    def __init__(self, codes: np.ndarray):
+        self._data = codes
+        self._length = len(codes)
+        self._packed = False
+
+    @classmethod
+    def from_text(cls, text: str) -> 'PageView':
+        """View of page text (ALPHABET characters only)."""
+        codes = encode_page(text)
+        if np.any(codes >= len(ALPHABET)):
+            raise ValueError(f"Pages must only contain: {ALPHABET}")
+        return cls(codes)
+
+    @classmethod
+    def from_seed(cls, seed: int, length: int = PAGE_LENGTH) -> 'PageView':
+        """View of a generated page, shared with the process-wide page cache."""
+        return cls(page_cache.codes(seed, length))
+
+    @classmethod
+    def of(cls, page) -> 'PageView':
+        """A PageView for a page given as text or as a PageView."""
+        return page if isinstance(page, PageView) else cls.from_text(page)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Symbol codes of the page (unpacked on access when packed)."""
+        return unpack_codes(self._data, self._length) if self._packed else self._data
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the page's buffer."""
+        return self._data.nbytes
+
+    def pack(self) -> 'PageView':
+        """The same page stored at 5 bits per character."""
+        if self._packed:
+            return self
+        view = PageView.__new__(PageView)
+        view._data = pack_codes(self._data)
+        view._length = self._length
+        view._packed = True
+        return view
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __str__(self) -> str:
+        return decode_page(self.codes)
+
+    def __repr__(self) -> str:
+        return f"PageView({self._length} characters{', packed' if self._packed else ''})"
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return decode_page(self.codes[key])
+        return ALPHABET[self.codes[key]]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PageView):
+            return NotImplemented
+        return self._length == other._length and bool(np.array_equal(self.codes, other.codes))
+
+    def __hash__(self) -> int:
+        return hash(self.codes.tobytes())
+
+    def find(self, sub: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Index of the first occurrence of sub in page[start:end], or -1."""
+        try:
+            needle = encode_page(sub)
+        except UnicodeEncodeError:
+            return -1
+        if np.any(needle >= len(ALPHABET)):
+            return -1
+        return self.codes.tobytes().find(needle.tobytes(), start, self._length if end is None else end)
+
+    def __contains__(self, sub: str) -> bool:
+        return self.find(sub) >= 0
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> 'PageView':
+        """Sub-page view; shares the buffer unless the page is packed."""
+        return PageView(self.codes[start:stop])
+
+    def sha256(self) -> str:
+        """Same digest as compute_page_hash(str(page))."""
+        return hashlib.sha256(ALPHABET_BYTES[self.codes].tobytes()).hexdigest()
+
+    def histogram(self) -> np.ndarray:
+        """Count of each ALPHABET character."""
+        return np.bincount(self.codes, minlength=len(ALPHABET))
+
+    def most_common(self, n: int = 3, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Most frequent n-grams, ties in order of first appearance.
+
+        Args:
+            n: N-gram length
+            limit: Number of n-grams to return
+
+        Returns:
+            (n-gram, count) pairs, most frequent first
+        """
+        occurrences = ngram_occurrences([self], n)
+        order = np.lexsort((occurrences['position'], -occurrences['count']))[:limit]
+        return [(self[i:i + n], count) for i, count in
+                zip(occurrences['position'][order].tolist(), occurrences['count'][order].tolist())]
+
+def iter_page_batches(seeds: Iterable[int], length: int = PAGE_LENGTH,
+                      batch_size: int = GENERATION_BATCH_SIZE) -> Iterator[Tuple[List[int], np.ndarray]]:
+    """
+    Lazily generate pages for a sequence of seeds, one batch at a time.
+
+    Args:
+        seeds: Seeds to generate (may be an endless iterator)
+        length: Number of characters per page
+        batch_size: Number of seeds generated per batch
+
+    Yields:
+        (batch_seeds, codes) tuples, where codes is generate_pages(batch_seeds, length)
+    """
+    seeds = iter(seeds)
+    while True:
+        batch = [seed for _, seed in zip(range(batch_size), seeds)]
+        if not batch:
+            return
+        yield batch, generate_pages(batch, length)
+
+def iter_pages(seeds: Iterable[int], length: int = PAGE_LENGTH,
+               batch_size: int = GENERATION_BATCH_SIZE) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily generate pages for a sequence of seeds in vectorized batches.
+
+    Args:
+        seeds: Seeds to generate, in the order they should be yielded
+        length: Number of characters per page
+        batch_size: Number of seeds generated per batch
+
+    Yields:
+        (seed, page) tuples, identical to (seed, generate_page(seed, length))
+    """
+    if length < SHORT_PAGE_LENGTH and not _corpora:
+        for seed in seeds:
+            yield seed, generate_page(seed, length)
+        return
+    for batch, codes in iter_page_batches(seeds, length, batch_size):
+        for seed, row in zip(batch, ALPHABET_BYTES[codes]):
+            yield seed, row.tobytes().decode('ascii')
+
+def window_prefix_length(phrase: str, window: Optional[int],
+                         page_length: int = PAGE_LENGTH) -> int:
+    """
+    Number of characters to generate to find a phrase starting in a window.
+
+    Pages are drawn one character at a time, so generate_page(seed, n) is
+    always a prefix of the full page. A phrase that must start within the
+    first `window` characters can therefore be searched for without
+    generating the rest of the page.
+
+    Args:
+        phrase: Phrase being searched for
+        window: Number of leading start positions allowed (1 anchors the
+            phrase to the start of the page), or None for the whole page
+        page_length: Full page length
+
+    Returns:
+        Prefix length to generate, never more than page_length
+    """
+    if window is None:
+        return page_length
+    if window < 1:
+        raise ValueError("Search window must be at least 1 character")
+    return min(page_length, window + len(phrase) - 1)
+
+def _splitmix64(state: int) -> Tuple[int, int]:
+    """One step of SplitMix64: returns (new_state, output)."""
+    state = (state + 0x9e3779b97f4a7c15) & 0xffffffffffffffff
+    z = state
+    z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & 0xffffffffffffffff
+    z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & 0xffffffffffffffff
+    return state, z ^ (z >> 31)
+
+def _minhash_params(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Multipliers and offsets of the MinHash hash functions.
+
+    Derived from a fixed SplitMix64 stream rather than a NumPy generator,
+    so signatures stored on disk stay valid across NumPy versions.
+    """
+    state, values = 0x5eed, []
+    for _ in range(2 * count):
+        state, value = _splitmix64(state)
+        values.append(value)
+    multipliers = np.array(values[:count], dtype=np.uint64) | np.uint64(1)
+    offsets = np.array(values[count:], dtype=np.uint64)
+    return multipliers, offsets
+
+_MINHASH_MULTIPLIERS, _MINHASH_OFFSETS = _minhash_params(MINHASH_BANDS * MINHASH_ROWS)
+
+def minhash_signatures(codes: np.ndarray) -> np.ndarray:
+    """
+    MinHash signatures of pages over their SHINGLE_LENGTH-character shingles.
+
+    Each of the MINHASH_BANDS * MINHASH_ROWS hash functions is a
+    multiply-shift hash of the shingle's symbol codes; a signature entry is
+    the smallest hash over the page. Two pages agree on an entry with
+    probability equal to the Jaccard similarity of their shingle sets.
+
+    Args:
+        codes: Symbol codes, one page per row (see generate_pages)
+
+    Returns:
+        uint32 array of shape (pages, MINHASH_BANDS * MINHASH_ROWS)
+    """
+    codes = np.atleast_2d(codes)
+    width = codes.shape[1] - SHINGLE_LENGTH + 1
+    if width < 1:
+        raise ValueError(f"Pages must be at least {SHINGLE_LENGTH} characters long")
+    shingles = np.zeros((codes.shape[0], width), dtype=np.uint64)
+    for offset in range(SHINGLE_LENGTH):
+        shingles = shingles * np.uint64(len(ALPHABET)) + codes[:, offset:offset + width]
+
+    signatures = np.empty((codes.shape[0], len(_MINHASH_MULTIPLIERS)), dtype=np.uint32)
+    hashed = np.empty_like(shingles)
+    for i, (multiplier, offset) in enumerate(zip(_MINHASH_MULTIPLIERS, _MINHASH_OFFSETS)):
+        np.multiply(shingles, multiplier, out=hashed)
+        hashed += offset
+        hashed >>= np.uint64(32)
+        signatures[:, i] = hashed.min(axis=1)
+    return signatures
+
+def lsh_buckets(signatures: np.ndarray) -> np.ndarray:
+    """
+    Hash each LSH band of MinHash signatures into a single bucket key.
+
+    Args:
+        signatures: Output of minhash_signatures()
+
+    Returns:
+        int64 array of shape (pages, MINHASH_BANDS)
+    """
+    bands = signatures.reshape(signatures.shape[0], MINHASH_BANDS, MINHASH_ROWS).astype(np.uint64)
+    keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+    for row in range(MINHASH_ROWS):
+        # FNV-style mixing; wraps modulo 2**64
+        keys = (keys ^ bands[:, :, row]) * np.uint64(0x100000001b3)
+    return keys.view(np.int64)
+
 def compute_page_hash(page: str) -> str:
     """
     Compute SHA256 hash of a page for verification and deduplication.
@@ -42,6 +935,8 @@ def compute_page_hash(page: str) -> str:
     Returns:
         Hexadecimal string representation of the SHA256 hash
     """
+    if isinstance(page, PageView):
+        return page.sha256()
     return hashlib.sha256(page.encode('utf-8')).hexdigest()
 
 def validate_phrase(phrase: str) -> bool:
@@ -120,34 +1015,80 @@ def longest_common_substring(s1: str, s2: str) -> str:
         s2: Second string
         
     Returns:
-        The longest common substring
+        The longest common substring (the one ending earliest in s1 on ties)
     """
-    if not s1 or not s2:
-        return ""
-    
-    # Dynamic programming approach
-    m, n = len(s1), len(s2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    max_length = 0
-    ending_pos = 0
-    
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1[i - 1] == s2[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-                if dp[i][j] > max_length:
-                    max_length = dp[i][j]
-                    ending_pos = i
+    length, start, _ = find_longest_common_substring(s1, s2)
+    return s1[start:start + length]
+
+def find_longest_common_substring(s1: str, s2: str) -> Tuple[int, int, int]:
+    """
+    Locate the longest common substring of two strings in linear time.
+    
+    Builds a suffix automaton of s2, then walks s1 through it while tracking
+    the longest suffix of the text read so far that occurs in s2. Ties are
+    broken as the classic DP table scan does: earliest end in s1 first, then
+    earliest end in s2.
+    
+    Args:
+        s1: First string
+        s2: Second string
+        
+    Returns:
+        (length, start in s1, start in s2); (0, 0, 0) if nothing is shared
+    """
+    # State i: transitions, suffix link, longest length, end of first occurrence
+    nexts, links, lengths, firsts = [{}], [-1], [0], [-1]
+    last = 0
+    for pos, c in enumerate(s2):
+        cur = len(lengths)
+        nexts.append({})
+        links.append(0)
+        lengths.append(lengths[last] + 1)
+        firsts.append(pos)
+        p = last
+        while p != -1 and c not in nexts[p]:
+            nexts[p][c] = cur
+            p = links[p]
+        if p != -1:
+            q = nexts[p][c]
+            if lengths[p] + 1 == lengths[q]:
+                links[cur] = q
             else:
-                dp[i][j] = 0
+                clone = len(lengths)
+                nexts.append(dict(nexts[q]))
+                links.append(links[q])
+                lengths.append(lengths[p] + 1)
+                firsts.append(firsts[q])
+                while p != -1 and nexts[p].get(c) == q:
+                    nexts[p][c] = clone
+                    p = links[p]
+                links[q] = clone
+                links[cur] = clone
+        last = cur
     
-    return s1[ending_pos - max_length:ending_pos]
+    best, end1, end2 = 0, 0, 0
+    state, length = 0, 0
+    for pos, c in enumerate(s1):
+        while state and c not in nexts[state]:
+            state = links[state]
+            length = lengths[state]
+        if c in nexts[state]:
+            state = nexts[state][c]
+            length += 1
+        if length > best:
+            best, end1, end2 = length, pos + 1, firsts[state] + 1
+    
+    return best, end1 - best, end2 - best
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """
     Calculate Levenshtein (edit) distance between two strings.
     
+    Uses Myers' bit-parallel algorithm (in Hyyrö's formulation for edit
+    distance): one column of the DP table is held as two bit vectors of
+    vertical +1/-1 deltas in Python integers, so each character of s2 costs a
+    handful of big-integer operations instead of len(s1) cell updates.
+    
     Args:
         s1: First string
         s2: Second string
@@ -155,34 +1096,73 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     Returns:
         Minimum number of edits (insertions, deletions, substitutions) needed
     """
+    return _bit_parallel_distance(s1, s2)
+
+def levenshtein_within(s1: str, s2: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance, giving up as soon as it must exceed max_distance.
+    
+    This uses Myers/Hyyrö bit-parallel columns rather than an Ukkonen band:
+    one Python big-int operation advances a whole DP column, which is far
+    cheaper here than filling the O(max_distance * n) cells of a band one
+    by one. The last row of the DP table changes by at most one per column,
+    so once its value minus the columns still to go is over the budget, the
+    final distance is too and the computation stops.
+    
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Largest distance of interest
+        
+    Returns:
+        The distance, or None if it is greater than max_distance
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return None
+    return _bit_parallel_distance(s1, s2, max_distance)
+
+def _bit_parallel_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> Optional[int]:
+    """Myers/Hyyrö edit distance; None once the distance must exceed max_distance."""
+    # The shorter string becomes the bit vector
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
     if not s1:
-        return len(s2)
-    if not s2:
-        return len(s1)
-    
-    # Create matrix
-    m, n = len(s1), len(s2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    # Initialize base cases
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-    
-    # Fill matrix
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1[i - 1] == s2[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1]
-            else:
-                dp[i][j] = 1 + min(
-                    dp[i - 1][j],      # deletion
-                    dp[i][j - 1],      # insertion
-                    dp[i - 1][j - 1]   # substitution
-                )
+        return len(s2) if max_distance is None or len(s2) <= max_distance else None
+    
+    m = len(s1)
+    mask = (1 << m) - 1
+    top = 1 << (m - 1)
     
-    return dp[m][n]
+    # Bit i of peq[c] is set where s1[i] == c
+    peq = {}
+    for i, c in enumerate(s1):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    
+    pv, mv = mask, 0
+    score = m
+    # score minus the columns still to go may not pass this
+    limit = None if max_distance is None else max_distance + len(s2)
+    for c in s2:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+        if limit is not None:
+            limit -= 1
+            if score > limit:
+                return None
+        # Row 0 grows by one per column, so a +1 is shifted in at the bottom
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    
+    return score
 
 def similarity_percentage(s1: str, s2: str) -> float:
     """
@@ -205,6 +1185,74 @@ def similarity_percentage(s1: str, s2: str) -> float:
     
     return ((max_length - distance) / max_length) * 100
 
+def hamming_similarity(s1: str, s2: str) -> float:
+    """
+    Percentage of positions holding the same character in both strings.
+    
+    Positions past the end of the shorter string count as mismatches.
+    
+    Args:
+        s1: First string
+        s2: Second string
+        
+    Returns:
+        Similarity percentage (0-100)
+    """
+    if not s1 and not s2:
+        return 100.0
+    matches = sum(a == b for a, b in zip(s1, s2))
+    return matches / max(len(s1), len(s2)) * 100
+
+def qgram_cosine_similarity(s1: str, s2: str, q: int = 3) -> float:
+    """
+    Cosine similarity of the two strings' q-gram count vectors, as a percentage.
+    
+    Args:
+        s1: First string
+        s2: Second string
+        q: Q-gram length
+        
+    Returns:
+        Similarity percentage (0-100)
+    """
+    counts1 = Counter(s1[i:i + q] for i in range(len(s1) - q + 1))
+    counts2 = Counter(s2[i:i + q] for i in range(len(s2) - q + 1))
+    if not counts1 and not counts2:
+        return 100.0
+    if not counts1 or not counts2:
+        return 0.0
+    dot = sum(count * counts2[gram] for gram, count in counts1.items())
+    norm1 = math.sqrt(sum(count * count for count in counts1.values()))
+    norm2 = math.sqrt(sum(count * count for count in counts2.values()))
+    return dot / (norm1 * norm2) * 100
+
+def histogram_similarity(s1: str, s2: str) -> float:
+    """
+    Overlap of the two strings' character histograms, as a percentage.
+    
+    Counts the characters the strings have in common regardless of order,
+    relative to the longer string.
+    
+    Args:
+        s1: First string
+        s2: Second string
+        
+    Returns:
+        Similarity percentage (0-100)
+    """
+    if not s1 and not s2:
+        return 100.0
+    shared = sum((Counter(s1) & Counter(s2)).values())
+    return shared / max(len(s1), len(s2)) * 100
+
+# Metrics accepted by calculate_page_similarity_matrix, cheapest last
+SIMILARITY_METRICS = {
+    'levenshtein': similarity_percentage,
+    'qgram_cosine': qgram_cosine_similarity,
+    'hamming': hamming_similarity,
+    'histogram': histogram_similarity,
+}
+
 def format_page_output(page_text: str, width: int = 80, 
                       highlight: Optional[str] = None, 
                       highlight_index: Optional[int] = None) -> str:
@@ -245,6 +1293,113 @@ def is_duplicate_content(page1: str, page2: str) -> bool:
     """
     return compute_page_hash(page1) == compute_page_hash(page2)
 
+def is_alphabet_page(page) -> bool:
+    """
+    Check whether a page can take the vectorized symbol-code paths.
+
+    Args:
+        page: Page text or PageView
+
+    Returns:
+        True if every character of the page is in ALPHABET
+    """
+    if isinstance(page, PageView):
+        return True
+    return page.isascii() and not np.any(encode_page(page) >= len(ALPHABET))
+
+def _flatten_pages(pages) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lay a batch of pages out as one run of symbol codes.
+
+    Args:
+        pages: Page texts or PageViews, or a 2D array of symbol codes with
+            one page per row
+
+    Returns:
+        (codes, rows, lengths): int64 codes, the page each code belongs to,
+        and the length of every page
+    """
+    if isinstance(pages, np.ndarray):
+        count, length = pages.shape
+        lengths = np.full(count, length, dtype=np.int64)
+        codes = pages.astype(np.int64).ravel()
+    elif any(isinstance(page, PageView) for page in pages):
+        lengths = np.array([len(page) for page in pages], dtype=np.int64)
+        codes = np.concatenate([PageView.of(page).codes for page in pages] or
+                               [np.zeros(0, dtype=np.uint8)]).astype(np.int64)
+    else:
+        lengths = np.array([len(page) for page in pages], dtype=np.int64)
+        codes = encode_page(''.join(pages)).astype(np.int64)
+    if np.any(codes >= len(ALPHABET)):
+        raise ValueError(f"Pages must only contain: {ALPHABET}")
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    return codes, rows, lengths
+
+def _packed_grams(codes: np.ndarray, n: int) -> np.ndarray:
+    """Pack the n-gram starting at every position into one base-29 integer."""
+    base = len(ALPHABET)
+    grams = np.zeros(len(codes) - n + 1, dtype=np.int64)
+    for k in range(n):
+        grams = grams * base + codes[k:len(codes) - n + 1 + k]
+    return grams
+
+def _gram_occurrences(codes: np.ndarray, rows: np.ndarray,
+                      n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group the n-grams of a flattened batch by page and content.
+
+    N-grams up to PACKED_GRAM_LENGTH characters are packed into integers;
+    longer ones are compared as raw code bytes. Either way they are
+    renumbered densely so that (page, n-gram) pairs fit one int64 key.
+
+    Returns:
+        (pages, grams, counts, first): one entry per distinct n-gram of each
+        page, sorted by page - the page, a dense n-gram id shared across
+        pages, its occurrences in that page and the flat index of the first
+    """
+    if n < 1:
+        raise ValueError("Pattern length must be at least 1")
+    empty = np.zeros(0, dtype=np.int64)
+    if len(codes) < n:
+        return empty, empty, empty, empty
+    # Only n-grams that lie within one page
+    starts = np.flatnonzero(rows[:len(codes) - n + 1] == rows[n - 1:])
+    if n <= PACKED_GRAM_LENGTH:
+        grams = _packed_grams(codes, n)[starts]
+    else:
+        windows = np.lib.stride_tricks.sliding_window_view(codes.astype(np.uint8), n)[starts]
+        grams = np.ascontiguousarray(windows).view(np.dtype((np.void, n))).ravel()
+    _, gram_ids = np.unique(grams, return_inverse=True)
+    gram_ids = gram_ids.ravel().astype(np.int64)
+    distinct = int(gram_ids.max()) + 1 if len(gram_ids) else 1
+    keys = rows[starts] * distinct + gram_ids
+    pair_keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    return pair_keys // distinct, pair_keys % distinct, counts, starts[first]
+
+def ngram_occurrences(pages, n: int) -> Dict[str, np.ndarray]:
+    """
+    Count every distinct n-gram of every page in a batch at once.
+
+    Args:
+        pages: Page texts or PageViews, or a 2D array of symbol codes with one page per row
+        n: N-gram length
+
+    Returns:
+        Dictionary of arrays with one entry per distinct n-gram of each page:
+        'page' (index into pages), 'gram' (an id equal for equal n-grams across
+        pages), 'count' (occurrences in that page) and 'position' (where the
+        first occurrence starts within the page)
+    """
+    codes, rows, lengths = _flatten_pages(pages)
+    page_ids, grams, counts, first = _gram_occurrences(codes, rows, n)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return {
+        'page': page_ids,
+        'gram': grams,
+        'count': counts,
+        'position': first - offsets[page_ids]
+    }
+
 def analyze_page_patterns(page: str, pattern_length: int = 3) -> Dict[str, int]:
     """
     Analyze repeating patterns in a page.
@@ -254,99 +1409,285 @@ def analyze_page_patterns(page: str, pattern_length: int = 3) -> Dict[str, int]:
         pattern_length: Length of patterns to look for
         
     Returns:
-        Dictionary mapping patterns to their occurrence counts
+        Dictionary mapping patterns that occur more than once to their
+        occurrence counts, in order of first appearance
     """
-    patterns = {}
-    
-    for i in range(len(page) - pattern_length + 1):
-        pattern = page[i:i + pattern_length]
-        patterns[pattern] = patterns.get(pattern, 0) + 1
-    
-    # Return only patterns that occur more than once
-    return {pattern: count for pattern, count in patterns.items() if count > 1}
+    if not is_alphabet_page(page):
+        # Text outside ALPHABET has no symbol codes; count substrings directly
+        patterns = {}
+        for i in range(len(page) - pattern_length + 1):
+            pattern = page[i:i + pattern_length]
+            patterns[pattern] = patterns.get(pattern, 0) + 1
+        return {pattern: count for pattern, count in patterns.items() if count > 1}
+    occurrences = ngram_occurrences([page], pattern_length)
+    repeated = occurrences['count'] > 1
+    positions = occurrences['position'][repeated]
+    counts = occurrences['count'][repeated]
+    order = np.argsort(positions)
+    return {page[i:i + pattern_length]: int(c)
+            for i, c in zip(positions[order].tolist(), counts[order].tolist())}
+
+def _repeated_gram_counts(codes: np.ndarray, rows: np.ndarray, pages: int, n: int) -> np.ndarray:
+    """
+    Count, per page, the distinct n-grams that occur more than once.
+
+    Each n-gram is packed into one base-29 integer with the page number
+    above it, so a single sort of the keys lines up equal n-grams of the
+    same page next to each other.
+    """
+    if len(codes) < n:
+        return np.zeros(pages, dtype=np.int64)
+    grams = _packed_grams(codes, n)
+    # Drop n-grams that would straddle two pages
+    inside = rows[:len(grams)] == rows[n - 1:]
+    keys = np.sort(rows[:len(grams)][inside] * len(ALPHABET) ** n + grams[inside])
+    # A repeated n-gram starts wherever a run of equal keys does
+    same = keys[1:] == keys[:-1]
+    starts = same.copy()
+    starts[1:] &= ~same[:-1]
+    return np.bincount(keys[1:][starts] // len(ALPHABET) ** n, minlength=pages)
+
+def batch_page_statistics(pages) -> Dict[str, np.ndarray]:
+    """
+    Compute the statistics of get_page_statistics for many pages at once.
+
+    Every page is converted to symbol codes once; the histogram, entropy,
+    unique character count, most common character and 3/4-character
+    pattern counts are all derived from those codes with whole-batch
+    NumPy operations. Pages may differ in length.
+
+    Args:
+        pages: Page texts or PageViews, or a 2D array of symbol codes as returned by generate_pages
+
+    Returns:
+        Dictionary of arrays with one entry per page: 'length', 'histogram'
+        (symbol counts, one column per ALPHABET character), 'entropy',
+        'unique_chars', 'mode' (symbol code of the most common character,
+        ties going to the one seen first, -1 for empty pages), 'mode_count',
+        'patterns_3char' and 'patterns_4char'
+    """
+    codes, rows, lengths = _flatten_pages(pages)
+    count = len(lengths)
+    symbols = len(ALPHABET)
+
+    histogram = np.bincount(rows * symbols + codes, minlength=count * symbols).reshape(count, symbols)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probabilities = histogram / lengths[:, None]
+        entropy = -np.sum(np.where(histogram > 0, probabilities * np.log2(probabilities), 0.0), axis=1)
+
+    # Like Counter.most_common, break ties by first appearance in the page
+    mode_count = histogram.max(axis=1, initial=0)
+    is_mode = (histogram == mode_count[:, None]) & (histogram > 0)
+    positions = np.flatnonzero(is_mode[rows, codes])
+    mode_rows, first = np.unique(rows[positions], return_index=True)
+    mode = np.full(count, -1, dtype=np.int64)
+    mode[mode_rows] = codes[positions[first]]
+
+    return {
+        'length': lengths,
+        'histogram': histogram,
+        'entropy': entropy,
+        'unique_chars': np.count_nonzero(histogram, axis=1),
+        'mode': mode,
+        'mode_count': mode_count,
+        'patterns_3char': _repeated_gram_counts(codes, rows, count, 3),
+        'patterns_4char': _repeated_gram_counts(codes, rows, count, 4)
+    }
 
 def get_page_statistics(page: str) -> Dict[str, any]:
     """
     Generate comprehensive statistics for a page.
     
     Args:
-        page: The page content to analyze
+        page: The page content to analyze, as text or a PageView
+        
+    Returns:
+        Dictionary containing various page statistics
+    """
+    if not is_alphabet_page(page):
+        return {
+            'length': len(page),
+            'entropy': compute_entropy(page),
+            'hash': compute_page_hash(page),
+            'char_frequencies': char_frequency_analysis(page),
+            'unique_chars': len(set(page)),
+            'most_common_char': Counter(page).most_common(1)[0] if page else None,
+            'patterns_3char': len(analyze_page_patterns(page, 3)),
+            'patterns_4char': len(analyze_page_patterns(page, 4))
+        }
+    return page_statistics_entry(batch_page_statistics([page]), 0, compute_page_hash(page))
+
+def page_statistics_entry(stats: Dict[str, np.ndarray], row: int, page_hash: str) -> Dict[str, any]:
+    """
+    Build the get_page_statistics dictionary for one row of batch_page_statistics columns.
+    
+    Args:
+        stats: Columns as returned by batch_page_statistics
+        row: Row of the page within the columns
+        page_hash: SHA256 hex digest of the page
         
     Returns:
         Dictionary containing various page statistics
     """
+    length = int(stats['length'][row])
+    mode = int(stats['mode'][row])
     return {
-        'length': len(page),
-        'entropy': compute_entropy(page),
-        'hash': compute_page_hash(page),
-        'char_frequencies': char_frequency_analysis(page),
-        'unique_chars': len(set(page)),
-        'most_common_char': Counter(page).most_common(1)[0] if page else None,
-        'patterns_3char': len(analyze_page_patterns(page, 3)),
-        'patterns_4char': len(analyze_page_patterns(page, 4))
+        'length': length,
+        'entropy': float(stats['entropy'][row]),
+        'hash': page_hash,
+        'char_frequencies': {ALPHABET[code]: (n / length) * 100
+                             for code, n in enumerate(stats['histogram'][row].tolist()) if n},
+        'unique_chars': int(stats['unique_chars'][row]),
+        'most_common_char': (ALPHABET[mode], int(stats['mode_count'][row])) if length else None,
+        'patterns_3char': int(stats['patterns_3char'][row]),
+        'patterns_4char': int(stats['patterns_4char'][row])
     }
 
-def compare_pages(page1: str, page2: str) -> Dict[str, any]:
+# Metrics computed by compare_pages, with a rough cost model for each:
+# (fixed seconds, seconds per character of both pages, seconds per pair of
+# characters), fitted on 800 and 3200 character pages. Similarity and edit
+# distance share one distance computation; frequency and entropy share one
+# histogram.
+COMPARISON_METRICS = {
+    'identity': (0.0, 2e-9, 0.0),
+    'frequency': (4e-4, 5e-8, 0.0),
+    'entropy': (4e-4, 5e-8, 0.0),
+    'patterns': (0.0, 3e-7, 0.0),
+    'lcs': (0.0, 1.4e-6, 0.0),
+    'similarity': (0.0, 1.2e-6, 8e-10),
+    'edit_distance': (0.0, 1.2e-6, 8e-10),
+}
+
+def _comparison_metrics(metrics: Optional[Iterable[str]]) -> List[str]:
+    """Validate a requested metric set, defaulting to every metric."""
+    if metrics is None:
+        return list(COMPARISON_METRICS)
+    metrics = list(metrics)
+    unknown = [metric for metric in metrics if metric not in COMPARISON_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown comparison metric '{unknown[0]}'. "
+                         f"Choose from: {', '.join(COMPARISON_METRICS)}")
+    return metrics
+
+def estimate_comparison_costs(length1: int, length2: int,
+                              metrics: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Estimate how long each compare_pages metric takes for pages of the given lengths.
+    
+    Args:
+        length1: Length of the first page
+        length2: Length of the second page
+        metrics: Metrics to estimate (default: all of COMPARISON_METRICS)
+        
+    Returns:
+        Dictionary mapping metric names to estimated seconds, cheapest first
+    """
+    costs = {}
+    for metric in _comparison_metrics(metrics):
+        fixed, per_char, per_pair = COMPARISON_METRICS[metric]
+        costs[metric] = fixed + per_char * (length1 + length2) + per_pair * length1 * length2
+    return dict(sorted(costs.items(), key=lambda item: item[1]))
+
+def compare_pages(page1: str, page2: str, metrics: Optional[Iterable[str]] = None) -> Dict[str, any]:
     """
     Comprehensive comparison between two pages.
     
+    Only the requested metrics are computed. Metrics that share work, such
+    as similarity and edit distance, compute it once.
+    
     Args:
         page1: First page content
         page2: Second page content
+        metrics: Names from COMPARISON_METRICS to compute (default: all)
         
     Returns:
-        Dictionary containing detailed comparison metrics
+        Dictionary containing detailed comparison metrics:
+        identity -> identical, hash1, hash2, length_diff;
+        similarity -> similarity_percentage;
+        lcs -> longest_common_substring, lcs_length;
+        edit_distance -> edit_distance;
+        entropy -> entropy1, entropy2, entropy_difference;
+        frequency -> frequency_difference;
+        patterns -> common_patterns, total_patterns1, total_patterns2,
+        pattern_overlap_ratio
     """
+    wanted = set(_comparison_metrics(metrics))
     if not page1 or not page2:
         return {}
     
+    comparison = {}
+    vectorized = is_alphabet_page(page1) and is_alphabet_page(page2)
+    
     # Basic metrics
-    length_diff = abs(len(page1) - len(page2))
-    hash1 = compute_page_hash(page1)
-    hash2 = compute_page_hash(page2)
-    are_identical = hash1 == hash2
-    
-    # Content similarity
-    similarity_pct = similarity_percentage(page1, page2)
-    lcs = longest_common_substring(page1, page2)
-    edit_distance = levenshtein_distance(page1, page2)
-    
-    # Character frequency comparison
-    freq1 = char_frequency_analysis(page1)
-    freq2 = char_frequency_analysis(page2)
-    
-    # Calculate frequency difference
-    all_chars = set(freq1.keys()) | set(freq2.keys())
-    freq_diff = sum(abs(freq1.get(char, 0) - freq2.get(char, 0)) for char in all_chars)
-    
-    # Entropy comparison
-    entropy1 = compute_entropy(page1)
-    entropy2 = compute_entropy(page2)
-    entropy_diff = abs(entropy1 - entropy2)
-    
-    # Pattern analysis
-    patterns1 = analyze_page_patterns(page1, 3)
-    patterns2 = analyze_page_patterns(page2, 3)
-    common_patterns = set(patterns1.keys()) & set(patterns2.keys())
+    if 'identity' in wanted:
+        hash1 = compute_page_hash(page1)
+        hash2 = compute_page_hash(page2)
+        comparison.update({
+            'identical': hash1 == hash2,
+            'hash1': hash1,
+            'hash2': hash2,
+            'length_diff': abs(len(page1) - len(page2))
+        })
     
-    return {
-        'identical': are_identical,
-        'hash1': hash1,
-        'hash2': hash2,
-        'length_diff': length_diff,
-        'similarity_percentage': similarity_pct,
-        'longest_common_substring': lcs,
-        'lcs_length': len(lcs),
-        'edit_distance': edit_distance,
-        'entropy1': entropy1,
-        'entropy2': entropy2,
-        'entropy_difference': entropy_diff,
-        'frequency_difference': freq_diff,
-        'common_patterns': len(common_patterns),
-        'total_patterns1': len(patterns1),
-        'total_patterns2': len(patterns2),
-        'pattern_overlap_ratio': len(common_patterns) / max(len(patterns1), len(patterns2), 1)
-    }
+    # Content similarity, both from one edit distance
+    if wanted & {'similarity', 'edit_distance'}:
+        edit_distance = levenshtein_distance(page1, page2)
+    if 'similarity' in wanted:
+        max_length = max(len(page1), len(page2))
+        comparison['similarity_percentage'] = ((max_length - edit_distance) / max_length) * 100
+    if 'lcs' in wanted:
+        lcs = longest_common_substring(page1, page2)
+        comparison.update({'longest_common_substring': lcs, 'lcs_length': len(lcs)})
+    if 'edit_distance' in wanted:
+        comparison['edit_distance'] = edit_distance
+    
+    # Entropy and character frequencies from one histogram of both pages
+    if wanted & {'entropy', 'frequency'} and vectorized:
+        stats = batch_page_statistics([page1, page2])
+    if 'entropy' in wanted:
+        if vectorized:
+            entropy1, entropy2 = stats['entropy'].tolist()
+        else:
+            entropy1, entropy2 = compute_entropy(page1), compute_entropy(page2)
+        comparison.update({
+            'entropy1': entropy1,
+            'entropy2': entropy2,
+            'entropy_difference': abs(entropy1 - entropy2)
+        })
+    if 'frequency' in wanted:
+        if vectorized:
+            freq1, freq2 = (stats['histogram'] / stats['length'][:, None]) * 100
+            comparison['frequency_difference'] = float(np.abs(freq1 - freq2).sum())
+        else:
+            freq1, freq2 = char_frequency_analysis(page1), char_frequency_analysis(page2)
+            comparison['frequency_difference'] = sum(
+                abs(freq1.get(char, 0) - freq2.get(char, 0)) for char in set(freq1) | set(freq2))
+    
+    # Repeated 3-character patterns of both pages in one pass
+    if 'patterns' in wanted and not vectorized:
+        patterns1 = analyze_page_patterns(page1, 3)
+        patterns2 = analyze_page_patterns(page2, 3)
+        common_patterns = len(set(patterns1) & set(patterns2))
+        comparison.update({
+            'common_patterns': common_patterns,
+            'total_patterns1': len(patterns1),
+            'total_patterns2': len(patterns2),
+            'pattern_overlap_ratio': common_patterns / max(len(patterns1), len(patterns2), 1)
+        })
+    elif 'patterns' in wanted:
+        occurrences = ngram_occurrences([page1, page2], 3)
+        repeated = occurrences['count'] > 1
+        patterns1 = occurrences['gram'][repeated & (occurrences['page'] == 0)]
+        patterns2 = occurrences['gram'][repeated & (occurrences['page'] == 1)]
+        common_patterns = len(np.intersect1d(patterns1, patterns2, assume_unique=True))
+        comparison.update({
+            'common_patterns': common_patterns,
+            'total_patterns1': len(patterns1),
+            'total_patterns2': len(patterns2),
+            'pattern_overlap_ratio': common_patterns / max(len(patterns1), len(patterns2), 1)
+        })
+    
+    return comparison
 
 def highlight_differences(page1: str, page2: str, context_chars: int = 50) -> List[Dict[str, any]]:
     """
@@ -414,9 +1755,58 @@ def highlight_differences(page1: str, page2: str, context_chars: int = 50) -> Li
     
     return differences
 
+# Most substrings returned by find_common_substrings
+COMMON_SUBSTRING_LIMIT = 50
+
+def _suffix_array(text: np.ndarray) -> np.ndarray:
+    """Suffix array of an integer sequence by prefix doubling (O(n log n))."""
+    n = len(text)
+    rank = np.unique(text, return_inverse=True)[1].astype(np.int64)
+    sa = np.argsort(rank, kind='stable')
+    step = 1
+    while n and step < n:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - step] = rank[step:]
+        sa = np.lexsort((second, rank))
+        changed = (rank[sa][1:] != rank[sa][:-1]) | (second[sa][1:] != second[sa][:-1])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(changed)))
+        if rank[sa[-1]] == n - 1:
+            break
+        step *= 2
+    return sa
+
+def _lcp_array(text: List[int], sa: List[int]) -> List[int]:
+    """Kasai's algorithm: lcp[i] is the common prefix of suffixes sa[i-1] and sa[i]."""
+    n = len(text)
+    rank = [0] * n
+    for i, suffix in enumerate(sa):
+        rank[suffix] = i
+    lcp = [0] * n
+    h = 0
+    for suffix in range(n):
+        if rank[suffix] == 0:
+            h = 0
+            continue
+        other = sa[rank[suffix] - 1]
+        while suffix + h < n and other + h < n and text[suffix + h] == text[other + h]:
+            h += 1
+        lcp[rank[suffix]] = h
+        if h:
+            h -= 1
+    return lcp
+
 def find_common_substrings(page1: str, page2: str, min_length: int = 5) -> List[Dict[str, any]]:
     """
-    Find all common substrings between two pages.
+    Find the maximal common substrings between two pages.
+    
+    A match is maximal when it cannot be extended left or right in both
+    pages at once. Matches are enumerated from a generalized suffix array
+    with an LCP array: two suffixes from different pages whose longest
+    common prefix is at least min_length give a match, which is maximal
+    when the characters before them differ. The LCP intervals are walked
+    bottom-up with suffixes grouped by page and preceding character, so
+    only maximal pairs are ever produced.
     
     Args:
         page1: First page content
@@ -424,67 +1814,157 @@ def find_common_substrings(page1: str, page2: str, min_length: int = 5) -> List[
         min_length: Minimum length of substrings to consider
         
     Returns:
-        List of common substrings with their positions
+        Up to COMMON_SUBSTRING_LIMIT matches with their positions, longest first
     """
+    min_length = max(1, min_length)
+    split = len(page1)
+    # A unique separator keeps matches from running across the two pages
+    text = [ord(c) for c in page1] + [-1] + [ord(c) for c in page2]
+    sa = _suffix_array(np.array(text, dtype=np.int64)).tolist()
+    lcp = _lcp_array(text, sa)
+    
+    def leaf(suffix):
+        if suffix < split:
+            return {(1, text[suffix - 1] if suffix > 0 else None): [suffix]}
+        if suffix > split:
+            return {(2, text[suffix - 1] if suffix > split + 1 else None): [suffix - split - 1]}
+        return {}
+    
+    # Min-heap of the best (length, -pos1, -pos2) matches seen so far
+    best = []
+    
+    def merge(groups, child, depth):
+        """Report pairs between a node's groups and a new child, then merge them."""
+        if depth >= min_length and (len(best) < COMMON_SUBSTRING_LIMIT or depth >= best[0][0]):
+            for (side, left), positions in groups.items():
+                for (other_side, other_left), other_positions in child.items():
+                    # Different preceding characters (or a page start) make the pair maximal
+                    if side == other_side or (left == other_left and left is not None):
+                        continue
+                    for a in positions:
+                        for b in other_positions:
+                            pos1, pos2 = (a, b) if side == 1 else (b, a)
+                            item = (depth, -pos1, -pos2)
+                            if len(best) < COMMON_SUBSTRING_LIMIT:
+                                heapq.heappush(best, item)
+                            elif item > best[0]:
+                                heapq.heapreplace(best, item)
+        # Merge the smaller side into the larger one
+        if sum(map(len, groups.values())) < sum(map(len, child.values())):
+            groups, child = child, groups
+        for key, positions in child.items():
+            groups.setdefault(key, []).extend(positions)
+        return groups
+    
+    stack = [[0, {}]]
+    pending = leaf(sa[0]) if len(sa) else {}
+    for i in range(1, len(sa) + 1):
+        h = lcp[i] if i < len(sa) else 0
+        while stack[-1][0] > h:
+            depth, groups = stack.pop()
+            pending = merge(groups, pending, depth)
+        if stack[-1][0] < h:
+            stack.append([h, {}])
+        stack[-1][1] = merge(stack[-1][1], pending, stack[-1][0])
+        if i < len(sa):
+            pending = leaf(sa[i])
+    
     common_substrings = []
+    for length, pos1, pos2 in sorted(best, reverse=True):
+        pos1, pos2 = -pos1, -pos2
+        common_substrings.append({
+            'substring': page1[pos1:pos1 + length],
+            'length': length,
+            'pos1': pos1,
+            'pos2': pos2,
+            'page1_context': page1[max(0, pos1-10):pos1+length+10],
+            'page2_context': page2[max(0, pos2-10):pos2+length+10]
+        })
+    return common_substrings
+
+# Pages and metric shared with similarity matrix pool workers
+_matrix_pages = None
+_matrix_metric = None
+
+def _init_matrix_worker(pages: List[str], metric: str) -> None:
+    """Pool initializer: keep the pages so tasks only carry a row number."""
+    global _matrix_pages, _matrix_metric
+    _matrix_pages = pages
+    _matrix_metric = SIMILARITY_METRICS[metric]
+
+def _similarity_row(i: int) -> Tuple[int, List[float]]:
+    """Similarities of page i to every later page (one upper-triangle row)."""
+    page = _matrix_pages[i]
+    return i, [_matrix_metric(page, other) for other in _matrix_pages[i + 1:]]
+
+def iter_similarity_matrix(pages: List[str], metric: str = 'levenshtein',
+                           workers: int = 1) -> Iterator[Dict[str, any]]:
+    """
+    Compute the upper triangle of a similarity matrix, yielding rows as they finish.
     
-    for i in range(len(page1) - min_length + 1):
-        for length in range(min_length, min(len(page1) - i + 1, 100)):  # Limit to avoid huge strings
-            substring = page1[i:i + length]
-            
-            # Find all occurrences in page2
-            pos2 = 0
-            while True:
-                pos2 = page2.find(substring, pos2)
-                if pos2 == -1:
-                    break
-                
-                common_substrings.append({
-                    'substring': substring,
-                    'length': length,
-                    'pos1': i,
-                    'pos2': pos2,
-                    'page1_context': page1[max(0, i-10):i+length+10],
-                    'page2_context': page2[max(0, pos2-10):pos2+length+10]
-                })
-                
-                pos2 += 1
+    Every metric is symmetric, so only pairs i < j are computed. With more
+    than one worker, rows are spread over a process pool and arrive in
+    completion order, longest rows first submitted.
     
-    # Remove duplicates and sort by length (descending)
-    seen = set()
-    unique_substrings = []
+    Args:
+        pages: List of page contents
+        metric: Name of a SIMILARITY_METRICS entry
+        workers: Number of worker processes
+        
+    Yields:
+        {'type': 'row', 'row': i, 'similarities': {j: similarity}} for each
+        row, covering every j > i
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Unknown similarity metric '{metric}'. "
+                         f"Choose from: {', '.join(SIMILARITY_METRICS)}")
+    rows = range(len(pages) - 1)
     
-    for item in sorted(common_substrings, key=lambda x: x['length'], reverse=True):
-        key = (item['substring'], item['pos1'], item['pos2'])
-        if key not in seen:
-            seen.add(key)
-            unique_substrings.append(item)
+    if workers > 1 and len(rows) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(rows)), initializer=_init_matrix_worker,
+                                 initargs=(pages, metric)) as pool:
+            futures = [pool.submit(_similarity_row, i) for i in rows]
+            for future in as_completed(futures):
+                i, values = future.result()
+                yield {'type': 'row', 'row': i,
+                       'similarities': dict(enumerate(values, i + 1))}
+        return
     
-    return unique_substrings[:50]  # Limit to top 50
+    similarity = SIMILARITY_METRICS[metric]
+    for i in rows:
+        yield {'type': 'row', 'row': i,
+               'similarities': {j: similarity(pages[i], pages[j]) for j in range(i + 1, len(pages))}}
 
-def calculate_page_similarity_matrix(pages: List[str]) -> List[List[float]]:
+def calculate_page_similarity_matrix(pages: List[str], metric: str = 'levenshtein',
+                                     workers: int = 1,
+                                     on_row: Optional[Callable[[int, Dict[int, float]], None]] = None) -> List[List[float]]:
     """
     Calculate similarity matrix for multiple pages.
     
     Args:
         pages: List of page contents
+        metric: Name of a SIMILARITY_METRICS entry
+        workers: Number of worker processes
+        on_row: Called as on_row(i, {j: similarity}) as each upper-triangle
+            row arrives, for progressive display
         
     Returns:
         2D matrix of similarity percentages
     """
     n = len(pages)
-    matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+    matrix = [[100.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
     
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                matrix[i][j] = 100.0
-            else:
-                matrix[i][j] = similarity_percentage(pages[i], pages[j])
+    for record in iter_similarity_matrix(pages, metric, workers):
+        i = record['row']
+        for j, similarity in record['similarities'].items():
+            matrix[i][j] = matrix[j][i] = similarity
+        if on_row:
+            on_row(i, record['similarities'])
     
     return matrix
 
-def detect_twin_pages(page: str, seed_range: int = 1000, similarity_threshold: float = 95.0) -> List[Dict[str, any]]:
+def detect_twin_pages(page: str, seed_range: int = 1000, similarity_threshold: float = 95.0,
+                      index=None) -> List[Dict[str, any]]:
     """
     Detect pages that are very similar to the given page (potential twins).
     
@@ -492,10 +1972,16 @@ def detect_twin_pages(page: str, seed_range: int = 1000, similarity_threshold: f
         page: Page content to find twins for
         seed_range: Range of seeds to check around the original
         similarity_threshold: Minimum similarity percentage to consider as twin
+        index: Optional babel_store.TwinIndex; candidates then come from its
+            LSH buckets over every indexed seed (seed_range is ignored) and
+            are confirmed with an exact comparison
         
     Returns:
         List of twin page information
     """
+    if index is not None:
+        return index.find_twins(page, similarity_threshold)
+    
     twins = []
     page_hash = compute_page_hash(page)
     
@@ -22,8 +22,10 @@ import queue
 import hashlib
 import re
 from babel import generate_page, search_for_phrase, format_page_output, validate_phrase, ALPHABET
-from babel_core import compute_entropy, get_page_statistics, similarity_percentage, compare_pages, highlight_differences, find_common_substrings
-from babel_tools import generate_phrase_mutations, search_with_wildcards, LibraryCoordinates, find_echo_pages, search_for_similar_pages
+from babel_core import compare_pages, find_common_substrings, iter_page_batches, decode_page, find_longest_common_substring, estimate_comparison_costs, cached_page, PageView, GENERATOR_VERSION, mounted_corpora, mount_corpora
+from babel_tools import generate_phrase_mutations, search_with_wildcards, LibraryCoordinates, search_for_similar_pages, PhraseMatcher, iter_search, ScanProgress
+from babel_store import open_result_store, write_json_atomic, FlushPolicy, RESULTS_DB, SearchLedger, TwinIndex, PageStatsCache, seed_only_record, record_page, mount_corpus_dir
+from babel_bus import PageBus
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
@@ -150,36 +152,51 @@ import json
 BACKGROUND_RESULTS_FILE = 'background_results.json'
 BACKGROUND_PROGRESS_FILE = 'background_progress.json'
 PAGE_LENGTH = 3200
+# Seeds handed to a background worker at a time
+BG_CHUNK_SIZE = 4096
+# Most background results loaded into the results list at once
+BG_RESULTS_LOAD_LIMIT = 10000
+# Comparison metrics estimated to take longer than this (seconds) are
+# computed in a background thread and shown when ready
+COMPARISON_PREVIEW_COST = 0.005
+
+def bg_search_worker(matcher, task_q, result_q, running_flag, corpus_paths):
+    """Background search worker function for multiprocessing.
+
+    Workers take contiguous (start, stop) seed chunks from task_q. Hits are
+    reported before the chunk's 'chunk_done' message, so the parent never
+    records a chunk as scanned before it has seen all of its results.
+    matcher is a PhraseMatcher compiled once in the parent for the whole
+    phrase list, so each page is scanned a single time. corpus_paths are the
+    parent's mounted page corpora, which spawned workers do not inherit.
+    """
+    mount_corpora(corpus_paths)
 
-def is_duplicate(result, result_list):
-    """Check if a (seed, phrase) pair is already in the result_list."""
-    return any(r['seed'] == result['seed'] and r['phrase'] == result['phrase'] for r in result_list)
-
-def bg_search_worker(start_seed, step, phrases, result_q, running_flag):
-    """Background search worker function for multiprocessing."""
     def compute_hash(page):
         return hashlib.sha256(page.encode('utf-8')).hexdigest()
     
-    seed = start_seed
     while running_flag.is_set():
         try:
-            page = generate_page(seed, length=PAGE_LENGTH)
-            page_hash = compute_hash(page)
-            for term in phrases:
-                idx = page.find(term)
-                if idx != -1:
-                    result = {
-                        'phrase': term,
-                        'seed': seed,
-                        'index': idx,
-                        'timestamp': datetime.datetime.now().isoformat(),
-                        'hash': page_hash
-                    }
-                    result_q.put(result)
-            seed += step
-        except Exception:
-            seed += step
+            start, stop = task_q.get(timeout=0.5)
+        except queue.Empty:
             continue
+        for seeds, pages in iter_page_batches(range(start, stop), PAGE_LENGTH):
+            if not running_flag.is_set():
+                return
+            hashes = {}
+            for row, term, indices in matcher.scan_by_phrase(pages):
+                if row not in hashes:
+                    hashes[row] = compute_hash(decode_page(pages[row]))
+                result = {
+                    'phrase': term,
+                    'seed': seeds[row],
+                    'index': indices[0],
+                    'indices': indices,
+                    'timestamp': datetime.datetime.now().isoformat(),
+                    'hash': hashes[row]
+                }
+                result_q.put({'type': 'result_found', 'data': result})
+        result_q.put({'type': 'chunk_done', 'data': (start, stop)})
 
 class BabelGUI(tk.Tk):
     def __init__(self):
@@ -197,6 +214,19 @@ class BabelGUI(tk.Tk):
         self.result_queue = queue.Queue()
         self.evolution_results = []
         self.evolution_running = False
+        self.search_cancel = threading.Event()
+        # Mounted before any worker process starts, so the workers inherit them
+        for path, reason in mount_corpus_dir()[1]:
+            print(f"Skipping page corpus {path}: {reason}")
+        # Manual searches and reverse lookups share one scan of the seed space
+        self.page_bus = PageBus(workers=self.bg_num_cores)
+        # Identifies the latest page comparison so stale metrics are dropped
+        self.comparison_id = 0
+        # Cached page statistics, one cache per page length
+        self.page_stats_caches = {}
+        # Filters and row count of results loaded from the background store,
+        # which stand for every stored result matching those filters
+        self.results_source = None
         self.evolution_thread = None
         self.current_generation = 0
         self.comparison_page1 = None
@@ -206,6 +236,13 @@ class BabelGUI(tk.Tk):
         self.comparison_results = None
         self.create_widgets()
         self.start_queue_processing()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        # Stop searches on the bus and shut down its worker pool
+        self.search_cancel.set()
+        self.page_bus.close()
+        self.destroy()
 
     def create_widgets(self):
         tab_control = ttk.Notebook(self)
@@ -253,6 +290,16 @@ class BabelGUI(tk.Tk):
 
         self.search_btn = ttk.Button(input_frame, text="Start Search", command=self.start_search)
         self.search_btn.grid(row=0, column=8, padx=10)
+        self.stop_search_btn = ttk.Button(input_frame, text="Stop", command=self.stop_search, state="disabled")
+        self.stop_search_btn.grid(row=0, column=9, padx=5)
+
+        self.anchored_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text="Page start only", variable=self.anchored_var).grid(row=1, column=1, sticky="w", padx=5)
+
+        ttk.Label(input_frame, text="Within First:").grid(row=1, column=2, sticky="e", padx=5)
+        self.window_var = tk.IntVar(value=0)
+        ttk.Entry(input_frame, textvariable=self.window_var, width=6).grid(row=1, column=3, padx=5)
+        ttk.Label(input_frame, text="chars (0 = whole page)").grid(row=1, column=4, columnspan=2, sticky="w", padx=5)
 
         evolution_frame = ttk.LabelFrame(parent, text="Phrase Evolution Mode")
         evolution_frame.pack(fill="x", padx=10, pady=5)
@@ -544,6 +591,7 @@ class BabelGUI(tk.Tk):
                     data = message['data']
                     self.perf_label.config(text="Search complete.")
                     self.search_btn.config(state="normal")
+                    self.stop_search_btn.config(state="disabled")
                     if data.get('show_message'):
                         messagebox.showinfo(data['title'], data['message'])
                 
@@ -557,6 +605,45 @@ class BabelGUI(tk.Tk):
                     self.evolution_progress_var.set(message['data']['status'])
                     self.progress['value'] = message['data']['progress']
                 
+                elif msg_type == 'reverse_lookup_complete':
+                    data = message['data']
+                    if data.get('error'):
+                        messagebox.showerror("Invalid Content", data['error'])
+                    elif data['seed'] is not None:
+                        self.jump_to_seed(data['seed'], data['dialog'])
+                        messagebox.showinfo("Found", f"Content found at seed {data['seed']}")
+                    else:
+                        messagebox.showwarning("Not Found", f"No match found in {data['max_attempts']} attempts.")
+                        data['dialog'].destroy()
+                
+                elif msg_type == 'comparison_metrics':
+                    data = message['data']
+                    if data['id'] == self.comparison_id:
+                        self.comparison_results_text.delete(1.0, tk.END)
+                        self.comparison_results_text.insert(tk.END, self._format_comparison(
+                            data['page1'], data['page2'], data['comparison'], data['common_substrings']))
+                
+                elif msg_type == 'twins_found':
+                    data = message['data']
+                    self.perf_label.config(text="Twin lookup complete.")
+                    if data.get('error'):
+                        messagebox.showerror("Twin Pages", f"Twin lookup failed: {data['error']}")
+                        continue
+                    for twin in data['twins']:
+                        self.results.append({
+                            'seed': twin['seed'],
+                            'index': 0,
+                            'length': len(twin['page']),
+                            'phrase': '',
+                            'kind': 'twin',
+                            'generator_version': GENERATOR_VERSION,
+                            'timestamp': datetime.datetime.now().isoformat(),
+                            'notes': f"Twin of seed {data['seed']}: {twin['similarity']:.2f}% similar ({twin['type']})",
+                            'hash': self.compute_page_hash(twin['page'])
+                        })
+                        self.results_list.insert(tk.END, f"Twin {len(self.results)}: Seed={twin['seed']}, Similarity={twin['similarity']:.2f}%")
+                    messagebox.showinfo("Twin Pages", f"Found {len(data['twins'])} twin pages.")
+                
                 elif msg_type == 'evolution_complete':
                     self.evolution_progress_var.set("Evolution search complete.")
                     self.evolution_btn.config(state="normal")
@@ -598,7 +685,7 @@ class BabelGUI(tk.Tk):
         seed = self.coordinates_to_seed(*coords)
         self.cb_seed_label.config(text=f"Seed: {seed}")
         self.cb_coord_label.config(text=f"Coordinates: {self.format_coordinates({'hexagon': coords[0], 'wall': coords[1], 'shelf': coords[2], 'volume': coords[3], 'page': coords[4]})}")
-        page = generate_page(seed, length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200)
+        page = cached_page(seed, length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200)
         formatted_page = format_page_output(page, width=80)
         self.cb_page_text.delete(1.0, tk.END)
         self.cb_page_text.insert(tk.END, formatted_page)
@@ -669,57 +756,71 @@ class BabelGUI(tk.Tk):
 
     def run_bg_search_mp(self, num_cores):
         from multiprocessing import Process, Queue
+        task_q = Queue()
         result_q = Queue()
         running_flag = multiprocessing.Event()
         running_flag.set()
+        matcher = PhraseMatcher(self.bg_search_phrases)
+        store = open_result_store()
+        
+        progress = ScanProgress()
+        if os.path.exists(BACKGROUND_PROGRESS_FILE):
+            with open(BACKGROUND_PROGRESS_FILE, 'r', encoding='utf-8') as f:
+                try:
+                    progress = ScanProgress.from_dict(json.load(f))
+                except Exception:
+                    progress = ScanProgress()
+        
+        def save_progress():
+            write_json_atomic(BACKGROUND_PROGRESS_FILE, progress.to_dict())
+        
+        policy = FlushPolicy()
+        
         workers = []
+        corpus_paths = [c.path for c in mounted_corpora()]
         for i in range(num_cores):
-            p = Process(target=bg_search_worker, args=(i, num_cores, self.bg_search_phrases, result_q, running_flag))
+            p = Process(target=bg_search_worker, args=(matcher, task_q, result_q, running_flag, corpus_paths))
             p.daemon = True
             p.start()
             workers.append(p)
         
-        results = []
-        if os.path.exists(BACKGROUND_RESULTS_FILE):
-            with open(BACKGROUND_RESULTS_FILE, 'r', encoding='utf-8') as f:
-                try:
-                    results = json.load(f)
-                except Exception:
-                    results = []
-        
-        seed = 0
-        if os.path.exists(BACKGROUND_PROGRESS_FILE):
-            with open(BACKGROUND_PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                try:
-                    data = json.load(f)
-                    seed = data.get('last_seed', 0)
-                except Exception:
-                    seed = 0
+        # Keep two chunks queued per worker so none of them sits idle
+        gaps = progress.gaps()
+        for _ in range(2 * num_cores):
+            task_q.put(progress.next_chunk(BG_CHUNK_SIZE))
         
-        self.append_bg_log(f"[STARTED] Background search with {num_cores} cores")
+        self.append_bg_log(f"[STARTED] Background search with {num_cores} cores, resuming at seed "
+                           f"{progress.to_dict()['last_seed']} ({len(gaps)} gaps to rescan)")
         
         try:
             while self.bg_search_running.is_set():
                 try:
-                    result = result_q.get(timeout=0.5)
-                    if not is_duplicate(result, results):
-                        results.append(result)
-                        self.append_bg_log(f"[FOUND] '{result['phrase']}' at seed {result['seed']}, index {result['index']}")
-                        with open(BACKGROUND_RESULTS_FILE, 'w', encoding='utf-8') as f:
-                            json.dump(results, f, indent=2)
+                    msg = result_q.get(timeout=0.5)
                 except queue.Empty:
-                    pass
+                    continue
                 
-                seed += num_cores
-                if seed % 100000 == 0:
-                    with open(BACKGROUND_PROGRESS_FILE, 'w', encoding='utf-8') as f:
-                        json.dump({'last_seed': seed}, f)
+                if msg['type'] == 'result_found':
+                    result = msg['data']
+                    if store.add(result):
+                        self.append_bg_log(f"[FOUND] '{result['phrase']}' at seed {result['seed']}, index {result['index']}")
+                elif msg['type'] == 'chunk_done':
+                    start, stop = msg['data']
+                    progress.complete(start, stop)
+                    task_q.put(progress.next_chunk(BG_CHUNK_SIZE))
+                    if policy.record(stop - start):
+                        # A chunk only counts as scanned once its hits are on disk
+                        store.commit()
+                        save_progress()
+                        policy.reset()
         finally:
             running_flag.clear()
             for p in workers:
                 p.terminate()
                 p.join(timeout=1.0)
-            self.append_bg_log("[Background Search Stopped]")
+            store.close()
+            # Chunks still in flight are saved as gaps and rescanned next time
+            save_progress()
+            self.append_bg_log(f"[Background Search Stopped] Scanned up to seed {progress.to_dict()['last_seed']}")
 
     def append_bg_log(self, msg):
         self.result_queue.put({
@@ -734,7 +835,7 @@ class BabelGUI(tk.Tk):
         idx = sel[0]
         result = self.results[idx]
         if not any(r['seed'] == result['seed'] and r['phrase'] == result['phrase'] for r in self.bookmarks):
-            self.bookmarks.append(result.copy())
+            self.bookmarks.append(seed_only_record(result, self.default_page_length()))
             self.save_bookmarks()
             self.update_bookmarks_list()
             messagebox.showinfo("Bookmarked", "Result bookmarked.")
@@ -753,19 +854,21 @@ class BabelGUI(tk.Tk):
         idx = sel[0]
         result = self.bookmarks[idx]
         self.bookmark_text.delete(1.0, tk.END)
-        page = result.get('page', generate_page(result['seed'], length=PAGE_LENGTH))
+        page = record_page(result)
         phrase = result['phrase']
         index = result['index']
         formatted_page = format_page_output(page, width=80)
         self.bookmark_text.insert(tk.END, formatted_page)
         self.bookmark_text.tag_remove('highlight', '1.0', tk.END)
-        line_length = 80
-        line_num = index // line_length + 1
-        col_num = index % line_length
-        start_idx = f"{line_num}.{col_num}"
-        end_idx = f"{line_num}.{col_num + len(phrase)}"
-        self.bookmark_text.tag_add('highlight', start_idx, end_idx)
-        self.bookmark_text.tag_config('highlight', background='yellow', foreground='black')
+        # Twin rows hold a whole similar page, not a phrase match
+        if result.get('kind') != 'twin':
+            line_length = 80
+            line_num = index // line_length + 1
+            col_num = index % line_length
+            start_idx = f"{line_num}.{col_num}"
+            end_idx = f"{line_num}.{col_num + len(phrase)}"
+            self.bookmark_text.tag_add('highlight', start_idx, end_idx)
+            self.bookmark_text.tag_config('highlight', background='yellow', foreground='black')
 
     def save_bookmarks(self):
         with open('bookmarks.json', 'w', encoding='utf-8') as f:
@@ -775,7 +878,7 @@ class BabelGUI(tk.Tk):
         if os.path.exists('bookmarks.json'):
             with open('bookmarks.json', 'r', encoding='utf-8') as f:
                 try:
-                    self.bookmarks = json.load(f)
+                    self.bookmarks = [seed_only_record(r) for r in json.load(f)]
                     self.update_bookmarks_list()
                 except Exception:
                     self.bookmarks = []
@@ -801,7 +904,7 @@ class BabelGUI(tk.Tk):
             writer.writeheader()
             for r in self.bookmarks:
                 if 'hash' not in r:
-                    page = r.get('page', generate_page(r['seed'], length=PAGE_LENGTH))
+                    page = record_page(r)
                     r['hash'] = self.compute_page_hash(page)
                 writer.writerow({k: r.get(k, '') for k in writer.fieldnames})
         messagebox.showinfo("Exported", f"Bookmarks exported to {file}")
@@ -815,7 +918,7 @@ class BabelGUI(tk.Tk):
             return
         for r in self.bookmarks:
             if 'hash' not in r:
-                page = r.get('page', generate_page(r['seed'], length=PAGE_LENGTH))
+                page = record_page(r)
                 r['hash'] = self.compute_page_hash(page)
         with open(file, 'w', encoding='utf-8') as f:
             json.dump(self.bookmarks, f, indent=2)
@@ -829,14 +932,70 @@ class BabelGUI(tk.Tk):
             messagebox.showerror("Invalid Phrase", str(e))
             return
         self.results.clear()
+        self.results_source = None
         self.results_list.delete(0, tk.END)
         self.result_text.delete(1.0, tk.END)
         self.progress['value'] = 0
         self.search_btn.config(state="disabled")
+        self.stop_search_btn.config(state="normal")
+        self.search_cancel.clear()
         t = threading.Thread(target=self.run_search, args=(phrase,), daemon=True)
         t.start()
 
+    def stop_search(self):
+        self.search_cancel.set()
+        self.stop_search_btn.config(state="disabled")
+
+    def page_stats_cache(self, page_length):
+        if page_length not in self.page_stats_caches:
+            self.page_stats_caches[page_length] = PageStatsCache(page_length=page_length,
+                                                                 workers=self.bg_num_cores)
+        return self.page_stats_caches[page_length]
+
+    def iter_all_results(self):
+        # Results loaded from the background store are only the first rows
+        # matching the load filters; the rest stream from the store, in the
+        # same order, followed by results added since loading
+        if self.results_source is None:
+            yield from self.results
+            return
+        loaded = self.results_source['loaded']
+        yield from self.results[:loaded]
+        with open_result_store() as store:
+            for r in store.iter_results(offset=loaded, **self.results_source['filters']):
+                yield seed_only_record(r)
+        yield from self.results[loaded:]
+
+    def results_summary(self):
+        # One pass over every result, for the analytics preview and report
+        seeds, phrases = set(), set()
+        total, index_sum, low, high = 0, 0, None, None
+        for r in self.iter_all_results():
+            total += 1
+            seeds.add(r['seed'])
+            if r.get('kind') != 'twin':
+                phrases.add(r['phrase'])
+            index_sum += r['index']
+            low = r['seed'] if low is None else min(low, r['seed'])
+            high = r['seed'] if high is None else max(high, r['seed'])
+        return {
+            'total': total,
+            'unique_seeds': len(seeds),
+            'unique_phrases': len(phrases),
+            'seed_range': f"{low} - {high}" if total else "N/A",
+            'avg_index': index_sum / total if total else 0
+        }
+
+    def default_page_length(self):
+        return self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200
+
+    def result_page(self, result):
+        # Results only hold their seed and length; pages come from the cache
+        return record_page(result, self.default_page_length())
+
     def compute_page_hash(self, page):
+        if isinstance(page, PageView):
+            return page.sha256()
         return hashlib.sha256(page.encode('utf-8')).hexdigest()
 
     def wildcard_match(self, text, pattern):
@@ -850,84 +1009,68 @@ class BabelGUI(tk.Tk):
         return [(m.start(), m.end()) for m in regex.finditer(page)]
 
     def longest_common_substring(self, s1, s2):
-        m = [[0]*(len(s2)+1) for _ in range(len(s1)+1)]
-        longest = 0
-        lcs_end = 0
-        for i in range(1, len(s1)+1):
-            for j in range(1, len(s2)+1):
-                if s1[i-1] == s2[j-1]:
-                    m[i][j] = m[i-1][j-1] + 1
-                    if m[i][j] > longest:
-                        longest = m[i][j]
-                        lcs_end = j
-        return longest, lcs_end - longest
+        longest, _, start = find_longest_common_substring(s1, s2)
+        return longest, start
 
     def run_search(self, phrase):
         try:
             max_matches = self.max_matches_var.get()
             max_attempts = self.max_attempts_var.get()
             page_length = self.page_length_var.get()
+            anchored = self.anchored_var.get()
+            window = self.window_var.get() or None
             found = []
-            is_wildcard = '*' in phrase or '?' in phrase
             start_time = time.time()
             
-            for i in range(max_attempts):
-                page = generate_page(i, length=page_length)
-                page_hash = self.compute_page_hash(page)
-                
-                if is_wildcard:
-                    matches = self.find_wildcard_matches(page, phrase)
-                    for idx, end in matches:
-                        result = {
-                            'seed': i,
-                            'index': idx,
-                            'page': page,
-                            'phrase': phrase,
-                            'timestamp': datetime.datetime.now().isoformat(),
-                            'notes': '',
-                            'hash': page_hash
-                        }
-                        found.append(result)
-                        self.result_queue.put({
-                            'type': 'result_found',
-                            'data': result
-                        })
-                        if len(found) >= max_matches:
-                            break
-                else:
-                    idx = page.lower().find(phrase.lower())
-                    if idx != -1:
-                        result = {
-                            'seed': i,
-                            'index': idx,
-                            'page': page,
-                            'phrase': phrase,
-                            'timestamp': datetime.datetime.now().isoformat(),
-                            'notes': '',
-                            'hash': page_hash
-                        }
-                        found.append(result)
-                        self.result_queue.put({
-                            'type': 'result_found',
-                            'data': result
-                        })
-                        if len(found) >= max_matches:
-                            break
-                            
-                if len(found) >= max_matches:
-                    break
-                    
-                if i % 1000 == 0 or i == max_attempts - 1:
+            def on_hit(seed, idx):
+                # Results hold only what regenerates the page; its text and
+                # hash are produced through the page cache when needed
+                result = {
+                    'seed': seed,
+                    'index': idx,
+                    'length': page_length,
+                    'phrase': phrase,
+                    'generator_version': GENERATOR_VERSION,
+                    'timestamp': datetime.datetime.now().isoformat(),
+                    'notes': ''
+                }
+                found.append(result)
+                self.result_queue.put({
+                    'type': 'result_found',
+                    'data': result
+                })
+            
+            # Seed ranges searched before are answered from the ledger
+            with SearchLedger() as ledger:
+                records = iter_search(phrase, max_attempts=max_attempts, max_matches=max_matches,
+                                      page_length=page_length, anchored=anchored, window=window,
+                                      cancel=self.search_cancel, bus=self.page_bus, ledger=ledger)
+                for record in records:
+                    if record['type'] == 'hit':
+                        on_hit(record['seed'], record['index'])
+                        continue
                     elapsed = time.time() - start_time
-                    speed = (i+1) / elapsed if elapsed > 0 else 0
+                    speed = record['scanned'] / elapsed if elapsed > 0 else 0
+                    searched = record['scanned'] + record['cached']
                     self.result_queue.put({
                         'type': 'progress_update',
                         'data': {
-                            'status': f"Progress: {i+1}/{max_attempts} | Speed: {speed:.1f} pages/sec | Found: {len(found)}",
-                            'progress': (i+1) / max_attempts * 100
+                            'status': f"Progress: {searched}/{max_attempts} ({record['cached']} from ledger) | Speed: {speed:.1f} pages/sec | Found: {record['matches']}",
+                            'progress': min(searched / max_attempts * 100, 100)
                         }
                     })
             
+            if record['reason'] == 'cancelled':
+                self.result_queue.put({
+                    'type': 'search_complete',
+                    'data': {
+                        'show_message': True,
+                        'title': 'Search Stopped',
+                        'message': f"Stopped after searching seeds below {record['next_seed']}. Found {len(found)} matches."
+                    }
+                })
+                return
+            
             self.result_queue.put({
                 'type': 'search_complete',
                 'data': {
@@ -981,19 +1124,21 @@ class BabelGUI(tk.Tk):
         idx = sel[0]
         result = self.results[idx]
         self.result_text.delete(1.0, tk.END)
-        page = result.get('page', generate_page(result['seed'], length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200))
+        page = self.result_page(result)
         phrase = result['phrase']
         index = result['index']
         formatted_page = format_page_output(page, width=80)
         self.result_text.insert(tk.END, formatted_page)
         self.result_text.tag_remove('highlight', '1.0', tk.END)
-        line_length = 80
-        line_num = index // line_length + 1
-        col_num = index % line_length
-        start_idx = f"{line_num}.{col_num}"
-        end_idx = f"{line_num}.{col_num + len(phrase)}"
-        self.result_text.tag_add('highlight', start_idx, end_idx)
-        self.result_text.tag_config('highlight', background='yellow', foreground='black')
+        # Twin rows hold a whole similar page, not a phrase match
+        if result.get('kind') != 'twin':
+            line_length = 80
+            line_num = index // line_length + 1
+            col_num = index % line_length
+            start_idx = f"{line_num}.{col_num}"
+            end_idx = f"{line_num}.{col_num + len(phrase)}"
+            self.result_text.tag_add('highlight', start_idx, end_idx)
+            self.result_text.tag_config('highlight', background='yellow', foreground='black')
         self.notes_var.set(result.get('notes', ''))
         coords = self.seed_to_coordinates(result['seed'])
         hash_val = result.get('hash', self.compute_page_hash(page))
@@ -1041,9 +1186,9 @@ class BabelGUI(tk.Tk):
         with open(file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=['phrase', 'seed', 'index', 'timestamp', 'notes', 'hash'])
             writer.writeheader()
-            for r in self.results:
+            for r in self.iter_all_results():
                 if 'hash' not in r:
-                    page = r.get('page', generate_page(r['seed'], length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200))
+                    page = self.result_page(r)
                     r['hash'] = self.compute_page_hash(page)
                 writer.writerow({k: r.get(k, '') for k in writer.fieldnames})
         messagebox.showinfo("Exported", f"Results exported to {file}")
@@ -1055,34 +1200,45 @@ class BabelGUI(tk.Tk):
         file = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
         if not file:
             return
-        for r in self.results:
-            if 'hash' not in r:
-                page = r.get('page', generate_page(r['seed'], length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200))
-                r['hash'] = self.compute_page_hash(page)
+        # Written one result at a time, so store-backed results are never all in memory
         with open(file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2)
+            f.write('[')
+            for i, r in enumerate(self.iter_all_results()):
+                if 'hash' not in r:
+                    page = self.result_page(r)
+                    r['hash'] = self.compute_page_hash(page)
+                f.write(',\n' if i else '\n')
+                f.write(json.dumps(r, indent=2))
+            f.write('\n]')
         messagebox.showinfo("Exported", f"Results exported to {file}")
 
     def load_background_results(self):
-        if os.path.exists(BACKGROUND_RESULTS_FILE):
-            with open(BACKGROUND_RESULTS_FILE, 'r', encoding='utf-8') as f:
-                try:
-                    self.results = json.load(f)
-                    self.results_list.delete(0, tk.END)
-                    for i, r in enumerate(self.results, 1):
-                        self.results_list.insert(tk.END, f"Match {i}: Seed={r['seed']}, Index={r['index']}")
-                    messagebox.showinfo("Loaded", "Background search results loaded.")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to load background results: {str(e)}")
-        else:
+        if not (os.path.exists(RESULTS_DB) or os.path.exists(BACKGROUND_RESULTS_FILE)):
             messagebox.showwarning("No Data", "No background results found.")
+            return
+        try:
+            with open_result_store() as store:
+                total = store.count()
+                # Narrow to one phrase when the search box holds a background phrase
+                phrase = self.phrase_var.get().strip().lower()
+                if phrase not in self.bg_search_phrases:
+                    phrase = None
+                self.results = [seed_only_record(r) for r in store.query(phrase=phrase, limit=BG_RESULTS_LOAD_LIMIT)]
+                self.results_source = {'filters': {'phrase': phrase}, 'loaded': len(self.results)}
+            self.results_list.delete(0, tk.END)
+            for i, r in enumerate(self.results, 1):
+                self.results_list.insert(tk.END, f"Match {i}: Seed={r['seed']}, Index={r['index']}")
+            messagebox.showinfo("Loaded", f"Loaded {len(self.results)} of {total} background search results.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load background results: {str(e)}")
 
     def save_session(self):
         file = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
         if not file:
             return
         session_data = {
-            'results': self.results,
+            # Every stored result, not just the page loaded from the store
+            'results': list(self.iter_all_results()),
             'bookmarks': self.bookmarks,
             'bg_phrases': self.bg_search_phrases
         }
@@ -1097,8 +1253,10 @@ class BabelGUI(tk.Tk):
         with open(file, 'r', encoding='utf-8') as f:
             try:
                 session_data = json.load(f)
-                self.results = session_data.get('results', [])
-                self.bookmarks = session_data.get('bookmarks', [])
+                self.results = [seed_only_record(r, self.default_page_length())
+                                for r in session_data.get('results', [])]
+                self.results_source = None
+                self.bookmarks = [seed_only_record(r) for r in session_data.get('bookmarks', [])]
                 self.bg_search_phrases = session_data.get('bg_phrases', [])
                 self.results_list.delete(0, tk.END)
                 for i, r in enumerate(self.results, 1):
@@ -1137,15 +1295,20 @@ class BabelGUI(tk.Tk):
         ttk.Button(dialog, text="Search", command=lambda: self.perform_seed_reverse_lookup(content_var.get(), dialog)).pack(pady=5)
 
     def perform_seed_reverse_lookup(self, content, dialog):
+        t = threading.Thread(target=self.run_seed_reverse_lookup, args=(content.lower(), dialog), daemon=True)
+        t.start()
+
+    def run_seed_reverse_lookup(self, content, dialog):
         max_attempts = 10000
-        for seed in range(max_attempts):
-            page = generate_page(seed, length=PAGE_LENGTH)
-            if content.lower() in page.lower():
-                self.jump_to_seed(seed, dialog)
-                messagebox.showinfo("Found", f"Content found at seed {seed}")
-                return
-        messagebox.showwarning("Not Found", f"No match found in {max_attempts} attempts.")
-        dialog.destroy()
+        data = {'dialog': dialog, 'seed': None, 'max_attempts': max_attempts}
+        try:
+            for record in iter_search(content, max_attempts=max_attempts, max_matches=1,
+                                      page_length=PAGE_LENGTH, bus=self.page_bus):
+                if record['type'] == 'hit':
+                    data['seed'] = record['seed']
+        except Exception as e:
+            data['error'] = str(e)
+        self.result_queue.put({'type': 'reverse_lookup_complete', 'data': data})
 
     def show_entropy_analysis(self):
         sel = self.results_list.curselection()
@@ -1156,9 +1319,9 @@ class BabelGUI(tk.Tk):
         result = self.results[idx]
         
         try:
-            page = result.get('page', generate_page(result['seed'], length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200))
-            entropy = compute_entropy(page)
-            stats = get_page_statistics(page)
+            page = self.result_page(result)
+            stats = self.page_stats_cache(len(page)).page_statistics(result['seed'])
+            entropy = stats['entropy']
             
             # Generate detailed data text
             data_text = f"SEARCH RESULT ENTROPY ANALYSIS\n{'='*50}\n\n"
@@ -1171,7 +1334,7 @@ class BabelGUI(tk.Tk):
             data_text += f"Shannon Entropy: {entropy:.4f} bits\n"
             
             # Add safety check for division by zero
-            unique_chars = len(set(page))
+            unique_chars = stats['unique_chars']
             if unique_chars > 1:
                 max_entropy = np.log2(unique_chars)
                 efficiency = (entropy / max_entropy * 100) if max_entropy > 0 else 0
@@ -1219,14 +1382,9 @@ class BabelGUI(tk.Tk):
             
             # Find most common substrings
             try:
-                substrings = {}
-                if len(page) >= 3:
-                    for i in range(len(page) - 2):
-                        substr = page[i:i+3]
-                        substrings[substr] = substrings.get(substr, 0) + 1
+                most_common = PageView.of(page).most_common(3, 5)
                 
-                if substrings:
-                    most_common = sorted(substrings.items(), key=lambda x: x[1], reverse=True)[:5]
+                if most_common:
                     data_text += f"\nMOST COMMON 3-CHAR SEQUENCES\n{'-'*30}\n"
                     for substr, count in most_common:
                         data_text += f"'{substr}': {count} occurrences\n"
@@ -1331,9 +1489,9 @@ class BabelGUI(tk.Tk):
         result = self.bookmarks[idx]
         
         try:
-            page = result.get('page', generate_page(result['seed'], length=PAGE_LENGTH))
-            entropy = compute_entropy(page)
-            stats = get_page_statistics(page)
+            page = record_page(result)
+            stats = self.page_stats_cache(len(page)).page_statistics(result['seed'])
+            entropy = stats['entropy']
             
             # Generate detailed data text
             data_text = f"BOOKMARK ENTROPY ANALYSIS\n{'='*50}\n\n"
@@ -1346,7 +1504,7 @@ class BabelGUI(tk.Tk):
             data_text += f"Shannon Entropy: {entropy:.4f} bits\n"
             
             # Add safety check for division by zero
-            unique_chars = len(set(page))
+            unique_chars = stats['unique_chars']
             if unique_chars > 1:
                 max_entropy = np.log2(unique_chars)
                 efficiency = (entropy / max_entropy * 100) if max_entropy > 0 else 0
@@ -1394,14 +1552,9 @@ class BabelGUI(tk.Tk):
             
             # Find most common substrings
             try:
-                substrings = {}
-                if len(page) >= 3:
-                    for i in range(len(page) - 2):
-                        substr = page[i:i+3]
-                        substrings[substr] = substrings.get(substr, 0) + 1
+                most_common = PageView.of(page).most_common(3, 5)
                 
-                if substrings:
-                    most_common = sorted(substrings.items(), key=lambda x: x[1], reverse=True)[:5]
+                if most_common:
                     data_text += f"\nMOST COMMON 3-CHAR SEQUENCES\n{'-'*30}\n"
                     for substr, count in most_common:
                         data_text += f"'{substr}': {count} occurrences\n"
@@ -1598,29 +1751,41 @@ class BabelGUI(tk.Tk):
     def show_twin_page_dialog(self):
         dialog = tk.Toplevel(self)
         dialog.title("Find Twin Pages")
-        dialog.geometry("300x150")
+        dialog.geometry("300x200")
         ttk.Label(dialog, text="Enter Seed:").pack(pady=5)
         seed_var = tk.IntVar(value=0)
         ttk.Entry(dialog, textvariable=seed_var).pack(pady=5)
         ttk.Label(dialog, text="Offset (±N):").pack(pady=5)
-        offset_var = tk.IntVar(value=1)
+        offset_var = tk.IntVar(value=1000)
         ttk.Entry(dialog, textvariable=offset_var).pack(pady=5)
-        ttk.Button(dialog, text="Find Twins", command=lambda: self.find_twin_pages(seed_var.get(), offset_var.get(), dialog)).pack(pady=5)
+        ttk.Label(dialog, text="Min Similarity (%):").pack(pady=5)
+        threshold_var = tk.DoubleVar(value=95.0)
+        ttk.Entry(dialog, textvariable=threshold_var).pack(pady=5)
+        ttk.Button(dialog, text="Find Twins", command=lambda: self.find_twin_pages(seed_var.get(), offset_var.get(), threshold_var.get(), dialog)).pack(pady=5)
 
-    def find_twin_pages(self, seed, offset, dialog):
-        twin_results = find_echo_pages(seed, offset, length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200)
-        self.results.extend(twin_results)
-        self.results_list.delete(0, tk.END)
-        for i, r in enumerate(self.results, 1):
-            self.results_list.insert(tk.END, f"Match {i}: Seed={r['seed']}, Index={r['index']}")
+    def find_twin_pages(self, seed, offset, threshold, dialog):
         dialog.destroy()
-        messagebox.showinfo("Twin Pages", f"Found {len(twin_results)} twin pages.")
+        self.perf_label.config(text=f"Indexing seeds around {seed} for twin lookup...")
+        t = threading.Thread(target=self.run_twin_search, args=(seed, offset, threshold), daemon=True)
+        t.start()
+
+    def run_twin_search(self, seed, offset, threshold):
+        # Pages already in the twin index are not generated again
+        data = {'seed': seed, 'twins': []}
+        try:
+            with TwinIndex(page_length=PAGE_LENGTH) as index:
+                index.add_range(max(0, seed - offset), seed + offset + 1)
+                data['twins'] = index.find_twins(cached_page(seed, length=PAGE_LENGTH),
+                                                 threshold, exclude_seed=seed)
+        except Exception as e:
+            data['error'] = str(e)
+        self.result_queue.put({'type': 'twins_found', 'data': data})
 
     def compare_pages(self):
         seed1 = self.compare_seed1_var.get()
         seed2 = self.compare_seed2_var.get()
-        page1 = generate_page(seed1, length=PAGE_LENGTH)
-        page2 = generate_page(seed2, length=PAGE_LENGTH)
+        page1 = cached_page(seed1, length=PAGE_LENGTH)
+        page2 = cached_page(seed2, length=PAGE_LENGTH)
         
         # Clear previous content
         self.compare_text1.delete(1.0, tk.END)
@@ -1635,23 +1800,43 @@ class BabelGUI(tk.Tk):
         self.compare_text1.insert(tk.END, formatted_page1)
         self.compare_text2.insert(tk.END, formatted_page2)
         
-        # Calculate and display comparison statistics
-        similarity = similarity_percentage(page1, page2)
-        differences = highlight_differences(page1, page2)
-        common_substrings = find_common_substrings(page1, page2)
+        # Show the cheap metrics now; the expensive ones follow from a thread
+        costs = estimate_comparison_costs(len(page1), len(page2))
+        cheap = [metric for metric, cost in costs.items() if cost < COMPARISON_PREVIEW_COST]
+        expensive = [metric for metric in costs if metric not in cheap]
+        comparison = compare_pages(page1, page2, cheap)
+        self.comparison_results_text.insert(tk.END, self._format_comparison(page1, page2, comparison))
         
-        # Display comparison results
-        comparison_info = f"Similarity: {similarity:.2f}%\n"
-        comparison_info += f"Page 1 Length: {len(page1)} characters\n"
-        comparison_info += f"Page 2 Length: {len(page2)} characters\n"
-        comparison_info += f"Common substrings found: {len(common_substrings)}\n"
-        comparison_info += f"Character differences: {abs(len(page1) - len(page2))}\n"
-        
-        self.comparison_results_text.insert(tk.END, comparison_info)
+        self.comparison_id += 1
+        t = threading.Thread(target=self.run_page_comparison,
+                             args=(self.comparison_id, page1, page2, expensive, comparison), daemon=True)
+        t.start()
         
         # Highlight differences in both text widgets
         self._highlight_page_differences(page1, page2)
 
+    def run_page_comparison(self, comparison_id, page1, page2, metrics, comparison):
+        comparison = dict(comparison, **compare_pages(page1, page2, metrics))
+        data = {'id': comparison_id, 'page1': page1, 'page2': page2, 'comparison': comparison,
+                'common_substrings': len(find_common_substrings(page1, page2))}
+        self.result_queue.put({'type': 'comparison_metrics', 'data': data})
+
+    def _format_comparison(self, page1, page2, comparison, common_substrings=None):
+        """Describe a compare_pages result; metrics not computed yet show as pending."""
+        def metric(key, fmt):
+            return fmt.format(comparison[key]) if key in comparison else "computing..."
+        info = f"Similarity: {metric('similarity_percentage', '{:.2f}%')}\n"
+        info += f"Page 1 Length: {len(page1)} characters\n"
+        info += f"Page 2 Length: {len(page2)} characters\n"
+        info += f"Common substrings found: {'computing...' if common_substrings is None else common_substrings}\n"
+        info += f"Character differences: {abs(len(page1) - len(page2))}\n"
+        info += f"Edit distance: {metric('edit_distance', '{}')}\n"
+        info += f"Longest common substring: {metric('lcs_length', '{} characters')}\n"
+        info += f"Entropy: {metric('entropy1', '{:.4f}')} / {metric('entropy2', '{:.4f}')} bits\n"
+        info += f"Frequency difference: {metric('frequency_difference', '{:.2f}')}\n"
+        info += f"Common 3-character patterns: {metric('common_patterns', '{}')}\n"
+        return info
+
     def _highlight_page_differences(self, page1, page2):
         """Highlight character differences between two pages in the comparison text widgets."""
         # Configure tags for highlighting differences
@@ -1699,18 +1884,17 @@ class BabelGUI(tk.Tk):
             messagebox.showwarning("No Data", "No results to display.")
             return
         
-        seeds = [r['seed'] for r in self.results]
+        seeds = np.fromiter((r['seed'] for r in self.iter_all_results()), dtype=np.int64)
         
         # Generate detailed data text
-        seed_counts = {}
-        for seed in seeds:
-            seed_counts[seed] = seed_counts.get(seed, 0) + 1
+        unique_seeds, counts = np.unique(seeds, return_counts=True)
+        seed_counts = dict(zip(unique_seeds.tolist(), counts.tolist()))
         
         data_text = f"SEED DISTRIBUTION ANALYSIS\n{'='*50}\n\n"
         data_text += f"Total Results: {len(seeds)}\n"
         data_text += f"Unique Seeds: {len(seed_counts)}\n"
-        data_text += f"Seed Range: {min(seeds)} - {max(seeds)}\n"
-        data_text += f"Average Seed: {sum(seeds)/len(seeds):.1f}\n\n"
+        data_text += f"Seed Range: {seeds.min()} - {seeds.max()}\n"
+        data_text += f"Average Seed: {seeds.mean():.1f}\n\n"
         
         data_text += "Most Frequent Seeds:\n"
         sorted_seeds = sorted(seed_counts.items(), key=lambda x: x[1], reverse=True)
@@ -1721,7 +1905,7 @@ class BabelGUI(tk.Tk):
             ax = fig.add_subplot(111)
             
             # Create histogram
-            ax.hist(seeds, bins=min(50, len(set(seeds))), alpha=0.7, color='skyblue', edgecolor='black')
+            ax.hist(seeds, bins=min(50, len(seed_counts)), alpha=0.7, color='skyblue', edgecolor='black')
             ax.set_xlabel('Seed Values')
             ax.set_ylabel('Frequency')
             ax.set_title('Distribution of Seeds in Search Results')
@@ -1736,18 +1920,25 @@ class BabelGUI(tk.Tk):
             return
         
         phrases = {}
-        for r in self.results:
+        total = 0
+        for r in self.iter_all_results():
+            if r.get('kind') == 'twin':
+                continue
             phrases[r['phrase']] = phrases.get(r['phrase'], 0) + 1
+            total += 1
+        if not total:
+            messagebox.showwarning("No Data", "No phrase search results to display.")
+            return
         
         # Generate detailed data text
         data_text = f"PHRASE FREQUENCY ANALYSIS\n{'='*50}\n\n"
-        data_text += f"Total Results: {len(self.results)}\n"
+        data_text += f"Total Results: {total}\n"
         data_text += f"Unique Phrases: {len(phrases)}\n\n"
         
         data_text += "Phrase Frequency Breakdown:\n"
         sorted_phrases = sorted(phrases.items(), key=lambda x: x[1], reverse=True)
         for i, (phrase, count) in enumerate(sorted_phrases):
-            percentage = (count / len(self.results)) * 100
+            percentage = (count / total) * 100
             data_text += f"{i+1:2d}. '{phrase}': {count} occurrences ({percentage:.1f}%)\n"
         
         def create_phrase_chart(fig):
@@ -1780,29 +1971,30 @@ class BabelGUI(tk.Tk):
             messagebox.showwarning("No Data", "No results to display.")
             return
         
-        timestamps = []
-        for r in self.results:
+        # Grouped by hour while streaming, without keeping every timestamp
+        hourly_counts = {}
+        first = last = None
+        total = 0
+        for r in self.iter_all_results():
             try:
                 ts = datetime.datetime.fromisoformat(r['timestamp'])
-                timestamps.append(ts)
             except:
                 continue
+            total += 1
+            first = ts if first is None else min(first, ts)
+            last = ts if last is None else max(last, ts)
+            hour_key = ts.replace(minute=0, second=0, microsecond=0)
+            hourly_counts[hour_key] = hourly_counts.get(hour_key, 0) + 1
         
-        if not timestamps:
+        if not total:
             messagebox.showwarning("No Data", "No valid timestamps found in results.")
             return
         
         # Generate detailed data text
         data_text = f"TIMELINE ANALYSIS\n{'='*50}\n\n"
-        data_text += f"Total Results with Timestamps: {len(timestamps)}\n"
-        data_text += f"Time Range: {min(timestamps)} to {max(timestamps)}\n"
-        data_text += f"Duration: {max(timestamps) - min(timestamps)}\n\n"
-        
-        # Group by hour
-        hourly_counts = {}
-        for ts in timestamps:
-            hour_key = ts.replace(minute=0, second=0, microsecond=0)
-            hourly_counts[hour_key] = hourly_counts.get(hour_key, 0) + 1
+        data_text += f"Total Results with Timestamps: {total}\n"
+        data_text += f"Time Range: {first} to {last}\n"
+        data_text += f"Duration: {last - first}\n\n"
         
         data_text += "Results by Hour:\n"
         sorted_hours = sorted(hourly_counts.items())
@@ -1836,21 +2028,19 @@ class BabelGUI(tk.Tk):
             messagebox.showwarning("No Data", "No results to display.")
             return
         
-        indices = [r['index'] for r in self.results]
+        indices = np.fromiter((r['index'] for r in self.iter_all_results()), dtype=np.int64)
         
         # Generate detailed data text
         data_text = f"MATCH DENSITY ANALYSIS\n{'='*50}\n\n"
         data_text += f"Total Matches: {len(indices)}\n"
-        data_text += f"Index Range: {min(indices)} - {max(indices)}\n"
-        data_text += f"Average Position: {sum(indices)/len(indices):.1f}\n\n"
+        data_text += f"Index Range: {indices.min()} - {indices.max()}\n"
+        data_text += f"Average Position: {indices.mean():.1f}\n\n"
         
         # Create position bins
-        max_index = max(indices)
+        max_index = int(indices.max())
         bin_size = max(1, max_index // 20)  # 20 bins
-        bins = {}
-        for idx in indices:
-            bin_key = (idx // bin_size) * bin_size
-            bins[bin_key] = bins.get(bin_key, 0) + 1
+        bin_keys, bin_counts = np.unique(indices // bin_size * bin_size, return_counts=True)
+        bins = dict(zip(bin_keys.tolist(), bin_counts.tolist()))
         
         data_text += "Position Distribution (by ranges):\n"
         for bin_start in sorted(bins.keys()):
@@ -1869,7 +2059,7 @@ class BabelGUI(tk.Tk):
             
             try:
                 # Create histogram that looks like a heatmap
-                n_bins = min(50, max(10, len(set(indices))))  # Ensure at least 10 bins
+                n_bins = min(50, max(10, len(np.unique(indices))))  # Ensure at least 10 bins
                 n, bins_edges, patches = ax.hist(indices, bins=n_bins, 
                                                alpha=0.8, edgecolor='black')
                 
@@ -1897,7 +2087,7 @@ class BabelGUI(tk.Tk):
                 
                 # Add statistics annotation
                 if len(indices) > 0:
-                    stats_text = f'Total: {len(indices)}\nRange: {min(indices)}-{max(indices)}\nAvg: {sum(indices)/len(indices):.1f}'
+                    stats_text = f'Total: {len(indices)}\nRange: {indices.min()}-{indices.max()}\nAvg: {indices.mean():.1f}'
                     ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, 
                            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
                 
@@ -1916,16 +2106,20 @@ class BabelGUI(tk.Tk):
             return
         
         try:
+            # Entropies come from the page statistics cache, one lookup per page length
+            default_length = self.default_page_length()
+            seeds_by_length = {}
+            for r in self.iter_all_results():
+                length = r.get('length', default_length)
+                seeds_by_length.setdefault(length, []).append(r['seed'])
             entropies = []
             seeds = []
-            for r in self.results:
+            for length, length_seeds in seeds_by_length.items():
                 try:
-                    page = r.get('page', generate_page(r['seed'], length=self.page_length_var.get() if hasattr(self, 'page_length_var') else 3200))
-                    entropy = compute_entropy(page)
-                    entropies.append(entropy)
-                    seeds.append(r['seed'])
+                    entropies.extend(self.page_stats_cache(length).lookup(length_seeds)['entropy'].tolist())
+                    seeds.extend(length_seeds)
                 except Exception as e:
-                    print(f"Error processing result {r.get('seed', 'unknown')}: {e}")
+                    print(f"Error processing results of length {length}: {e}")
                     continue
             
             if not entropies:
@@ -2012,9 +2206,10 @@ class BabelGUI(tk.Tk):
         data_text += f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
         
         # Basic statistics
-        total_results = len(self.results)
-        unique_seeds = len(set(r['seed'] for r in self.results))
-        unique_phrases = len(set(r['phrase'] for r in self.results))
+        summary = self.results_summary()
+        total_results = summary['total']
+        unique_seeds = summary['unique_seeds']
+        unique_phrases = summary['unique_phrases']
         
         data_text += f"DATASET OVERVIEW\n{'-'*30}\n"
         data_text += f"Total Results: {total_results}\n"
@@ -2040,16 +2235,12 @@ class BabelGUI(tk.Tk):
             self.analytics_preview_text.insert(tk.END, "No search results available for analytics.\n\nRun a search to generate analytics data.")
         else:
             # Generate summary statistics
-            total_results = len(self.results)
-            unique_seeds = len(set(r['seed'] for r in self.results))
-            unique_phrases = len(set(r['phrase'] for r in self.results))
-            
-            if self.results:
-                seed_range = f"{min(r['seed'] for r in self.results)} - {max(r['seed'] for r in self.results)}"
-                avg_index = sum(r['index'] for r in self.results) / len(self.results)
-            else:
-                seed_range = "N/A"
-                avg_index = 0
+            summary = self.results_summary()
+            total_results = summary['total']
+            unique_seeds = summary['unique_seeds']
+            unique_phrases = summary['unique_phrases']
+            seed_range = summary['seed_range']
+            avg_index = summary['avg_index']
             
             preview_text = f"""ANALYTICS SUMMARY
 {'='*50}
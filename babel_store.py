@@ -0,0 +1,859 @@
+"""
+babel_store.py
+
+Persistent storage for background search results.
+
+Results live in a SQLite database in WAL mode instead of a JSON file that
+is rewritten on every hit. Each (seed, phrase) pair is stored once, inserts
+are committed in batches, and results can be queried by phrase, seed
+range and time without loading the whole history into memory.
+
+The search ledger remembers which seed ranges manual searches have already
+covered, and what they found there, so repeat searches skip those ranges.
+
+The twin index keeps MinHash LSH buckets for ranges of pages, so near
+duplicate pages can be looked up without comparing against every page.
+
+The page statistics cache keeps entropy, hash, histogram and the other
+per-page statistics of every seed it has seen in memory-mapped column
+files, so analytics over many results do not regenerate their pages.
+
+Page corpora built into the corpus directory are mounted so searches and
+analytics read those seed ranges from disk instead of generating them.
+
+Results and bookmarks are kept seed-only: the seed, page length and
+generator version fully determine a page, which is regenerated through
+the page cache when it is shown.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
+
+import numpy as np
+
+from babel_core import (generate_pages, iter_page_batches, encode_page,
+                        minhash_signatures, lsh_buckets, levenshtein_within,
+                        batch_page_statistics, page_statistics_entry, PAGE_LENGTH,
+                        SHINGLE_LENGTH, MINHASH_BANDS, MINHASH_ROWS, ALPHABET, ALPHABET_BYTES,
+                        GENERATOR_VERSION, GENERATION_BATCH_SIZE, PageView, cached_page,
+                        PageCorpus, mount_corpus, mounted_corpora, mount_corpora)
+
+RESULTS_DB = 'background_results.db'
+LEGACY_RESULTS_FILE = 'background_results.json'
+SEARCH_LEDGER_DB = 'search_ledger.db'
+TWIN_INDEX_DB = 'twin_index.db'
+PAGE_STATS_DIR = 'page_stats'
+CORPUS_DIR = 'corpora'
+CORPUS_SUFFIX = '.corpus'
+
+# Inserts are committed once this many are pending, or after
+# COMMIT_INTERVAL seconds, whichever comes first
+COMMIT_BATCH_SIZE = 256
+COMMIT_INTERVAL = 5.0
+
+# Default flush policy for search progress: write hits and progress out
+# after this many pages or this many seconds, whichever comes first
+FLUSH_EVERY_PAGES = 50000
+FLUSH_INTERVAL = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    seed INTEGER NOT NULL,
+    phrase TEXT NOT NULL,
+    page_index INTEGER NOT NULL,
+    indices TEXT,
+    timestamp TEXT NOT NULL,
+    hash TEXT,
+    UNIQUE (seed, phrase)
+);
+CREATE INDEX IF NOT EXISTS results_by_phrase ON results (phrase, seed);
+CREATE INDEX IF NOT EXISTS results_by_time ON results (timestamp);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY
+);
+"""
+
+_COLUMNS = "seed, phrase, page_index, indices, timestamp, hash"
+
+class ResultStore:
+    """
+    SQLite-backed store of background search results.
+
+    Results are the same dictionaries the background searchers produce
+    ('phrase', 'seed', 'index', optional 'indices', 'timestamp' and
+    optional 'hash'). Open one store per thread; WAL mode lets readers
+    query while a search is writing.
+    """
+
+    def __init__(self, path: str = RESULTS_DB, batch_size: int = COMMIT_BATCH_SIZE,
+                 commit_interval: float = COMMIT_INTERVAL, durable: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL keeps the database consistent after a crash but may lose the
+        # last commits on power loss; FULL syncs the WAL on every commit
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, result: Dict[str, Any]) -> bool:
+        """
+        Add a result unless its (seed, phrase) pair is already stored.
+
+        Args:
+            result: Result dictionary
+
+        Returns:
+            True if the result was new
+        """
+        indices = result.get('indices')
+        cursor = self.conn.execute(
+            f"INSERT OR IGNORE INTO results ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (result['seed'], result['phrase'], result['index'],
+             json.dumps(indices) if indices is not None else None,
+             result['timestamp'], result.get('hash')))
+        added = cursor.rowcount == 1
+        if added:
+            self._pending += 1
+            if (self._pending >= self.batch_size or
+                    time.monotonic() - self._last_commit >= self.commit_interval):
+                self.commit()
+        return added
+
+    def commit(self) -> None:
+        """Commit pending inserts."""
+        if self._pending:
+            self.conn.commit()
+            self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        """Commit pending inserts and close the database."""
+        self.commit()
+        self.conn.close()
+
+    def _where(self, phrase: Optional[str], seed_range: Optional[Tuple[int, int]],
+               since: Optional[str], until: Optional[str]) -> Tuple[str, list]:
+        """Build a WHERE clause for the query filters."""
+        clauses, params = [], []
+        if phrase is not None:
+            clauses.append("phrase = ?")
+            params.append(phrase)
+        if seed_range is not None:
+            clauses.append("seed >= ? AND seed < ?")
+            params.extend(seed_range)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_results(self, phrase: Optional[str] = None,
+                     seed_range: Optional[Tuple[int, int]] = None,
+                     since: Optional[str] = None, until: Optional[str] = None,
+                     limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored results in the order they were found.
+
+        Args:
+            phrase: Only results for this phrase
+            seed_range: Only results with start <= seed < stop
+            since: Only results with an ISO timestamp at or after this one
+            until: Only results with an ISO timestamp before this one
+            limit: Maximum number of results
+            offset: Number of matching results to skip
+
+        Yields:
+            Result dictionaries
+        """
+        where, params = self._where(phrase, seed_range, since, until)
+        sql = f"SELECT {_COLUMNS} FROM results{where} ORDER BY id LIMIT ? OFFSET ?"
+        cursor = self.conn.execute(sql, params + [-1 if limit is None else limit, offset])
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for seed, phrase_, index, indices, timestamp, page_hash in rows:
+                result = {'phrase': phrase_, 'seed': seed, 'index': index}
+                if indices is not None:
+                    result['indices'] = json.loads(indices)
+                result['timestamp'] = timestamp
+                if page_hash is not None:
+                    result['hash'] = page_hash
+                yield result
+
+    def query(self, phrase: Optional[str] = None,
+              seed_range: Optional[Tuple[int, int]] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Fetch stored results as a list. Takes the same filters as iter_results().
+
+        Returns:
+            List of result dictionaries
+        """
+        return list(self.iter_results(phrase, seed_range, since, until, limit, offset))
+
+    def count(self, phrase: Optional[str] = None,
+              seed_range: Optional[Tuple[int, int]] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """Count stored results matching the filters."""
+        where, params = self._where(phrase, seed_range, since, until)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def phrase_counts(self) -> Dict[str, int]:
+        """Number of stored results per phrase."""
+        rows = self.conn.execute("SELECT phrase, COUNT(*) FROM results GROUP BY phrase ORDER BY phrase")
+        return dict(rows.fetchall())
+
+    def import_json(self, path: str) -> int:
+        """
+        Import results from a legacy background_results.json file.
+
+        The file is recorded as imported in the same commit as its last
+        results, so an interrupted import is picked up again by
+        open_result_store(); results added before the interruption are
+        skipped as duplicates.
+
+        Args:
+            path: JSON file holding a list of result dictionaries
+
+        Returns:
+            Number of results added
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                results = json.load(f)
+            except ValueError:
+                # The old writer could leave a truncated file behind, which
+                # no retry would read either
+                results = []
+        added = sum(self.add(result) for result in results)
+        self.conn.execute("INSERT OR IGNORE INTO imports (path) VALUES (?)", (path,))
+        self._pending += 1
+        self.commit()
+        return added
+
+    def imported(self, path: str) -> bool:
+        """Whether import_json() has completed for path."""
+        return self.conn.execute("SELECT 1 FROM imports WHERE path = ?", (path,)).fetchone() is not None
+
+def open_result_store(path: str = RESULTS_DB,
+                      legacy_path: Optional[str] = LEGACY_RESULTS_FILE,
+                      durable: bool = False) -> ResultStore:
+    """
+    Open the result store, importing legacy JSON results on first use.
+
+    Args:
+        path: SQLite database file
+        legacy_path: Old JSON results file to import until one import of it
+            has completed
+        durable: Sync every commit to disk (see ResultStore)
+
+    Returns:
+        Open ResultStore
+    """
+    store = ResultStore(path, durable=durable)
+    if legacy_path and os.path.exists(legacy_path) and not store.imported(legacy_path):
+        store.import_json(legacy_path)
+    return store
+
+def mount_corpus_dir(path: str = CORPUS_DIR) -> Tuple[List[PageCorpus], List[Tuple[str, str]]]:
+    """
+    Mount every valid page corpus file in a directory.
+
+    Files that cannot be opened, such as truncated corpora or ones written
+    by another page generator version, are skipped without affecting the
+    others.
+
+    Args:
+        path: Directory holding files ending in CORPUS_SUFFIX
+
+    Returns:
+        (mounted, skipped): the mounted corpora, none if the directory does
+        not exist, and a (file, reason) pair for every skipped file
+    """
+    mounted, skipped = [], []
+    if not os.path.isdir(path):
+        return mounted, skipped
+    for name in sorted(os.listdir(path)):
+        if not name.endswith(CORPUS_SUFFIX):
+            continue
+        file = os.path.join(path, name)
+        try:
+            corpus = PageCorpus(file)
+        except (OSError, ValueError) as e:
+            skipped.append((file, str(e)))
+            continue
+        mounted.append(mount_corpus(corpus))
+    return mounted, skipped
+
+def seed_only_record(record: Dict[str, Any], default_length: int = PAGE_LENGTH) -> Dict[str, Any]:
+    """
+    Copy a result or bookmark without its page text.
+
+    A page is fully determined by its seed, length and the generator that
+    made it, so records keep those and regenerate the text when shown.
+    Records that still carry a 'page' take their length from it.
+
+    Args:
+        record: Result dictionary, possibly holding a 'page'
+        default_length: Page length for records that do not state one
+
+    Returns:
+        New dictionary with 'length' and 'generator_version' and no 'page'
+    """
+    record = dict(record)
+    page = record.pop('page', None)
+    record['length'] = len(page) if page is not None else record.get('length', default_length)
+    record.setdefault('generator_version', GENERATOR_VERSION)
+    return record
+
+def record_page(record: Dict[str, Any], default_length: int = PAGE_LENGTH) -> PageView:
+    """
+    Page of a result or bookmark, regenerated through the page cache.
+
+    Args:
+        record: Result dictionary as made by seed_only_record
+        default_length: Page length for records that do not state one
+
+    Returns:
+        The page as a PageView
+
+    Raises:
+        ValueError: If the record was made by a different page generator
+    """
+    if 'page' in record:
+        return PageView.of(record['page'])
+    version = record.get('generator_version', GENERATOR_VERSION)
+    if version != GENERATOR_VERSION:
+        raise ValueError(f"Seed {record['seed']} was found with page generator version {version}, "
+                         f"this is version {GENERATOR_VERSION}")
+    return PageView.from_seed(record['seed'], record.get('length', default_length))
+
+def write_json_atomic(path: str, data: Any, fsync: bool = False) -> None:
+    """
+    Write JSON so readers only ever see the old or the new file.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces path in a single rename.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        fsync: Flush the file and its directory to disk before returning
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class FlushPolicy:
+    """
+    Decides when a running search should write its hits and progress out.
+
+    A flush is due once `every_pages` pages have been scanned or
+    `every_seconds` have passed since the last flush.
+    """
+
+    def __init__(self, every_pages: int = FLUSH_EVERY_PAGES,
+                 every_seconds: float = FLUSH_INTERVAL):
+        self.every_pages = every_pages
+        self.every_seconds = every_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        """Start counting again after a flush."""
+        self._pages = 0
+        self._last_flush = time.monotonic()
+
+    def record(self, pages: int) -> bool:
+        """
+        Count scanned pages.
+
+        Args:
+            pages: Number of pages scanned since the last call
+
+        Returns:
+            True if a flush is due
+        """
+        self._pages += pages
+        return (self._pages >= self.every_pages or
+                time.monotonic() - self._last_flush >= self.every_seconds)
+
+# A ledger key is (pattern, wildcard, scan_length): the hits on a page
+# depend only on the pattern, how it is matched and how much of the page
+# is scanned (anchored and windowed searches scan a short prefix)
+_LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coverage (
+    pattern TEXT NOT NULL,
+    wildcard INTEGER NOT NULL,
+    scan_length INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    PRIMARY KEY (pattern, wildcard, scan_length, start)
+);
+CREATE TABLE IF NOT EXISTS hits (
+    pattern TEXT NOT NULL,
+    wildcard INTEGER NOT NULL,
+    scan_length INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    page_index INTEGER NOT NULL,
+    matched_text TEXT,
+    PRIMARY KEY (pattern, wildcard, scan_length, seed, page_index)
+);
+"""
+
+class SearchLedger:
+    """
+    Durable record of the seed ranges each search has fully scanned.
+
+    For every key (see _LEDGER_SCHEMA) the ledger holds a set of disjoint
+    [start, stop) seed intervals and every hit found inside them, so a
+    repeat search can be answered from the ledger and only the uncovered
+    intervals need scanning. Open one ledger per thread.
+    """
+
+    def __init__(self, path: str = SEARCH_LEDGER_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_LEDGER_SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self) -> 'SearchLedger':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def covered(self, key: Tuple[str, bool, int], start: int, stop: int) -> List[Tuple[int, int]]:
+        """
+        Covered intervals overlapping [start, stop), clipped to it.
+
+        Args:
+            key: (pattern, wildcard, scan_length)
+            start: First seed of interest
+            stop: Seed after the last one of interest
+
+        Returns:
+            Sorted, disjoint (start, stop) intervals
+        """
+        rows = self.conn.execute(
+            "SELECT start, stop FROM coverage WHERE pattern = ? AND wildcard = ? AND scan_length = ?"
+            " AND start < ? AND stop > ? ORDER BY start",
+            (key[0], int(key[1]), key[2], stop, start))
+        return [(max(a, start), min(b, stop)) for a, b in rows.fetchall()]
+
+    def hits(self, key: Tuple[str, bool, int], start: int, stop: int) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Recorded hits with start <= seed < stop.
+
+        Returns:
+            (seed, index, matched_text) tuples in seed and index order
+        """
+        rows = self.conn.execute(
+            "SELECT seed, page_index, matched_text FROM hits WHERE pattern = ? AND wildcard = ?"
+            " AND scan_length = ? AND seed >= ? AND seed < ? ORDER BY seed, page_index",
+            (key[0], int(key[1]), key[2], start, stop))
+        return rows.fetchall()
+
+    def substring_keys(self, key: Tuple[str, bool, int]) -> List[Tuple[str, bool, int]]:
+        """
+        Keys whose hits are a superset of the pages key can match on.
+
+        A page whose first scan_length characters contain an exact phrase also
+        contains every substring of it in that prefix, so any exact-phrase key
+        for a substring (or the phrase itself) scanned over a prefix at least
+        as long qualifies.
+
+        Args:
+            key: (pattern, wildcard, scan_length) of an exact phrase search
+
+        Returns:
+            Matching keys other than key, longest pattern first
+        """
+        if key[1]:
+            return []
+        rows = self.conn.execute(
+            "SELECT DISTINCT pattern, scan_length FROM coverage WHERE wildcard = 0"
+            " AND scan_length >= ? AND instr(?, pattern) > 0"
+            " AND (pattern != ? OR scan_length > ?)"
+            " ORDER BY length(pattern) DESC, scan_length",
+            (key[2], key[0], key[0], key[2]))
+        return [(pattern, False, scan_length) for pattern, scan_length in rows.fetchall()]
+
+    def record(self, key: Tuple[str, bool, int], start: int, stop: int,
+               hits: Iterable[Tuple[int, int, Optional[str]]]) -> None:
+        """
+        Record that [start, stop) has been fully scanned.
+
+        Args:
+            key: (pattern, wildcard, scan_length)
+            start: First scanned seed
+            stop: Seed after the last scanned one
+            hits: Every (seed, index, matched_text) hit in the range
+        """
+        if start >= stop:
+            return
+        pattern, wildcard, scan_length = key[0], int(key[1]), key[2]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO hits VALUES (?, ?, ?, ?, ?, ?)",
+                [(pattern, wildcard, scan_length, seed, idx, text) for seed, idx, text in hits])
+            # Merge with every interval the new one overlaps or touches
+            where = "pattern = ? AND wildcard = ? AND scan_length = ? AND start <= ? AND stop >= ?"
+            params = (pattern, wildcard, scan_length, stop, start)
+            row = self.conn.execute(f"SELECT MIN(start), MAX(stop) FROM coverage WHERE {where}",
+                                    params).fetchone()
+            if row[0] is not None:
+                start, stop = min(start, row[0]), max(stop, row[1])
+            self.conn.execute(f"DELETE FROM coverage WHERE {where}", params)
+            self.conn.execute("INSERT INTO coverage VALUES (?, ?, ?, ?, ?)",
+                              (pattern, wildcard, scan_length, start, stop))
+
+_TWIN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS indexed (
+    start INTEGER PRIMARY KEY,
+    stop INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, seed)
+) WITHOUT ROWID;
+"""
+
+class TwinIndex:
+    """
+    Persistent MinHash/LSH index of pages for twin (near-duplicate) lookup.
+
+    Every indexed page is filed under one bucket per LSH band (see
+    babel_core.minhash_signatures). Pages that share a bucket with a query
+    page are the only twin candidates, and each candidate is confirmed with
+    an exact edit-distance comparison, so a query costs a few index lookups
+    plus one comparison per candidate however many pages are indexed.
+    Candidate retrieval is probabilistic: a twin is found with the
+    probability given next to MINHASH_BANDS. Open one index per thread.
+    """
+
+    def __init__(self, path: str = TWIN_INDEX_DB, page_length: int = PAGE_LENGTH):
+        self.path = path
+        self.page_length = page_length
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_TWIN_SCHEMA)
+        # Buckets are only comparable between identical sketch settings
+        settings = {'page_length': page_length, 'shingle_length': SHINGLE_LENGTH,
+                    'bands': MINHASH_BANDS, 'rows': MINHASH_ROWS}
+        stored = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+        if stored and stored != settings:
+            self.conn.close()
+            raise ValueError(f"{path} was built with different settings: {stored}")
+        self.conn.executemany("INSERT OR IGNORE INTO meta VALUES (?, ?)", settings.items())
+        self.conn.commit()
+
+    def __enter__(self) -> 'TwinIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def covered(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """Indexed seed intervals overlapping [start, stop), clipped to it."""
+        rows = self.conn.execute(
+            "SELECT start, stop FROM indexed WHERE start < ? AND stop > ? ORDER BY start",
+            (stop, start))
+        return [(max(a, start), min(b, stop)) for a, b in rows.fetchall()]
+
+    def count(self) -> int:
+        """Number of indexed pages."""
+        return self.conn.execute("SELECT COALESCE(SUM(stop - start), 0) FROM indexed").fetchone()[0]
+
+    def add_range(self, start: int, stop: int, cancel=None) -> int:
+        """
+        Index every page in [start, stop) that is not indexed yet.
+
+        Pages are generated and committed one batch at a time, so an
+        interrupted build keeps everything indexed so far.
+
+        Args:
+            start: First seed
+            stop: Seed after the last one
+            cancel: Event-like object; indexing stops after the current batch
+
+        Returns:
+            Number of pages added
+        """
+        gaps, position = [], start
+        for a, b in self.covered(start, stop) + [(stop, stop)]:
+            if position < a:
+                gaps.append((position, a))
+            position = max(position, b)
+
+        added = 0
+        for gap_start, gap_stop in gaps:
+            for seeds, codes in iter_page_batches(range(gap_start, gap_stop), self.page_length):
+                if cancel is not None and cancel.is_set():
+                    return added
+                buckets = lsh_buckets(minhash_signatures(codes))
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+                        ((band, int(bucket), seed)
+                         for seed, row in zip(seeds, buckets.tolist())
+                         for band, bucket in enumerate(row)))
+                    self._mark_indexed(seeds[0], seeds[-1] + 1)
+                added += len(seeds)
+        return added
+
+    def _mark_indexed(self, start: int, stop: int) -> None:
+        """Merge [start, stop) into the indexed intervals."""
+        where = "start <= ? AND stop >= ?"
+        row = self.conn.execute(f"SELECT MIN(start), MAX(stop) FROM indexed WHERE {where}",
+                                (stop, start)).fetchone()
+        if row[0] is not None:
+            start, stop = min(start, row[0]), max(stop, row[1])
+        self.conn.execute(f"DELETE FROM indexed WHERE {where}", (stop, start))
+        self.conn.execute("INSERT INTO indexed VALUES (?, ?)", (start, stop))
+
+    def candidates(self, page: str) -> List[int]:
+        """
+        Indexed seeds sharing at least one LSH bucket with a page.
+
+        Args:
+            page: Page text of the index's page length
+
+        Returns:
+            Candidate seeds, most shared bands first
+        """
+        buckets = lsh_buckets(minhash_signatures(encode_page(page)))[0].tolist()
+        votes = {}
+        for band, bucket in enumerate(buckets):
+            rows = self.conn.execute("SELECT seed FROM buckets WHERE band = ? AND bucket = ?",
+                                     (band, bucket))
+            for (seed,) in rows.fetchall():
+                votes[seed] = votes.get(seed, 0) + 1
+        return sorted(votes, key=lambda seed: (-votes[seed], seed))
+
+    def find_twins(self, page: str, similarity_threshold: float = 95.0,
+                   exclude_seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find indexed pages at least similarity_threshold percent similar to page.
+
+        Args:
+            page: Page text of the index's page length
+            similarity_threshold: Minimum similarity percentage, as computed
+                by babel_core.similarity_percentage()
+            exclude_seed: Seed to leave out, usually the page's own
+
+        Returns:
+            Twin dictionaries ('seed', 'page', 'similarity', 'type'), most
+            similar first
+        """
+        length = self.page_length
+        if len(page) != length:
+            raise ValueError(f"Expected a page of {length} characters, got {len(page)}")
+        # Largest edit distance that still meets the threshold
+        max_distance = next((d for d in range(length, -1, -1)
+                             if ((length - d) / length) * 100 >= similarity_threshold), -1)
+        twins = []
+        for seed in self.candidates(page):
+            if seed == exclude_seed:
+                continue
+            test_page = cached_page(seed, self.page_length)
+            distance = levenshtein_within(page, test_page, max_distance)
+            if distance is None:
+                continue
+            twins.append({
+                'seed': seed,
+                'page': test_page,
+                'similarity': ((length - distance) / length) * 100,
+                'type': 'identical_hash' if distance == 0 else 'high_similarity'
+            })
+        return sorted(twins, key=lambda x: x['similarity'], reverse=True)
+
+# Columns of the page statistics cache: dtype and per-seed shape
+_PAGE_STATS_COLUMNS = {
+    'seed': ('<i8', ()),
+    'entropy': ('<f8', ()),
+    'sha256': ('u1', (32,)),
+    'histogram': ('<u4', (len(ALPHABET),)),
+    'unique_chars': ('u1', ()),
+    'mode': ('i1', ()),
+    'mode_count': ('<u4', ()),
+    'patterns_3char': ('<u4', ()),
+    'patterns_4char': ('<u4', ()),
+}
+
+def _page_stats_columns(seeds: List[int], page_length: int) -> Dict[str, np.ndarray]:
+    """Generate pages and compute every cached statistic for them."""
+    codes = generate_pages(seeds, page_length)
+    stats = batch_page_statistics(codes)
+    stats['seed'] = np.asarray(seeds, dtype=np.int64)
+    text = ALPHABET_BYTES[codes]
+    stats['sha256'] = np.array([np.frombuffer(hashlib.sha256(row.tobytes()).digest(), dtype=np.uint8)
+                                for row in text]).reshape(len(seeds), 32)
+    return stats
+
+class PageStatsCache:
+    """
+    Persistent per-seed page statistics for one page length.
+
+    Every statistic is an append-only column file of fixed-size entries
+    under path, named after GENERATOR_VERSION and the page length, and read
+    through a memory map, so a lookup only touches the columns it uses.
+    Seeds that are not cached yet are generated and appended in batches,
+    spread over a process pool when workers > 1. An entry only counts once
+    all of its columns are written, so an interrupted append is ignored.
+    Safe to share between threads; use one cache per directory per process.
+    """
+
+    def __init__(self, path: str = PAGE_STATS_DIR, page_length: int = PAGE_LENGTH,
+                 workers: int = 1):
+        self.path = path
+        self.page_length = page_length
+        self.workers = workers
+        self._prefix = os.path.join(path, f"v{GENERATOR_VERSION}-{page_length}")
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    def __enter__(self) -> 'PageStatsCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._columns['seed'])
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        self._columns = {}
+
+    def _file(self, name: str) -> str:
+        return f"{self._prefix}.{name}"
+
+    def _load(self) -> None:
+        """Map every column and index the cached seeds."""
+        sizes = {name: np.dtype((dtype, shape)).itemsize
+                 for name, (dtype, shape) in _PAGE_STATS_COLUMNS.items()}
+        count = min(os.path.getsize(self._file(name)) // size if os.path.exists(self._file(name)) else 0
+                    for name, size in sizes.items())
+        self._columns = {}
+        for name, (dtype, shape) in _PAGE_STATS_COLUMNS.items():
+            if count:
+                self._columns[name] = np.memmap(self._file(name), dtype=dtype, mode='r',
+                                                shape=(count,) + shape)
+            else:
+                self._columns[name] = np.zeros((0,) + shape, dtype=dtype)
+        self._order = np.argsort(self._columns['seed'], kind='stable')
+        self._sorted_seeds = np.asarray(self._columns['seed'])[self._order]
+
+    def _rows(self, seeds: np.ndarray) -> np.ndarray:
+        """Entry of each seed, or -1 where it is not cached."""
+        if not len(self._sorted_seeds):
+            return np.full(len(seeds), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._sorted_seeds, seeds), len(self._sorted_seeds) - 1)
+        found = self._sorted_seeds[positions] == seeds
+        return np.where(found, self._order[positions], -1)
+
+    def _append(self, seeds: List[int]) -> None:
+        """Compute the statistics of seeds and append them to the column files."""
+        batches = [seeds[i:i + GENERATION_BATCH_SIZE] for i in range(0, len(seeds), GENERATION_BATCH_SIZE)]
+        if self.workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=mount_corpora,
+                                     initargs=([c.path for c in mounted_corpora()],)) as pool:
+                results = list(pool.map(_page_stats_columns, batches, [self.page_length] * len(batches)))
+        else:
+            results = [_page_stats_columns(batch, self.page_length) for batch in batches]
+        # Drop the maps before growing the files they map
+        count = len(self)
+        self._columns = {}
+        for name, (dtype, shape) in _PAGE_STATS_COLUMNS.items():
+            with open(self._file(name), 'r+b' if os.path.exists(self._file(name)) else 'wb') as f:
+                # Overwrite whatever an interrupted append left past the last complete entry
+                f.seek(count * np.dtype((dtype, shape)).itemsize)
+                for stats in results:
+                    f.write(np.ascontiguousarray(stats[name], dtype=dtype).tobytes())
+                f.truncate()
+        self._load()
+
+    def lookup(self, seeds: Iterable[int]) -> Dict[str, np.ndarray]:
+        """
+        Statistics of the given seeds, computing and caching any that are missing.
+
+        Args:
+            seeds: Seeds to look up
+
+        Returns:
+            Dictionary of arrays with one entry per seed, in the order given:
+            the batch_page_statistics columns plus 'seed' and 'sha256' (raw
+            digest bytes, one row of 32 per seed)
+        """
+        seeds = np.fromiter(seeds, dtype=np.int64)
+        with self._lock:
+            rows = self._rows(seeds)
+            if np.any(rows < 0):
+                self._append(np.unique(seeds[rows < 0]).tolist())
+                rows = self._rows(seeds)
+            stats = {name: np.asarray(column[rows]) for name, column in self._columns.items()}
+        stats['length'] = np.full(len(seeds), self.page_length, dtype=np.int64)
+        return stats
+
+    def page_statistics(self, seed: int) -> Dict[str, Any]:
+        """
+        Statistics of one seed's page, as returned by babel_core.get_page_statistics.
+
+        Args:
+            seed: Seed of the page
+
+        Returns:
+            Dictionary containing various page statistics
+        """
+        stats = self.lookup([seed])
+        return page_statistics_entry(stats, 0, stats['sha256'][0].tobytes().hex())
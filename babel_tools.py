@@ -10,8 +10,19 @@ the infinite Library space.
 
 import re
 import math
-from typing import List, Tuple, Optional, Generator, Dict, Any
-from babel_core import generate_page, validate_phrase, PAGE_LENGTH
+import time
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Tuple, Optional, Generator, Dict, Any, Iterable, Callable
+
+import numpy as np
+
+from babel_core import (iter_pages, validate_phrase, encode_page,
+                        window_prefix_length, ALPHABET, ALPHABET_BYTES, PAGE_LENGTH,
+                        GENERATION_BATCH_SIZE, mounted_corpora, mount_corpora)
+from babel_bus import PageConsumer
 
 # Library structure constants (following Borges' architecture)
 WALLS_PER_HEXAGON = 6
@@ -170,32 +181,34 @@ def find_wildcard_matches(page: str, pattern: str) -> List[Tuple[int, str]]:
 
 def search_for_phrase(phrase: str, max_attempts: int = 100000, 
                      max_matches: int = 5, page_length: int = PAGE_LENGTH,
-                     start_seed: int = 0) -> List[Tuple[int, int]]:
+                     start_seed: int = 0, anchored: bool = False,
+                     window: Optional[int] = None, ledger=None) -> List[Tuple[int, int]]:
     """
     Search for a phrase in randomly generated pages.
     
+    Anchored and windowed searches only generate the page prefix the phrase
+    can occur in, which is far cheaper than generating whole pages. With a
+    ledger, ranges searched before for the phrase or a substring of it are
+    answered without regenerating them.
+    
     Args:
         phrase: Phrase to search for
         max_attempts: Maximum number of pages to search
         max_matches: Maximum number of matches to find
         page_length: Length of each generated page
         start_seed: Starting seed for search
+        anchored: Only match the phrase at the very start of the page
+        window: Only match the phrase starting within the first `window`
+            characters of the page
+        ledger: Optional SearchLedger (see iter_search)
         
     Returns:
         List of (seed, index) tuples where phrase was found
     """
     validate_phrase(phrase)
-    found = []
-    
-    for i in range(start_seed, start_seed + max_attempts):
-        page = generate_page(i, length=page_length)
-        idx = page.find(phrase)
-        if idx != -1:
-            found.append((i, idx))
-            if len(found) >= max_matches:
-                break
-    
-    return found
+    records = iter_search(phrase, max_attempts, max_matches, page_length, start_seed,
+                          anchored=anchored, window=window, ledger=ledger)
+    return [(r['seed'], r['index']) for r in records if r['type'] == 'hit']
 
 def search_with_wildcards(pattern: str, max_attempts: int = 100000,
                          max_matches: int = 5, page_length: int = PAGE_LENGTH,
@@ -213,19 +226,855 @@ def search_with_wildcards(pattern: str, max_attempts: int = 100000,
     Returns:
         List of (seed, index, matched_text) tuples
     """
+    records = iter_search(pattern, max_attempts, max_matches, page_length, start_seed,
+                          wildcard=True)
+    return [(r['seed'], r['index'], r['matched_text']) for r in records if r['type'] == 'hit']
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton that finds many phrases in a single pass per page.
+
+    The automaton is compiled once per phrase set into a dense transition
+    table over the 29 symbol codes, so it pickles cheaply and can be handed
+    to worker processes. Scanning a batch of pages advances every page's
+    state together, one character column at a time, which keeps the cost
+    per page flat no matter how many phrases are loaded.
+    """
+
+    # Below this many phrases a bytes.find() per phrase is cheaper than
+    # stepping the automaton, so scan() uses that instead.
+    FIND_LIMIT = 16
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = list(dict.fromkeys(phrases))
+        for phrase in self.phrases:
+            validate_phrase(phrase)
+        self._encoded = [phrase.encode('ascii') for phrase in self.phrases]
+        self._build()
+
+    def _build(self) -> None:
+        """Build the trie, failure links and dense transition table."""
+        symbols = len(ALPHABET)
+        goto = [{}]
+        outputs = [[]]
+        for phrase_id, phrase in enumerate(self.phrases):
+            state = 0
+            for code in encode_page(phrase).tolist():
+                if code not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][code] = len(goto) - 1
+                state = goto[state][code]
+            outputs[state].append(phrase_id)
+
+        # Breadth-first pass filling in failure transitions, so every state
+        # has an edge for every symbol and scanning never backtracks
+        transitions = np.zeros((len(goto), symbols), dtype=np.int32)
+        fail = [0] * len(goto)
+        queue = deque()
+        for code, child in goto[0].items():
+            transitions[0, code] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for code in range(symbols):
+                child = goto[state].get(code)
+                if child is None:
+                    transitions[state, code] = transitions[fail[state], code]
+                else:
+                    fail[child] = int(transitions[fail[state], code])
+                    transitions[state, code] = child
+                    queue.append(child)
+
+        self.transitions = transitions
+        self.outputs = [tuple(ids) for ids in outputs]
+        # Flattened table indexed by state * symbols + code, whose entries are
+        # pre-multiplied by symbols so a step is one add and one take
+        self._flat = (transitions * symbols).ravel()
+        self._accepting = np.zeros(len(goto) * symbols, dtype=bool)
+        self._accepting[::symbols] = [bool(ids) for ids in self.outputs]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def scan(self, pages: np.ndarray) -> List[Tuple[int, str, int]]:
+        """
+        Find every occurrence of every phrase in a batch of pages.
+
+        Args:
+            pages: uint8 symbol codes of shape (batch, length), as returned
+                   by babel_core.generate_pages
+
+        Returns:
+            List of (row, phrase, index) tuples ordered by row, then index,
+            including overlapping occurrences
+        """
+        if not self.phrases or pages.size == 0:
+            return []
+        if len(self.phrases) < self.FIND_LIMIT:
+            return self._scan_find(pages)
+        return self._scan_automaton(pages)
+
+    def _scan_find(self, pages: np.ndarray) -> List[Tuple[int, str, int]]:
+        """Small phrase sets: repeated bytes.find() on each page."""
+        hits = []
+        for row, text in enumerate(ALPHABET_BYTES[pages]):
+            text = text.tobytes()
+            row_hits = []
+            for phrase, needle in zip(self.phrases, self._encoded):
+                idx = text.find(needle)
+                while idx != -1:
+                    row_hits.append((row, phrase, idx))
+                    idx = text.find(needle, idx + 1)
+            row_hits.sort(key=lambda hit: (hit[2], len(hit[1])))
+            hits.extend(row_hits)
+        return hits
+
+    def _scan_automaton(self, pages: np.ndarray) -> List[Tuple[int, str, int]]:
+        """Large phrase sets: step all pages through the automaton together."""
+        batch, length = pages.shape
+        columns = np.ascontiguousarray(pages.T, dtype=np.int32)
+        states = np.empty((length, batch), dtype=np.int32)
+        index = np.empty(batch, dtype=np.int32)
+        current = np.zeros(batch, dtype=np.int32)
+        for pos in range(length):
+            np.add(current, columns[pos], out=index)
+            current = states[pos]
+            np.take(self._flat, index, out=current)
+
+        ends, rows = np.nonzero(self._accepting[states])
+        symbols = len(ALPHABET)
+        hits = []
+        for end, row, state in zip(ends.tolist(), rows.tolist(),
+                                   (states[ends, rows] // symbols).tolist()):
+            for phrase_id in self.outputs[state]:
+                phrase = self.phrases[phrase_id]
+                hits.append((row, phrase, end - len(phrase) + 1))
+        hits.sort(key=lambda hit: (hit[0], hit[2], len(hit[1])))
+        return hits
+
+    def scan_by_phrase(self, pages: np.ndarray) -> List[Tuple[int, str, List[int]]]:
+        """
+        Like scan(), but grouped into one entry per (page, phrase) pair.
+
+        Args:
+            pages: uint8 symbol codes of shape (batch, length)
+
+        Returns:
+            List of (row, phrase, indices) tuples ordered by row, then by
+            first occurrence; indices lists every occurrence in the page
+        """
+        grouped = {}
+        for row, phrase, idx in self.scan(pages):
+            grouped.setdefault((row, phrase), []).append(idx)
+        return [(row, phrase, indices) for (row, phrase), indices in grouped.items()]
+
+    def find_all(self, page: str) -> List[Tuple[str, int]]:
+        """
+        Find every occurrence of every phrase in a single page of text.
+
+        Args:
+            page: Page content
+
+        Returns:
+            List of (phrase, index) tuples ordered by index
+        """
+        return [(phrase, idx) for _, phrase, idx in self.scan(encode_page(page)[None, :])]
+
+# Pages handed to a pool worker per task by iter_search()
+SEARCH_CHUNK_SIZE = 4 * GENERATION_BATCH_SIZE
+
+# Pages between the progress records yielded by iter_search()
+PROGRESS_INTERVAL = 1000
+
+# How often a pooled search checks for cancellation and deadlines (seconds)
+_POLL_INTERVAL = 0.2
+
+# Shared chunk cutoff for pool workers, installed by _init_search_worker()
+_search_cutoff = None
+
+def _init_search_worker(cutoff, corpus_paths: List[str]) -> None:
+    """Pool initializer: remember the shared cutoff chunk index and mount the parent's corpora."""
+    global _search_cutoff
+    _search_cutoff = cutoff
+    mount_corpora(corpus_paths)
+
+def _page_hits(page: str, pattern: str, wildcard: bool) -> List[Tuple[int, Optional[str]]]:
+    """Hits on one page: every wildcard match, or the first phrase occurrence."""
+    if wildcard:
+        return find_wildcard_matches(page, pattern)
+    idx = page.find(pattern)
+    return [(idx, None)] if idx != -1 else []
+
+def _search_chunk(pattern: str, wildcard: bool, chunk: int, start: int, stop: int,
+                  page_length: int, max_matches: int) -> Tuple[list, int]:
+    """
+    Scan seeds [start, stop) for one pooled iter_search() chunk.
+
+    Gives up as soon as the parent lowers the shared cutoff to or below this
+    chunk, and stops early once the chunk alone holds more than max_matches
+    hits (the extra hit tells the parent whether the last page was cut short).
+
+    Returns:
+        (hits, pages_scanned) with hits as (seed, index, matched_text) tuples
+    """
+    hits = []
+    scanned = 0
+    seeds = range(start, stop)
+
+    for offset in range(0, len(seeds), GENERATION_BATCH_SIZE):
+        if _search_cutoff is not None and chunk >= _search_cutoff.value:
+            break
+        batch = seeds[offset:offset + GENERATION_BATCH_SIZE]
+        for seed, page in iter_pages(batch, page_length):
+            for idx, matched_text in _page_hits(page, pattern, wildcard):
+                hits.append((seed, idx, matched_text))
+        scanned += len(batch)
+        if len(hits) > max_matches:
+            del hits[max_matches + 1:]
+            break
+
+    return hits, scanned
+
+def _hit_record(seed: int, idx: int, matched_text: Optional[str], wildcard: bool) -> Dict[str, Any]:
+    """Build an iter_search() hit record."""
+    hit = {'type': 'hit', 'seed': seed, 'index': idx}
+    if wildcard:
+        hit['matched_text'] = matched_text
+    return hit
+
+def _search_record(kind: str, scanned: int, next_seed: int, matches: int,
+                   start_time: float) -> Dict[str, Any]:
+    """Build an iter_search() progress or done record."""
+    return {
+        'type': kind,
+        'scanned': scanned,
+        'next_seed': next_seed,
+        'matches': matches,
+        'elapsed': time.time() - start_time
+    }
+
+def iter_search(phrase: str, max_attempts: int = 100000, max_matches: int = 5,
+                page_length: int = PAGE_LENGTH, start_seed: int = 0,
+                anchored: bool = False, window: Optional[int] = None,
+                cancel=None, deadline: Optional[float] = None,
+                wildcard: Optional[bool] = None, workers: int = 1,
+                chunk_size: int = SEARCH_CHUNK_SIZE,
+                progress_interval: int = PROGRESS_INTERVAL,
+                bus=None, ledger=None) -> Generator[Dict[str, Any], None, None]:
+    """
+    Search for a phrase or wildcard pattern, yielding records as they happen.
+
+    Every record is a dictionary with a 'type' key:
+
+    - 'hit': 'seed', 'index' and, for wildcard patterns, 'matched_text'.
+      Hits arrive in seed order and are exactly the ones search_for_phrase()
+      or search_with_wildcards() would return.
+    - 'progress': 'scanned' (pages generated so far), 'next_seed',
+      'matches' and 'elapsed' seconds.
+    - 'done': the progress fields plus 'reason', one of 'exhausted',
+      'max_matches', 'cancelled' or 'deadline'. Always the last record.
+
+    With a ledger, progress and done records also carry 'cached', the
+    number of pages answered from the ledger without generating them.
+
+    Every seed in [start_seed, next_seed) has been fully searched and all of
+    its hits yielded, so a stopped search can be resumed from next_seed.
+
+    Args:
+        phrase: Phrase, or pattern containing * or ? wildcards
+        max_attempts: Maximum number of pages to search
+        max_matches: Maximum number of matches to find
+        page_length: Length of each generated page
+        start_seed: Starting seed for search
+        anchored: Only match the phrase at the very start of the page
+        window: Only match the phrase starting within the first `window`
+            characters of the page (exact phrases only)
+        cancel: Event-like object; the search stops soon after cancel.is_set()
+        deadline: time.time() value after which the search stops
+        wildcard: Treat phrase as a wildcard pattern; by default it is one
+            when it contains * or ?
+        workers: Number of worker processes; with more than one, seed chunks
+            are scanned in a process pool
+        chunk_size: Number of seeds scanned per worker task
+        progress_interval: Pages between progress records (single worker or bus)
+        bus: PageBus to take pages from instead of generating them; other
+            searches on the same bus share the pages they have in common.
+            workers and chunk_size are then ignored
+        ledger: SearchLedger to answer already covered seed ranges from;
+            ranges covered for a substring of the phrase only have that
+            substring's hit seeds checked, the rest are scanned, and the
+            new coverage and hits are recorded back into it
+
+    Yields:
+        Hit, progress and done records
+
+    Raises:
+        Exception: Whatever the bus raised generating or matching this
+            search's pages
+    """
+    if wildcard is None:
+        wildcard = '*' in phrase or '?' in phrase
+    if anchored:
+        window = 1
+    if wildcard and window is not None:
+        raise ValueError("Anchored and windowed search needs an exact phrase")
+    if not wildcard:
+        validate_phrase(phrase)
+    scan_length = window_prefix_length(phrase, window, page_length)
+
+    if ledger is not None:
+        # Scan the gaps as plain searches over the page prefix that matters
+        def scan(start, attempts, matches):
+            return iter_search(phrase, attempts, matches, scan_length, start, cancel=cancel,
+                               deadline=deadline, wildcard=wildcard, workers=workers,
+                               chunk_size=chunk_size, progress_interval=progress_interval,
+                               bus=bus)
+        yield from _iter_ledger_search(phrase, wildcard, max_attempts, max_matches, scan_length,
+                                       start_seed, ledger, cancel, deadline, scan)
+        return
+
+    if bus is not None:
+        yield from _iter_bus_search(phrase, wildcard, max_attempts, max_matches, scan_length,
+                                    start_seed, cancel, deadline, bus, progress_interval)
+        return
+
+    if workers > 1:
+        yield from _iter_pool_search(phrase, wildcard, max_attempts, max_matches, scan_length,
+                                     start_seed, cancel, deadline, workers, chunk_size)
+        return
+
+    start_time = time.time()
+    scanned = 0
+    matches = 0
+    next_seed = start_seed
+    reason = 'exhausted'
+
+    for seed, page in iter_pages(range(start_seed, start_seed + max_attempts), scan_length):
+        if cancel is not None and cancel.is_set():
+            reason = 'cancelled'
+            break
+        if deadline is not None and time.time() >= deadline:
+            reason = 'deadline'
+            break
+
+        hits = _page_hits(page, phrase, wildcard)
+        scanned += 1
+        room = max_matches - matches
+        for idx, matched_text in hits[:room]:
+            yield _hit_record(seed, idx, matched_text, wildcard)
+        matches += min(len(hits), room)
+        if matches >= max_matches:
+            reason = 'max_matches'
+            # A page whose hits were cut short does not count as searched
+            if len(hits) <= room:
+                next_seed = seed + 1
+            break
+
+        next_seed = seed + 1
+        if scanned % progress_interval == 0:
+            yield _search_record('progress', scanned, next_seed, matches, start_time)
+
+    done = _search_record('done', scanned, next_seed, matches, start_time)
+    done['reason'] = reason
+    yield done
+
+def _iter_pool_search(pattern: str, wildcard: bool, max_attempts: int, max_matches: int,
+                      scan_length: int, start_seed: int, cancel, deadline: Optional[float],
+                      workers: int, chunk_size: int) -> Generator[Dict[str, Any], None, None]:
+    """
+    Process-pool engine behind iter_search(workers > 1).
+
+    Chunks finish in any order but are folded into the output strictly in
+    seed order. Once enough hits are known below some chunk, every chunk
+    past it is cancelled and running ones abandon their scan.
+    """
+    start_time = time.time()
+    stop_seed = start_seed + max_attempts
+    starts = range(start_seed, stop_seed, chunk_size)
+
+    # Chunks at or past limit can no longer contribute to the result
+    limit = len(starts)
+    cutoff = multiprocessing.Value('q', limit)
+    matches = 0
+    finished = {}
+    next_chunk = 0
+    next_seed = start_seed
+    scanned = 0
+    reason = 'exhausted'
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                               initargs=(cutoff, [c.path for c in mounted_corpora()]))
+    try:
+        pending = {}
+        submitted = 0
+        while next_chunk < limit:
+            if cancel is not None and cancel.is_set():
+                reason = 'cancelled'
+                break
+            if deadline is not None and time.time() >= deadline:
+                reason = 'deadline'
+                break
+
+            # Keep only a couple of chunks per worker queued, so a cutoff
+            # never has to cancel a long tail of submitted work
+            while submitted < limit and len(pending) < 2 * workers:
+                start = starts[submitted]
+                future = pool.submit(_search_chunk, pattern, wildcard, submitted, start,
+                                     min(start + chunk_size, stop_seed), scan_length, max_matches)
+                pending[future] = submitted
+                submitted += 1
+
+            done, _ = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                hits, pages = future.result()
+                scanned += pages
+                if chunk < limit:
+                    finished[chunk] = hits
+
+            # Fold the contiguous run of finished chunks into the output
+            while next_chunk in finished and matches < max_matches:
+                hits = finished.pop(next_chunk)
+                room = max_matches - matches
+                for seed, idx, matched_text in hits[:room]:
+                    yield _hit_record(seed, idx, matched_text, wildcard)
+                matches += min(len(hits), room)
+                next_chunk += 1
+                next_seed = min(starts[next_chunk - 1] + chunk_size, stop_seed)
+                if matches >= max_matches:
+                    reason = 'max_matches'
+                    # Coverage ends after the last reported page, unless that
+                    # page still had hits left over
+                    last_seed = hits[room - 1][0]
+                    leftover = len(hits) > room and hits[room][0] == last_seed
+                    next_seed = last_seed if leftover else last_seed + 1
+
+            # The first max_matches hits lie below the first chunk at which
+            # reported plus out-of-order hits reach max_matches
+            if matches >= max_matches:
+                new_limit = next_chunk
+            else:
+                new_limit = limit
+                total = matches
+                for chunk in sorted(finished):
+                    total += len(finished[chunk])
+                    if total >= max_matches:
+                        new_limit = chunk + 1
+                        break
+
+            if new_limit < limit:
+                limit = new_limit
+                cutoff.value = limit
+                for future, chunk in list(pending.items()):
+                    if chunk >= limit:
+                        future.cancel()
+                        del pending[future]
+                for chunk in [c for c in finished if c >= limit]:
+                    del finished[chunk]
+
+            if done and next_chunk < limit:
+                yield _search_record('progress', scanned, next_seed, matches, start_time)
+    finally:
+        cutoff.value = 0
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    record = _search_record('done', scanned, next_seed, matches, start_time)
+    record['reason'] = reason
+    yield record
+
+def _ledger_segments(ledger, key: Tuple[str, bool, int], start: int,
+                     stop: int) -> List[Tuple[int, int, Any]]:
+    """
+    Split [start, stop) by how the ledger can answer each part.
+
+    Returns:
+        (start, stop, source) tuples in seed order, where source is True for
+        ranges covered by key itself, a substring key whose hits are the only
+        candidate seeds, or None for ranges that have to be scanned
+    """
+    segments = []
+    position = start
+    for a, b in ledger.covered(key, start, stop) + [(stop, stop)]:
+        if position < a:
+            segments.extend(_substring_segments(ledger, key, position, a))
+        if a < b:
+            segments.append((a, b, True))
+        position = b
+    return segments
+
+def _substring_segments(ledger, key: Tuple[str, bool, int], start: int,
+                        stop: int) -> List[Tuple[int, int, Any]]:
+    """Split an uncovered range by the longest substring key covering each part."""
+    coverage = [(sub, ledger.covered(sub, start, stop)) for sub in ledger.substring_keys(key)]
+    bounds = sorted({start, stop}.union(*(
+        {a for a, _ in intervals} | {b for _, b in intervals} for _, intervals in coverage)))
+    segments = []
+    for a, b in zip(bounds, bounds[1:]):
+        source = next((sub for sub, intervals in coverage
+                       if any(lo <= a < hi for lo, hi in intervals)), None)
+        if segments and segments[-1][1] == a and segments[-1][2] == source:
+            segments[-1] = (segments[-1][0], b, source)
+        else:
+            segments.append((a, b, source))
+    return segments
+
+def _iter_ledger_search(pattern: str, wildcard: bool, max_attempts: int, max_matches: int,
+                        scan_length: int, start_seed: int, ledger, cancel,
+                        deadline: Optional[float],
+                        scan: Callable) -> Generator[Dict[str, Any], None, None]:
+    """
+    Ledger-backed engine behind iter_search(ledger=...).
+
+    Walks [start_seed, start_seed + max_attempts) in order. Intervals the
+    ledger covers for this search are replayed from its hits. Intervals it
+    covers for a substring of the phrase are answered by checking only the
+    seeds where the substring was found, since every other page lacks the
+    phrase too. Whatever remains is handed to scan(start, attempts, matches).
+    Everything covered along the way is recorded back into the ledger, even
+    when the search stops early.
+    """
+    start_time = time.time()
+    key = (pattern, wildcard, scan_length)
+    scanned = 0
+    cached = 0
+    matches = 0
+    next_seed = start_seed
+    reason = 'exhausted'
+
+    def record(kind):
+        rec = _search_record(kind, scanned, next_seed, matches, start_time)
+        rec['cached'] = cached
+        return rec
+
+    for start, stop, source in _ledger_segments(ledger, key, start_seed, start_seed + max_attempts):
+        if source is True:
+            by_seed = {}
+            for seed, idx, matched_text in ledger.hits(key, start, stop):
+                by_seed.setdefault(seed, []).append((idx, matched_text))
+            for seed, hits in by_seed.items():
+                room = max_matches - matches
+                for idx, matched_text in hits[:room]:
+                    yield _hit_record(seed, idx, matched_text, wildcard)
+                matches += min(len(hits), room)
+                if matches >= max_matches:
+                    # A page whose hits were cut short does not count as searched
+                    next_seed = seed + 1 if len(hits) <= room else seed
+                    cached += next_seed - start
+                    break
+            if matches >= max_matches:
+                reason = 'max_matches'
+                break
+            cached += stop - start
+            next_seed = stop
+            yield record('progress')
+            continue
+
+        if source is not None:
+            # Only pages holding the substring can hold the phrase, and the
+            # recorded hit is the substring's first occurrence, so it must
+            # also start early enough to fit inside our shorter prefix
+            last_start = scan_length - len(source[0])
+            candidates = sorted({seed for seed, idx, _ in ledger.hits(source, start, stop)
+                                 if idx <= last_start})
+            found = []
+            verified_to = stop
+            for offset in range(0, len(candidates), GENERATION_BATCH_SIZE):
+                if cancel is not None and cancel.is_set():
+                    reason = 'cancelled'
+                elif deadline is not None and time.time() >= deadline:
+                    reason = 'deadline'
+                if reason != 'exhausted':
+                    verified_to = candidates[offset]
+                    break
+                batch = candidates[offset:offset + GENERATION_BATCH_SIZE]
+                for seed, page in iter_pages(batch, scan_length):
+                    scanned += 1
+                    idx = page.find(pattern)
+                    if idx != -1:
+                        found.append((seed, idx, None))
+                        yield _hit_record(seed, idx, None, wildcard)
+                        matches += 1
+                        if matches >= max_matches:
+                            reason = 'max_matches'
+                            verified_to = seed + 1
+                            break
+                if reason != 'exhausted':
+                    break
+            ledger.record(key, start, verified_to, found)
+            cached += verified_to - start - sum(seed < verified_to for seed in candidates)
+            next_seed = verified_to
+            if reason != 'exhausted':
+                break
+            yield record('progress')
+            continue
+
+        found = []
+        for rec in scan(start, stop - start, max_matches - matches):
+            if rec['type'] == 'hit':
+                found.append((rec['seed'], rec['index'], rec.get('matched_text')))
+                yield rec
+                continue
+            done = rec
+            if rec['type'] == 'progress':
+                rec.update(record('progress'), scanned=scanned + rec['scanned'],
+                           next_seed=rec['next_seed'], matches=matches + rec['matches'])
+                yield rec
+        ledger.record(key, start, done['next_seed'],
+                      [hit for hit in found if hit[0] < done['next_seed']])
+        scanned += done['scanned']
+        matches += done['matches']
+        next_seed = done['next_seed']
+        if done['reason'] != 'exhausted':
+            reason = done['reason']
+            break
+
+    done = record('done')
+    done['reason'] = reason
+    yield done
+
+class _SearchConsumer(PageConsumer):
+    """
+    PageBus consumer behind iter_search(bus=...).
+
+    Runs on the bus thread: matches every delivered page and forwards the
+    hits to the searching generator through a queue. Pages may arrive out
+    of order when the bus wraps around, so each message carries the lowest
+    seed still undelivered; every hit below it is final.
+    """
+
+    def __init__(self, pattern: str, wildcard: bool, start: int, stop: int,
+                 page_length: int, max_matches: int):
+        super().__init__(start, stop, page_length)
+        self.pattern = pattern
+        self.wildcard = wildcard
+        self.max_matches = max_matches
+        self.records = queue.Queue()
+        # Seeds with hits, kept to know when later seeds stop mattering
+        self._hit_seeds = []
+
+    def feed(self, seeds: List[int], codes: np.ndarray) -> None:
+        hits = {}
+        for seed, row in zip(seeds, ALPHABET_BYTES[codes]):
+            page_hits = _page_hits(row.tobytes().decode('ascii'), self.pattern, self.wildcard)
+            if page_hits:
+                hits[seed] = page_hits
+                self._hit_seeds.extend([seed] * len(page_hits))
+
+        # The first max_matches hits lie at or below the max_matches-th
+        # lowest hit seen so far, so nothing above it is needed any more
+        if self._hit_seeds and len(self._hit_seeds) >= self.max_matches:
+            self._hit_seeds.sort()
+            del self._hit_seeds[self.max_matches:]
+            self.limit(self._hit_seeds[-1] + 1)
+
+        low = self.first_pending()
+        self.records.put({'scanned': len(seeds), 'hits': hits,
+                          'low': self.stop if low is None else low})
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        first = not self.finished.is_set()
+        super().finish(error)
+        if first:
+            self.records.put(None)
+
+def _iter_bus_search(pattern: str, wildcard: bool, max_attempts: int, max_matches: int,
+                     scan_length: int, start_seed: int, cancel, deadline: Optional[float],
+                     bus, progress_interval: int) -> Generator[Dict[str, Any], None, None]:
+    """
+    PageBus engine behind iter_search(bus=...).
+
+    Hits are held back until every lower seed has been delivered and are
+    then yielded in seed order, so the result matches a sequential search.
+    """
+    start_time = time.time()
+    consumer = _SearchConsumer(pattern, wildcard, start_seed, start_seed + max_attempts,
+                               scan_length, max_matches)
+    found = {}
+    scanned = 0
+    matches = 0
+    next_seed = start_seed
+    reason = 'exhausted'
+
+    bus.subscribe(consumer)
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                reason = 'cancelled'
+                break
+            if deadline is not None and time.time() >= deadline:
+                reason = 'deadline'
+                break
+            try:
+                message = consumer.records.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if message is None:
+                if consumer.error is not None:
+                    raise consumer.error
+                break
+
+            previous = scanned
+            scanned += message['scanned']
+            found.update(message['hits'])
+            for seed in sorted(s for s in found if s < message['low']):
+                hits = found.pop(seed)
+                room = max_matches - matches
+                for idx, matched_text in hits[:room]:
+                    yield _hit_record(seed, idx, matched_text, wildcard)
+                matches += min(len(hits), room)
+                if matches >= max_matches:
+                    reason = 'max_matches'
+                    # A page whose hits were cut short does not count as searched
+                    next_seed = seed + 1 if len(hits) <= room else seed
+                    break
+            if matches >= max_matches:
+                break
+
+            next_seed = message['low']
+            if scanned // progress_interval > previous // progress_interval:
+                yield _search_record('progress', scanned, next_seed, matches, start_time)
+    finally:
+        bus.unsubscribe(consumer)
+
+    done = _search_record('done', scanned, next_seed, matches, start_time)
+    done['reason'] = reason
+    yield done
+
+def parallel_search(phrase: str, max_attempts: int = 100000,
+                    max_matches: int = 5, page_length: int = PAGE_LENGTH,
+                    start_seed: int = 0, anchored: bool = False,
+                    window: Optional[int] = None, workers: Optional[int] = None,
+                    chunk_size: int = SEARCH_CHUNK_SIZE,
+                    on_hit: Optional[Callable[[tuple], None]] = None,
+                    on_progress: Optional[Callable[[int, int], None]] = None,
+                    cancel=None, deadline: Optional[float] = None) -> List[tuple]:
+    """
+    Search for a phrase or wildcard pattern using a pool of worker processes.
+
+    A callback-style wrapper around iter_search(). The result is exactly
+    what search_for_phrase() (or search_with_wildcards() for patterns
+    containing * or ?) returns for the same arguments, unless the search is
+    cancelled or hits its deadline first, in which case the hits confirmed
+    so far are returned.
+
+    Args:
+        phrase: Phrase or wildcard pattern to search for
+        max_attempts: Maximum number of pages to search
+        max_matches: Maximum number of matches to find
+        page_length: Length of each generated page
+        start_seed: Starting seed for search
+        anchored: Only match the phrase at the very start of the page
+        window: Only match the phrase starting within the first `window`
+            characters of the page (exact phrases only)
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Number of seeds scanned per worker task
+        on_hit: Called with each hit once it is confirmed, in seed order
+        on_progress: Called as on_progress(pages_scanned, matches_confirmed)
+            after every completed chunk
+        cancel: Event-like object that stops the search once set
+        deadline: time.time() value after which the search stops
+
+    Returns:
+        List of (seed, index) tuples, or (seed, index, matched_text) tuples
+        for wildcard patterns
+    """
     found = []
-    
-    for i in range(start_seed, start_seed + max_attempts):
-        page = generate_page(i, length=page_length)
-        matches = find_wildcard_matches(page, pattern)
-        
-        for idx, matched_text in matches:
-            found.append((i, idx, matched_text))
-            if len(found) >= max_matches:
-                return found
-    
+    records = iter_search(phrase, max_attempts, max_matches, page_length, start_seed,
+                          anchored, window, cancel, deadline,
+                          workers=workers or multiprocessing.cpu_count(),
+                          chunk_size=chunk_size)
+    for record in records:
+        if record['type'] == 'hit':
+            hit = (record['seed'], record['index'])
+            if 'matched_text' in record:
+                hit += (record['matched_text'],)
+            found.append(hit)
+            if on_hit:
+                on_hit(hit)
+        elif on_progress:
+            on_progress(record['scanned'], record['matches'])
     return found
 
+class ScanProgress:
+    """
+    Bookkeeping for a resumable scan that hands out contiguous seed chunks.
+
+    Progress is a watermark plus a list of gaps. Every seed below the
+    watermark has been scanned, except the [start, stop) ranges listed in
+    gaps. Chunks that are handed out but never completed are reported as
+    gaps, so a restart rescans exactly those ranges and then carries on
+    from the watermark.
+    """
+
+    def __init__(self, watermark: int = 0, gaps: Iterable[Tuple[int, int]] = ()):
+        self.watermark = watermark
+        self._todo = deque(sorted((start, stop) for start, stop in gaps if start < stop))
+        self._in_flight = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScanProgress':
+        """Restore progress saved with to_dict()."""
+        return cls(data.get('last_seed', 0), data.get('gaps', []))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot progress for saving, treating in-flight chunks as gaps.
+
+        Returns:
+            Dictionary with 'last_seed' (the watermark) and 'gaps'
+        """
+        gaps = self.gaps()
+        watermark = self.watermark
+        # Gaps touching the watermark just mean the scan stopped earlier
+        while gaps and gaps[-1][1] == watermark:
+            watermark = gaps.pop()[0]
+        return {'last_seed': watermark, 'gaps': [list(gap) for gap in gaps]}
+
+    def gaps(self) -> List[Tuple[int, int]]:
+        """Unscanned ranges below the watermark, sorted and merged."""
+        merged = []
+        for start, stop in sorted(list(self._todo) + list(self._in_flight.items())):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+            else:
+                merged.append((start, stop))
+        return merged
+
+    def next_chunk(self, size: int) -> Tuple[int, int]:
+        """
+        Hand out the next range to scan, filling old gaps first.
+
+        Args:
+            size: Maximum number of seeds in the chunk
+
+        Returns:
+            (start, stop) seed range
+        """
+        if self._todo:
+            start, stop = self._todo.popleft()
+            if stop - start > size:
+                self._todo.appendleft((start + size, stop))
+                stop = start + size
+        else:
+            start, stop = self.watermark, self.watermark + size
+            self.watermark = stop
+        self._in_flight[start] = stop
+        return start, stop
+
+    def complete(self, start: int, stop: int) -> None:
+        """
+        Record that seeds [start, stop) of a handed-out chunk were scanned.
+
+        Args:
+            start: Start of a chunk returned by next_chunk()
+            stop: End of the scanned part, which may stop short of the chunk end
+        """
+        end = self._in_flight.pop(start)
+        if stop < end:
+            self._in_flight[stop] = end
+
 def generate_phrase_mutations(base_phrase: str, mutation_types: List[str] = None) -> List[str]:
     """
     Generate variations/mutations of a phrase for evolutionary search.
@@ -384,7 +1233,8 @@ def estimate_search_time(target_phrase: str, desired_matches: int = 1) -> Dict[s
         'alphabet_size': alphabet_size
     }
 
-def find_echo_pages(seed1: int, seed2: int, page_length: int = PAGE_LENGTH) -> Dict[str, any]:
+def find_echo_pages(seed1: int, seed2: int, page_length: int = PAGE_LENGTH,
+                    metrics: Optional[Iterable[str]] = None) -> Dict[str, any]:
     """
     Compare two pages by seed to detect echo patterns.
     
@@ -392,16 +1242,17 @@ def find_echo_pages(seed1: int, seed2: int, page_length: int = PAGE_LENGTH) -> D
         seed1: First page seed
         seed2: Second page seed
         page_length: Length of pages to generate
+        metrics: compare_pages metrics to compute (default: all)
         
     Returns:
         Dictionary with echo analysis results
     """
-    from babel_core import generate_page, compare_pages
+    from babel_core import cached_page, compare_pages
     
-    page1 = generate_page(seed1, page_length)
-    page2 = generate_page(seed2, page_length)
+    page1 = cached_page(seed1, page_length)
+    page2 = cached_page(seed2, page_length)
     
-    comparison = compare_pages(page1, page2)
+    comparison = compare_pages(page1, page2, metrics)
     
     # Add seed information
     comparison.update({
@@ -414,12 +1265,58 @@ def find_echo_pages(seed1: int, seed2: int, page_length: int = PAGE_LENGTH) -> D
     
     return comparison
 
+# Q-gram length of the second lower bound in search_for_similar_pages()
+SIMILARITY_QGRAM = 3
+
+# Most q-gram count cells held in memory at once by _qgram_l1()
+_QGRAM_CELLS = 1 << 20
+
+def _qgram_l1(codes: np.ndarray, reference: np.ndarray, q: int) -> np.ndarray:
+    """
+    L1 distance between each row's q-gram counts and a reference page's.
+
+    Args:
+        codes: Symbol codes, one page per row
+        reference: Symbol codes of the reference page
+        q: Q-gram length
+
+    Returns:
+        One distance per row
+    """
+    base = len(ALPHABET)
+    bins = base ** q
+
+    def grams(rows):
+        out = np.zeros((rows.shape[0], max(0, rows.shape[1] - q + 1)), dtype=np.int64)
+        for offset in range(q):
+            out = out * base + rows[:, offset:offset + out.shape[1]]
+        return out
+
+    profile = np.bincount(grams(reference[None, :]).ravel(), minlength=bins)
+    step = max(1, _QGRAM_CELLS // bins)
+    distances = []
+    for start in range(0, len(codes), step):
+        chunk = grams(codes[start:start + step])
+        chunk += np.arange(len(chunk), dtype=np.int64)[:, None] * bins
+        counts = np.bincount(chunk.ravel(), minlength=len(chunk) * bins).reshape(-1, bins)
+        distances.append(np.abs(counts - profile).sum(axis=1))
+    return np.concatenate(distances) if distances else np.zeros(0, dtype=np.int64)
+
 def search_for_similar_pages(reference_seed: int, search_range: int = 10000, 
                            similarity_threshold: float = 80.0,
                            max_results: int = 10) -> List[Dict[str, any]]:
     """
     Search for pages similar to a reference page within a seed range.
     
+    Candidates go through a cascade of lower bounds on their edit distance
+    to the reference, cheapest first, and are dropped as soon as a bound
+    rules out the threshold: half the L1 distance between character counts
+    (an edit changes it by at most two), then the L1 distance between
+    q-gram counts divided by 2q. Survivors get a bit-parallel Levenshtein
+    computation (levenshtein_within, in place of a banded Ukkonen one) that
+    stops once the distance budget is exceeded. The result is the same
+    as computing similarity_percentage() for every page.
+    
     Args:
         reference_seed: Seed of the reference page
         search_range: Range of seeds to search (±range around reference)
@@ -429,47 +1326,77 @@ def search_for_similar_pages(reference_seed: int, search_range: int = 10000,
     Returns:
         List of similar pages with comparison data
     """
-    from babel_core import generate_page, similarity_percentage
+    from babel_core import encode_page, cached_page, iter_page_batches, levenshtein_within
     
-    reference_page = generate_page(reference_seed, PAGE_LENGTH)
+    reference_page = cached_page(reference_seed, PAGE_LENGTH)
+    reference_codes = encode_page(reference_page)
     similar_pages = []
     
     start_seed = max(0, reference_seed - search_range)
     end_seed = reference_seed + search_range
     
-    for seed in range(start_seed, end_seed + 1):
-        if seed == reference_seed:
-            continue
-            
-        test_page = generate_page(seed, PAGE_LENGTH)
-        similarity = similarity_percentage(reference_page, test_page)
+    # similarity_percentage() for equal-length pages, as a function of distance
+    def similarity_at(distance):
+        return ((PAGE_LENGTH - distance) / PAGE_LENGTH) * 100
+    max_distance = next((d for d in range(PAGE_LENGTH, -1, -1)
+                         if similarity_at(d) >= similarity_threshold), -1)
+    
+    # (q, divisor) for each bound: distance >= ceil(L1 of q-gram counts / divisor)
+    bounds = [(1, 2), (SIMILARITY_QGRAM, 2 * SIMILARITY_QGRAM)]
+    
+    seeds = (seed for seed in range(start_seed, end_seed + 1) if seed != reference_seed)
+    for batch, codes in iter_page_batches(seeds, PAGE_LENGTH):
+        candidates = np.arange(len(batch))
+        for q, divisor in bounds:
+            if not len(candidates):
+                break
+            l1 = _qgram_l1(codes[candidates], reference_codes, q)
+            candidates = candidates[-(-l1 // divisor) <= max_distance]
         
-        if similarity >= similarity_threshold:
+        for row in candidates:
+            test_page = ALPHABET_BYTES[codes[row]].tobytes().decode('ascii')
+            distance = levenshtein_within(reference_page, test_page, max_distance)
+            if distance is None:
+                continue
+            seed = batch[row]
             similar_pages.append({
                 'reference_seed': reference_seed,
                 'similar_seed': seed,
-                'similarity': similarity,
+                'similarity': similarity_at(distance),
                 'seed_distance': abs(seed - reference_seed),
                 'page': test_page
             })
             
             if len(similar_pages) >= max_results:
-                break
+                return sorted(similar_pages, key=lambda x: x['similarity'], reverse=True)
     
     return sorted(similar_pages, key=lambda x: x['similarity'], reverse=True)
 
-def generate_comparison_grid(center_seed: int, grid_size: int = 3) -> Dict[str, any]:
+# Page pairs below which a comparison grid is compared serially; a process
+# pool only pays for its start-up and page copies on larger grids
+GRID_POOL_MIN_PAIRS = 100
+
+def generate_comparison_grid(center_seed: int, grid_size: int = 3,
+                             metric: str = 'levenshtein',
+                             workers: Optional[int] = None,
+                             on_row: Optional[Callable[[int, Dict[int, float]], None]] = None) -> Dict[str, any]:
     """
     Generate a grid of pages around a center seed for comparison.
     
     Args:
         center_seed: Central seed for the grid
         grid_size: Size of the grid (should be odd number)
+        metric: Similarity metric (see babel_core.SIMILARITY_METRICS)
+        workers: Worker processes for the similarity matrix (defaults to
+            the CPU count for grids of at least GRID_POOL_MIN_PAIRS pairs,
+            otherwise serial)
+        on_row: Passed to calculate_page_similarity_matrix; called with each
+            row of the flattened grid's similarity matrix as it arrives
         
     Returns:
         Dictionary with grid data and comparison metrics
     """
-    from babel_core import generate_page, calculate_page_similarity_matrix
+    from babel_core import cached_page, calculate_page_similarity_matrix
     
     half_size = grid_size // 2
     grid_seeds = []
@@ -484,7 +1411,7 @@ def generate_comparison_grid(center_seed: int, grid_size: int = 3) -> Dict[str,
             if seed < 0:
                 seed = abs(seed)
             
-            page = generate_page(seed, PAGE_LENGTH)
+            page = cached_page(seed, PAGE_LENGTH)
             row_seeds.append(seed)
             row_pages.append(page)
         
@@ -493,7 +1420,10 @@ def generate_comparison_grid(center_seed: int, grid_size: int = 3) -> Dict[str,
     
     # Flatten for similarity matrix calculation
     flat_pages = [page for row in grid_pages for page in row]
-    similarity_matrix = calculate_page_similarity_matrix(flat_pages)
+    if workers is None:
+        pairs = len(flat_pages) * (len(flat_pages) - 1) // 2
+        workers = multiprocessing.cpu_count() if pairs >= GRID_POOL_MIN_PAIRS else 1
+    similarity_matrix = calculate_page_similarity_matrix(flat_pages, metric, workers, on_row)
     
     return {
         'center_seed': center_seed,
@@ -515,14 +1445,14 @@ def analyze_page_neighborhood(seed: int, radius: int = 5) -> Dict[str, any]:
     Returns:
         Dictionary with neighborhood analysis
     """
-    from babel_core import generate_page, compute_entropy, similarity_percentage
+    from babel_core import cached_page, compute_entropy, similarity_percentage
     
-    reference_page = generate_page(seed, PAGE_LENGTH)
+    reference_page = cached_page(seed, PAGE_LENGTH)
     neighborhood = []
     
     for offset in range(-radius, radius + 1):
         neighbor_seed = max(0, seed + offset)
-        neighbor_page = generate_page(neighbor_seed, PAGE_LENGTH)
+        neighbor_page = cached_page(neighbor_seed, PAGE_LENGTH)
         
         similarity = similarity_percentage(reference_page, neighbor_page)
         entropy = compute_entropy(neighbor_page)
@@ -554,6 +1484,11 @@ def detect_page_patterns(pages: List[str], pattern_length: int = 10) -> Dict[str
     """
     Detect common patterns across multiple pages.
     
+    Only patterns that repeat within a page are counted, as in
+    analyze_page_patterns. All pages are counted together on integer
+    n-gram ids, so the document frequency of every pattern comes out of a
+    single bincount instead of a scan of every page per pattern.
+    
     Args:
         pages: List of page contents to analyze
         pattern_length: Length of patterns to search for
@@ -561,22 +1496,61 @@ def detect_page_patterns(pages: List[str], pattern_length: int = 10) -> Dict[str
     Returns:
         Dictionary with pattern analysis results
     """
+    from babel_core import ngram_occurrences, is_alphabet_page
+    
+    if not all(is_alphabet_page(page) for page in pages):
+        return _detect_text_patterns(pages, pattern_length)
+    
+    occurrences = ngram_occurrences(pages, pattern_length)
+    repeated = occurrences['count'] > 1
+    page_ids = occurrences['page'][repeated]
+    grams = occurrences['gram'][repeated]
+    counts = occurrences['count'][repeated]
+    positions = occurrences['position'][repeated]
+    
+    # Entries are sorted by page, so the first entry of each n-gram is the
+    # page it first repeats in; listing patterns by that page and their
+    # position in it matches a Counter filled page by page
+    gram_ids, first = np.unique(grams, return_index=True)
+    order = np.lexsort((positions[first], page_ids[first]))
+    gram_ids, first = gram_ids[order], first[order]
+    total_counts = np.bincount(grams, weights=counts)[gram_ids].astype(np.int64)
+    pages_with_pattern = np.bincount(grams)[gram_ids]
+    texts = [pages[p][i:i + pattern_length]
+             for p, i in zip(page_ids[first].tolist(), positions[first].tolist())]
+    
+    cross_page_patterns = {}
+    for text, total_count, containing in zip(texts, total_counts.tolist(), pages_with_pattern.tolist()):
+        if containing > 1:
+            cross_page_patterns[text] = {
+                'total_count': total_count,
+                'pages_containing': containing,
+                'frequency': containing / len(pages)
+            }
+    
+    top = np.argsort(-total_counts, kind='stable')[:20]
+    
+    return {
+        'total_pages': len(pages),
+        'pattern_length': pattern_length,
+        'unique_patterns': len(gram_ids),
+        'cross_page_patterns': cross_page_patterns,
+        'most_common_patterns': [(texts[i], int(total_counts[i])) for i in top],
+        'page_pattern_counts': np.bincount(page_ids, minlength=len(pages)).tolist()
+    }
+
+def _detect_text_patterns(pages: List[str], pattern_length: int) -> Dict[str, any]:
+    """detect_page_patterns for pages with characters outside ALPHABET."""
     from babel_core import analyze_page_patterns
     from collections import Counter
     
     all_patterns = Counter()
     page_patterns = []
-    
-    # Analyze patterns in each page
-    for i, page in enumerate(pages):
+    for page in pages:
         patterns = analyze_page_patterns(page, pattern_length)
         page_patterns.append(patterns)
-        
-        # Add to global pattern count
-        for pattern, count in patterns.items():
-            all_patterns[pattern] += count
+        all_patterns.update(patterns)
     
-    # Find patterns that appear in multiple pages
     cross_page_patterns = {}
     for pattern, total_count in all_patterns.items():
         pages_with_pattern = sum(1 for pp in page_patterns if pattern in pp)
@@ -45,6 +45,40 @@ def test_page_comparison():
         print(f"✗ Page comparison test failed: {e}")
         return False
 
+def test_selected_comparison_metrics():
+    """Test that compare_pages computes only the requested metrics"""
+    try:
+        from babel_core import (generate_page, compare_pages, estimate_comparison_costs,
+                                levenshtein_distance, COMPARISON_METRICS)
+        
+        page1 = generate_page(42, 500)
+        page2 = generate_page(43, 500)
+        full = compare_pages(page1, page2)
+        
+        partial = compare_pages(page1, page2, ['similarity', 'edit_distance'])
+        assert set(partial) == {'similarity_percentage', 'edit_distance'}, f"Unexpected keys: {set(partial)}"
+        assert partial['edit_distance'] == levenshtein_distance(page1, page2)
+        for metric in COMPARISON_METRICS:
+            for key, value in compare_pages(page1, page2, [metric]).items():
+                assert full[key] == value, f"{metric} gave a different {key}"
+        
+        costs = estimate_comparison_costs(len(page1), len(page2))
+        assert set(costs) == set(COMPARISON_METRICS)
+        assert list(costs.values()) == sorted(costs.values()), "Costs not ordered cheapest first"
+        assert costs['identity'] < costs['edit_distance']
+        try:
+            compare_pages(page1, page2, ['nonsense'])
+            raise AssertionError("Unknown metric accepted")
+        except ValueError:
+            pass
+        
+        print(f"✓ Selected comparison metrics working - {len(COMPARISON_METRICS)} metrics")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Selected comparison metrics test failed: {e}")
+        return False
+
 def test_difference_highlighting():
     """Test difference highlighting functionality"""
     try:
@@ -95,6 +129,43 @@ def test_common_substrings():
         print(f"✗ Common substring test failed: {e}")
         return False
 
+def test_maximal_common_substrings():
+    """Test that only maximal common substrings are reported, longest first"""
+    try:
+        import random
+        from babel_core import find_common_substrings, generate_page
+        
+        def maximal_matches(a, b, min_length):
+            found = []
+            for i in range(len(a)):
+                for j in range(len(b)):
+                    if i and j and a[i - 1] == b[j - 1]:
+                        continue
+                    length = 0
+                    while i + length < len(a) and j + length < len(b) and a[i + length] == b[j + length]:
+                        length += 1
+                    if length >= min_length:
+                        found.append((length, i, j))
+            return sorted(found, key=lambda m: (-m[0], m[1], m[2]))[:50]
+        
+        rng = random.Random(3)
+        for _ in range(200):
+            a = ''.join(rng.choices("abc", k=rng.randint(0, 40)))
+            b = ''.join(rng.choices("abc", k=rng.randint(0, 40)))
+            got = [(m['length'], m['pos1'], m['pos2']) for m in find_common_substrings(a, b, 3)]
+            assert got == maximal_matches(a, b, 3), f"Wrong matches for {a!r}, {b!r}"
+        
+        page = generate_page(9)
+        matches = find_common_substrings(page, page[100:])
+        assert matches[0]['length'] == len(page) - 100 and matches[0]['pos1'] == 100
+        
+        print(f"✓ Maximal common substrings working - {len(matches)} matches on a shifted page")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Maximal common substring test failed: {e}")
+        return False
+
 def test_echo_pages():
     """Test echo page detection"""
     try:
@@ -145,6 +216,72 @@ def test_similar_page_search():
         print(f"✗ Similar page search test failed: {e}")
         return False
 
+def test_similar_page_cascade():
+    """Test that the lower-bound cascade keeps exactly the pages a full comparison would"""
+    try:
+        from babel_core import generate_page, similarity_percentage
+        from babel_tools import search_for_similar_pages, PAGE_LENGTH
+        
+        reference = generate_page(500, PAGE_LENGTH)
+        expected = {seed: similarity_percentage(reference, generate_page(seed, PAGE_LENGTH))
+                    for seed in range(470, 531) if seed != 500}
+        
+        # Thresholds straddling the observed similarities exercise every filter stage
+        for threshold in (0.0, sorted(expected.values())[30], 80.0):
+            found = search_for_similar_pages(500, search_range=30, similarity_threshold=threshold,
+                                             max_results=100)
+            wanted = {seed: sim for seed, sim in expected.items() if sim >= threshold}
+            got = {page['similar_seed']: page['similarity'] for page in found}
+            assert got == wanted, f"Cascade changed the result at threshold {threshold}"
+        
+        print("✓ Similar page cascade matches full comparison")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Similar page cascade test failed: {e}")
+        return False
+
+def test_similarity_matrix():
+    """Test the symmetric similarity matrix engine and its metrics"""
+    try:
+        from babel_core import (calculate_page_similarity_matrix, similarity_percentage,
+                                generate_page, SIMILARITY_METRICS)
+        
+        pages = [generate_page(seed, 400) for seed in range(5)]
+        rows = []
+        matrix = calculate_page_similarity_matrix(pages, workers=2,
+                                                  on_row=lambda i, values: rows.append(i))
+        assert sorted(rows) == [0, 1, 2, 3], "Rows were not streamed"
+        for i in range(5):
+            assert matrix[i][i] == 100.0
+            for j in range(5):
+                if i != j:
+                    assert matrix[i][j] == matrix[j][i] == similarity_percentage(pages[i], pages[j])
+        
+        for metric in SIMILARITY_METRICS:
+            values = calculate_page_similarity_matrix(pages[:3], metric=metric)
+            assert all(0.0 <= v <= 100.0 for row in values for v in row), f"{metric} out of range"
+            assert values[0][1] == values[1][0], f"{metric} not symmetric"
+        try:
+            calculate_page_similarity_matrix(pages, metric="nonsense")
+            raise AssertionError("Unknown metric accepted")
+        except ValueError:
+            pass
+        
+        from babel_tools import generate_comparison_grid
+        rows = []
+        grid = generate_comparison_grid(42, 3, metric='hamming',
+                                        on_row=lambda i, values: rows.append(i))
+        assert sorted(rows) == list(range(8)), "Grid rows were not streamed"
+        assert grid['similarity_matrix'][0][1] == grid['similarity_matrix'][1][0]
+        
+        print(f"✓ Similarity matrix working - {len(SIMILARITY_METRICS)} metrics")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Similarity matrix test failed: {e}")
+        return False
+
 def test_gui_comparison_components():
     """Test that GUI comparison components can be created"""
     try:
@@ -182,10 +319,14 @@ def main():
     tests = [
         test_comparison_imports,
         test_page_comparison,
+        test_selected_comparison_metrics,
         test_difference_highlighting,
         test_common_substrings,
+        test_maximal_common_substrings,
         test_echo_pages,
         test_similar_page_search,
+        test_similar_page_cascade,
+        test_similarity_matrix,
         test_gui_comparison_components
     ]
     
@@ -68,6 +68,775 @@ def test_tools_module():
         print(f"✗ babel_tools module test failed: {e}")
         return False
 
+def test_batch_generation():
+    """Test that vectorized batch generation matches generate_page exactly"""
+    try:
+        from babel_core import generate_page, generate_pages, decode_page, encode_page, iter_pages
+        
+        # Include multi-word seeds (>= 2**32) and negative seeds
+        seeds = list(range(50)) + [2**32 - 1, 2**32, 2**40 + 7, 2**70 + 3, -12]
+        for length in (1, 7, 624, 3200):
+            pages = generate_pages(seeds, length)
+            assert pages.shape == (len(seeds), length), f"Wrong shape: {pages.shape}"
+            for seed, codes in zip(seeds, pages):
+                assert decode_page(codes) == generate_page(seed, length), \
+                    f"Batch page differs for seed {seed}, length {length}"
+        
+        # Round trip and lazy iteration
+        page = generate_page(42, 200)
+        assert decode_page(encode_page(page)) == page, "Encode/decode round trip failed"
+        assert list(iter_pages(range(3), 50)) == [(s, generate_page(s, 50)) for s in range(3)], \
+            "iter_pages does not match generate_page"
+        
+        print("✓ Batch page generation matches generate_page")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Batch generation test failed: {e}")
+        return False
+
+def test_phrase_matcher():
+    """Test multi-phrase matching against a str.find scan"""
+    try:
+        import pickle
+        from babel_core import generate_pages, decode_page, ALPHABET
+        from babel_tools import PhraseMatcher
+        
+        # Enough phrases to exercise the automaton, plus overlapping ones
+        phrases = [a + b for a in ALPHABET[:6] for b in ALPHABET[:4]] + ['a', 'aa', 'aaa']
+        pages = generate_pages(range(40), 400)
+        for matcher in (PhraseMatcher(phrases), PhraseMatcher(phrases[:5])):
+            expected = []
+            for row, codes in enumerate(pages):
+                page = decode_page(codes)
+                for phrase in matcher.phrases:
+                    idx = page.find(phrase)
+                    while idx != -1:
+                        expected.append((row, phrase, idx))
+                        idx = page.find(phrase, idx + 1)
+            hits = matcher.scan(pages)
+            assert sorted(hits) == sorted(expected), "Matcher missed or invented hits"
+            assert hits == sorted(hits, key=lambda h: (h[0], h[2], len(h[1]))), "Hits out of order"
+        
+        # Compiled automaton survives the trip to a worker process
+        matcher = pickle.loads(pickle.dumps(PhraseMatcher(phrases)))
+        assert matcher.find_all('xaab') == [('a', 1), ('aa', 1), ('a', 2), ('ab', 2)], "find_all failed"
+        
+        print(f"✓ Phrase matcher found all {len(hits)} occurrences")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Phrase matcher test failed: {e}")
+        return False
+
+def test_parallel_search():
+    """Test that the process-pool search returns the sequential first-N hits"""
+    try:
+        from babel_tools import parallel_search, search_for_phrase, search_with_wildcards
+        
+        # Small chunks force many out-of-order completions and a cutoff
+        for phrase, max_matches in [('ab', 5), ('xyz', 50)]:
+            expected = search_for_phrase(phrase, max_attempts=3000, max_matches=max_matches,
+                                         page_length=400, start_seed=11)
+            results = parallel_search(phrase, max_attempts=3000, max_matches=max_matches,
+                                      page_length=400, start_seed=11, workers=3, chunk_size=100)
+            assert results == expected, f"Parallel search diverged for '{phrase}'"
+        
+        expected = search_with_wildcards('a?c', max_attempts=2000, max_matches=8, page_length=400)
+        results = parallel_search('a?c', max_attempts=2000, max_matches=8, page_length=400,
+                                  workers=2, chunk_size=128)
+        assert results == expected, "Parallel wildcard search diverged"
+        
+        print(f"✓ Parallel search matches sequential results ({len(results)} wildcard hits)")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Parallel search test failed: {e}")
+        return False
+
+def test_windowed_search():
+    """Test anchored and windowed search against full-page scanning"""
+    try:
+        from babel_core import generate_page
+        from babel_tools import search_for_phrase
+        
+        anchored = search_for_phrase("ab", max_attempts=3000, max_matches=3, anchored=True)
+        assert anchored, "No anchored matches found"
+        for seed, index in anchored:
+            assert index == 0 and generate_page(seed).startswith("ab"), "Bad anchored match"
+        
+        windowed = search_for_phrase("abc", max_attempts=3000, max_matches=5, window=200)
+        expected = []
+        for seed in range(3000):
+            index = generate_page(seed).find("abc")
+            if 0 <= index < 200:
+                expected.append((seed, index))
+        assert windowed == expected[:5], "Windowed search diverged from full-page scan"
+        
+        print(f"✓ Anchored and windowed search working - {len(windowed)} windowed matches")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Windowed search test failed: {e}")
+        return False
+
+def test_scan_progress():
+    """Test chunked scan checkpoints resume exactly where they stopped"""
+    try:
+        from babel_tools import ScanProgress
+        
+        progress = ScanProgress()
+        first = progress.next_chunk(100)
+        second = progress.next_chunk(100)
+        third = progress.next_chunk(100)
+        progress.complete(*second)
+        progress.complete(first[0], 40)
+        
+        # Unfinished work is saved as gaps; the trailing in-flight chunk
+        # just lowers the watermark
+        saved = progress.to_dict()
+        assert saved == {'last_seed': 200, 'gaps': [[40, 100]]}, f"Unexpected checkpoint: {saved}"
+        
+        resumed = ScanProgress.from_dict(saved)
+        chunks = [resumed.next_chunk(50) for _ in range(3)]
+        assert chunks == [(40, 90), (90, 100), (200, 250)], f"Bad resume order: {chunks}"
+        for chunk in chunks:
+            resumed.complete(*chunk)
+        assert resumed.to_dict() == {'last_seed': 250, 'gaps': []}, "Gaps not cleared"
+        
+        print("✓ Scan progress checkpoints working")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Scan progress test failed: {e}")
+        return False
+
+def test_result_store():
+    """Test the SQLite background result store"""
+    try:
+        import json
+        import os
+        import tempfile
+        from babel_store import ResultStore, open_result_store
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = os.path.join(tmp, 'background_results.json')
+            with open(legacy, 'w', encoding='utf-8') as f:
+                json.dump([{'phrase': 'abc', 'seed': 7, 'index': 3,
+                            'timestamp': '2025-01-01T00:00:00'}], f)
+            
+            path = os.path.join(tmp, 'results.db')
+            with open_result_store(path, legacy) as store:
+                assert store.count() == 1, "Legacy results not imported"
+                for seed in range(10, 20):
+                    result = {'phrase': 'abc' if seed % 2 else 'xyz', 'seed': seed, 'index': seed,
+                              'indices': [seed], 'timestamp': f'2025-01-02T00:00:{seed}'}
+                    assert store.add(result), "New result rejected"
+                assert not store.add(dict(result)), "Duplicate (seed, phrase) accepted"
+            
+            # Committed results survive reopening and can be filtered
+            with ResultStore(path) as store:
+                assert store.count() == 11, f"Wrong result count: {store.count()}"
+                assert store.phrase_counts() == {'abc': 6, 'xyz': 5}, "Wrong phrase counts"
+                assert [r['seed'] for r in store.query(phrase='abc', seed_range=(0, 15))] == [7, 11, 13]
+                assert store.count(since='2025-01-02T00:00:15') == 5, "Time filter failed"
+                assert store.query(limit=1)[0] == {'phrase': 'abc', 'seed': 7, 'index': 3,
+                                                   'timestamp': '2025-01-01T00:00:00'}
+            
+            # An import interrupted after some commits is finished on the next open
+            legacy_results = [{'phrase': 'abc', 'seed': seed, 'index': 0,
+                               'timestamp': '2025-01-01T00:00:00'} for seed in range(5)]
+            with open(legacy, 'w', encoding='utf-8') as f:
+                json.dump(legacy_results, f)
+            partial = os.path.join(tmp, 'partial.db')
+            with ResultStore(partial) as store:
+                store.add(legacy_results[0])
+            with open_result_store(partial, legacy) as store:
+                assert store.count() == 5 and store.imported(legacy), "Interrupted import not resumed"
+            with open(legacy, 'w', encoding='utf-8') as f:
+                json.dump(legacy_results + [dict(legacy_results[0], seed=99)], f)
+            with open_result_store(partial, legacy) as store:
+                assert store.count() == 5, "Completed import repeated"
+        
+        print("✓ Result store working")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Result store test failed: {e}")
+        return False
+
+def test_progress_flush():
+    """Test the flush policy and atomic progress writes"""
+    try:
+        import json
+        import os
+        import tempfile
+        from babel_store import FlushPolicy, write_json_atomic
+        
+        policy = FlushPolicy(every_pages=1000, every_seconds=3600)
+        assert not policy.record(600), "Flush due too early"
+        assert policy.record(600), "Flush not due after page limit"
+        policy.reset()
+        assert not policy.record(10), "Reset did not clear the page count"
+        assert FlushPolicy(every_pages=10**9, every_seconds=0).record(1), "Time limit ignored"
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'progress.json')
+            write_json_atomic(path, {'last_seed': 5, 'gaps': []})
+            write_json_atomic(path, {'last_seed': 9, 'gaps': [[1, 2]]}, fsync=True)
+            with open(path, 'r', encoding='utf-8') as f:
+                assert json.load(f) == {'last_seed': 9, 'gaps': [[1, 2]]}, "Progress not replaced"
+            assert os.listdir(tmp) == ['progress.json'], "Temporary file left behind"
+        
+        print("✓ Progress flush policy and atomic writes working")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Progress flush test failed: {e}")
+        return False
+
+def test_streaming_search():
+    """Test the streaming search API, cancellation and deadlines"""
+    try:
+        import threading
+        import time
+        from babel_tools import iter_search, search_for_phrase
+        
+        records = list(iter_search("ab", max_attempts=3000, max_matches=5, page_length=400,
+                                   progress_interval=1))
+        hits = [(r['seed'], r['index']) for r in records if r['type'] == 'hit']
+        assert hits == search_for_phrase("ab", max_attempts=3000, max_matches=5, page_length=400)
+        assert any(r['type'] == 'progress' for r in records), "No progress records"
+        done = records[-1]
+        assert done['type'] == 'done' and done['reason'] == 'max_matches', f"Bad final record: {done}"
+        assert done['next_seed'] == hits[-1][0] + 1, "Coverage should end after the last hit"
+        
+        # A cancelled search reports exactly how far it got
+        cancel = threading.Event()
+        cancel.set()
+        done = list(iter_search("ab", max_attempts=3000, cancel=cancel))[-1]
+        assert done['reason'] == 'cancelled' and done['next_seed'] == 0, f"Cancel ignored: {done}"
+        
+        done = list(iter_search("zzzzzzzz", max_attempts=10**9, deadline=time.time() + 0.2))[-1]
+        assert done['reason'] == 'deadline' and done['scanned'] == done['next_seed'] > 0
+        
+        print(f"✓ Streaming search working - stopped at deadline after {done['scanned']} pages")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Streaming search test failed: {e}")
+        return False
+
+def test_page_bus():
+    """Test that searches sharing a PageBus generate each page once"""
+    try:
+        import threading
+        from babel_core import generate_page, decode_page
+        from babel_bus import PageBus, PageConsumer
+        from babel_tools import iter_search, search_for_phrase
+        
+        class Recorder(PageConsumer):
+            def __init__(self, start, stop, page_length):
+                super().__init__(start, stop, page_length)
+                self.pages = {}
+            def feed(self, seeds, codes):
+                for seed, row in zip(seeds, codes):
+                    self.pages[seed] = decode_page(row)
+        
+        bus = PageBus(batch_size=256)
+        hits = [(r['seed'], r['index']) for r in iter_search("ab", max_attempts=3000, max_matches=5,
+                                                             page_length=400, bus=bus)
+                if r['type'] == 'hit']
+        assert hits == search_for_phrase("ab", max_attempts=3000, max_matches=5, page_length=400)
+        
+        # Two overlapping consumers; the second joins while the first is mid-scan
+        bus = PageBus(batch_size=256)
+        first = Recorder(0, 3000, 200)
+        second = Recorder(1000, 4000, 100)
+        joined = threading.Event()
+        feed = first.feed
+        def feed_and_join(seeds, codes):
+            feed(seeds, codes)
+            if seeds[0] >= 1500 and not joined.is_set():
+                joined.set()
+                bus.subscribe(second)
+        first.feed = feed_and_join
+        bus.subscribe(first)
+        assert first.finished.wait(30) and second.finished.wait(30), "Consumers never finished"
+        
+        assert sorted(first.pages) == list(range(0, 3000)), "First consumer missed pages"
+        assert sorted(second.pages) == list(range(1000, 4000)), "Late joiner did not catch up"
+        assert second.pages[1234] == generate_page(1234, 100), "Wrong page delivered"
+        assert bus.pages_generated < 6000, f"Pages generated twice: {bus.pages_generated}"
+        
+        # A consumer that fails leaves the bus able to serve later searches
+        bus = PageBus(batch_size=256)
+        broken = Recorder(0, 1000, 100)
+        def fail(seeds, codes):
+            raise RuntimeError("feed failed")
+        broken.feed = fail
+        bus.subscribe(broken)
+        assert broken.finished.wait(30) and isinstance(broken.error, RuntimeError)
+        hits = [(r['seed'], r['index']) for r in iter_search("ab", max_attempts=3000, max_matches=5,
+                                                             page_length=400, bus=bus)
+                if r['type'] == 'hit']
+        assert hits == search_for_phrase("ab", max_attempts=3000, max_matches=5, page_length=400)
+        
+        print(f"✓ Page bus working - {bus.pages_generated} pages served 6000 requests")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Page bus test failed: {e}")
+        return False
+
+def test_search_ledger():
+    """Test that repeat searches are answered from the coverage ledger"""
+    try:
+        import os
+        import tempfile
+        from babel_store import SearchLedger
+        from babel_tools import iter_search, search_for_phrase
+        
+        def run(ledger, **kwargs):
+            records = list(iter_search("abc", page_length=100, ledger=ledger, **kwargs))
+            return [(r['seed'], r['index']) for r in records if r['type'] == 'hit'], records[-1]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with SearchLedger(os.path.join(tmp, 'ledger.db')) as ledger:
+                hits, done = run(ledger, max_attempts=2000, max_matches=50)
+                assert hits == search_for_phrase("abc", 2000, 50, 100)
+                assert done['cached'] == 0 and done['scanned'] == 2000
+                
+                hits, done = run(ledger, max_attempts=2000, max_matches=50)
+                assert hits == search_for_phrase("abc", 2000, 50, 100), "Ledger replay differs"
+                assert done['scanned'] == 0 and done['cached'] == 2000, f"Repeat search rescanned: {done}"
+                
+                # Raising max_attempts only scans the new seeds
+                hits, done = run(ledger, max_attempts=3000, max_matches=50)
+                assert hits == search_for_phrase("abc", 3000, 50, 100)
+                assert done['scanned'] == 1000 and done['cached'] == 2000, f"Extension rescanned: {done}"
+                assert ledger.covered(("abc", False, 100), 0, 10**6) == [(0, 3000)]
+                
+                # A longer phrase only needs the pages where "abc" was found
+                records = list(iter_search("xabc", max_attempts=3000, max_matches=50,
+                                           page_length=100, ledger=ledger))
+                hits = [(r['seed'], r['index']) for r in records if r['type'] == 'hit']
+                assert hits == search_for_phrase("xabc", 3000, 50, 100), "Containment reuse differs"
+                assert records[-1]['scanned'] < 100, f"Superstring search rescanned: {records[-1]}"
+        
+        print("✓ Search ledger working - repeat and superstring searches skip covered seeds")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Search ledger test failed: {e}")
+        return False
+
+def test_levenshtein():
+    """Test the bit-parallel edit distance against the plain DP table"""
+    try:
+        import random
+        import time
+        from babel_core import levenshtein_distance, levenshtein_within, generate_page
+        
+        def reference(a, b):
+            row = list(range(len(b) + 1))
+            for i, x in enumerate(a, 1):
+                prev, row[0] = row[0], i
+                for j, y in enumerate(b, 1):
+                    prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (x != y))
+            return row[-1]
+        
+        rng = random.Random(7)
+        for _ in range(500):
+            a = ''.join(rng.choices("ab ,", k=rng.randint(0, 80)))
+            b = ''.join(rng.choices("ab ,", k=rng.randint(0, 80)))
+            assert levenshtein_distance(a, b) == reference(a, b), f"Wrong distance for {a!r}, {b!r}"
+        assert levenshtein_distance("kitten", "sitting") == 3
+        assert levenshtein_within("kitten", "sitting", 3) == 3
+        assert levenshtein_within("kitten", "sitting", 2) is None
+        for _ in range(200):
+            a = ''.join(rng.choices("ab", k=rng.randint(0, 40)))
+            b = ''.join(rng.choices("ab", k=rng.randint(0, 40)))
+            limit = rng.randint(0, 40)
+            distance = reference(a, b)
+            assert levenshtein_within(a, b, limit) == (distance if distance <= limit else None)
+        
+        page1, page2 = generate_page(1), generate_page(2)
+        start = time.time()
+        distance = levenshtein_distance(page1, page2)
+        elapsed = time.time() - start
+        assert distance == levenshtein_distance(page2, page1), "Distance not symmetric"
+        assert elapsed < 1.0, f"Full-page distance too slow: {elapsed:.2f}s"
+        
+        print(f"✓ Levenshtein distance working - full pages in {elapsed * 1000:.1f} ms")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Levenshtein test failed: {e}")
+        return False
+
+def test_twin_index():
+    """Test MinHash/LSH twin lookup against an exact comparison"""
+    try:
+        import os
+        import random
+        import tempfile
+        from babel_core import generate_page, detect_twin_pages, similarity_percentage
+        from babel_store import TwinIndex
+        
+        page = generate_page(1234)
+        rng = random.Random(5)
+        chars = list(page)
+        for _ in range(64):
+            chars[rng.randrange(len(chars))] = rng.choice("abc")
+        near_copy = ''.join(chars)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with TwinIndex(os.path.join(tmp, 'twins.db')) as index:
+                assert index.add_range(0, 1500) == 1500
+                assert index.add_range(1000, 2000) == 500, "Indexed pages were redone"
+                assert index.covered(0, 10**6) == [(0, 2000)] and index.count() == 2000
+                
+                twins = index.find_twins(near_copy, 95.0)
+                assert [t['seed'] for t in twins] == [1234], f"Twin not found: {twins}"
+                assert twins[0]['similarity'] == similarity_percentage(near_copy, page)
+                assert detect_twin_pages(page, index=index)[0]['type'] == 'identical_hash'
+                assert index.find_twins(page, 95.0, exclude_seed=1234) == []
+        
+        print("✓ Twin index working - near copy found among 2000 indexed pages")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Twin index test failed: {e}")
+        return False
+
+def test_page_cache():
+    """Test the byte-bounded LRU page cache"""
+    try:
+        import threading
+        from babel_core import PageCache, generate_page, cached_page
+        
+        cache = PageCache(max_bytes=20000)
+        # Prefixes are served by slicing; longer requests extend the cached page
+        for length in (100, 40, 1000, 3200, 2000, 5000):
+            assert cache.page(11, length) == generate_page(11, length), f"Wrong page at length {length}"
+        assert cache.hits == 2 and cache.misses == 4, f"{cache.hits} hits, {cache.misses} misses"
+        
+        for seed in range(20):
+            cache.page(seed, 3200)
+        assert cache.bytes <= 20000 and len(cache) == 6, f"Budget exceeded: {cache.bytes} bytes"
+        assert cache.codes(19, 3200).flags.writeable is False
+        
+        # Concurrent requests for one seed generate it once
+        cache = PageCache()
+        threads = [threading.Thread(target=cache.page, args=(77, 3200)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.misses == 1 and cache.hits == 7
+        assert cached_page(77) == generate_page(77)
+        
+        print("✓ Page cache working - prefixes reused within a byte budget")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Page cache test failed: {e}")
+        return False
+
+def test_page_view():
+    """Test the compact PageView against plain page strings"""
+    try:
+        import json
+        import random
+        import numpy as np
+        from collections import Counter
+        from babel_core import (PageView, pack_codes, unpack_codes, generate_page, generate_pages,
+                                get_page_statistics, compute_page_hash, format_page_output)
+        
+        codes = generate_pages(range(4), 99)
+        packed = pack_codes(codes)
+        assert packed.shape == (4, 62) and (unpack_codes(packed, 99) == codes).all()
+        
+        text = generate_page(321)
+        rng = random.Random(23)
+        for view in (PageView.from_seed(321), PageView.from_text(text), PageView.from_text(text).pack()):
+            assert str(view) == text and len(view) == len(text)
+            for _ in range(20):
+                i, j = sorted(rng.sample(range(len(text)), 2))
+                assert view[i:j] == text[i:j] and view[i] == text[i]
+                assert view.find(text[i:i + 4], j) == text.find(text[i:i + 4], j)
+            assert view.find("Q") == -1 and "Q" not in view
+            assert compute_page_hash(view) == compute_page_hash(text)
+            assert get_page_statistics(view) == get_page_statistics(text)
+            assert format_page_output(view, highlight="xyz", highlight_index=5) == \
+                format_page_output(text, highlight="xyz", highlight_index=5)
+            counts = Counter(text[k:k + 3] for k in range(len(text) - 2))
+            assert view.most_common(3, 5) == sorted(counts.items(), key=lambda x: x[1], reverse=True)[:5]
+            assert json.loads(json.dumps({'page': view}, default=str))['page'] == text
+        
+        shared = PageView.from_seed(321)
+        assert shared == PageView.from_text(text).pack() and hash(shared) == hash(PageView.from_text(text))
+        assert PageView.from_text(text).pack().nbytes == 2000
+        assert np.shares_memory(shared.view(10, 20).codes, shared.codes), "Sub-view copied the page"
+        
+        print("✓ PageView working - packed page holds 2000 bytes, sub-views share the buffer")
+        return True
+        
+    except Exception as e:
+        print(f"✗ PageView test failed: {e}")
+        return False
+
+def test_page_corpus():
+    """Test that a packed page corpus serves the same pages as the generator"""
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from babel_core import (build_page_corpus, mount_corpus, unmount_corpus, PageCorpus,
+                                generate_pages, generate_page, pack_codes, unpack_codes,
+                                iter_pages, page_cache, cached_page, mount_corpora, mounted_corpora)
+        from babel_tools import iter_search
+        from babel_store import mount_corpus_dir
+        
+        codes = generate_pages(range(3), 101)
+        assert (unpack_codes(pack_codes(codes), 101) == codes).all(), "Pack round trip failed"
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'low.corpus')
+            corpus = build_page_corpus(path, 100, 700, 300, workers=2)
+            assert len(corpus) == 600 and os.path.getsize(path) == 32 + 600 * 188
+            assert (corpus.codes(range(100, 700)) == generate_pages(range(100, 700), 300)).all()
+            assert (corpus.codes([650, 101], 40) == generate_pages([650, 101], 40)).all()
+            assert isinstance(corpus.packed(200, 210), np.memmap), "Packed pages were copied"
+            
+            seeds = [5, 100, 699, 700, 250]
+            reference = generate_pages(seeds, 300)
+            expected = list(iter_search('ab', 1000, 50, page_length=300))
+            mount_corpus(corpus)
+            try:
+                # Worker processes remount by path without mounting twice
+                mount_corpora([path])
+                assert mounted_corpora() == [corpus]
+                assert (generate_pages(seeds, 300) == reference).all()
+                assert all(page == generate_page(seed, 120) for seed, page in iter_pages(range(90, 710), 120))
+                page_cache.clear()
+                assert cached_page(300, 250) == generate_page(300, 250)
+                found = list(iter_search('ab', 1000, 50, page_length=300))
+                assert [r for r in found if r['type'] == 'hit'] == [r for r in expected if r['type'] == 'hit']
+            finally:
+                unmount_corpus(corpus)
+                corpus.close()
+            
+            with open(path, 'r+b') as f:
+                f.truncate(1000)
+            try:
+                PageCorpus(path)
+                raise AssertionError("Truncated corpus accepted")
+            except ValueError:
+                pass
+            
+            # A bad corpus is skipped without keeping the others from mounting
+            build_page_corpus(os.path.join(tmp, 'next.corpus'), 700, 800, 100).close()
+            mounted, skipped = mount_corpus_dir(tmp)
+            try:
+                assert [c.start for c in mounted] == [700] and [p for p, _ in skipped] == [path]
+            finally:
+                for c in mounted:
+                    unmount_corpus(c)
+                    c.close()
+        
+        print("✓ Page corpus working - packed pages match the generator")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Page corpus test failed: {e}")
+        return False
+
+def test_page_stats_cache():
+    """Test the persistent per-seed page statistics cache"""
+    try:
+        import os
+        import tempfile
+        from babel_core import generate_page, get_page_statistics
+        from babel_store import PageStatsCache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with PageStatsCache(tmp, page_length=400) as cache:
+                stats = cache.lookup([7, 3, 7])
+                assert stats['seed'].tolist() == [7, 3, 7] and len(cache) == 2
+                assert cache.page_statistics(3) == get_page_statistics(generate_page(3, 400))
+            
+            # A torn append is ignored and the cached entries survive reopening
+            with open(os.path.join(tmp, 'v1-400.entropy'), 'ab') as f:
+                f.write(b'\0' * 5)
+            with PageStatsCache(tmp, page_length=400, workers=2) as cache:
+                assert len(cache) == 2, "Cached entries lost on reopen"
+                seeds = list(range(1000, 2200))
+                entropies = cache.lookup(seeds)['entropy']
+                assert len(cache) == 1202
+                assert cache.lookup(seeds)['entropy'].tolist() == entropies.tolist()
+                assert cache.page_statistics(2000) == get_page_statistics(generate_page(2000, 400))
+        
+        print("✓ Page statistics cache working - entries persist and fill in batches")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Page statistics cache test failed: {e}")
+        return False
+
+def test_seed_only_records():
+    """Test that results and bookmarks drop their page text and regenerate it"""
+    try:
+        import json
+        from babel_core import generate_page, GENERATOR_VERSION
+        from babel_store import seed_only_record, record_page
+        
+        legacy = {'seed': 12, 'index': 5, 'phrase': 'abc', 'notes': 'x', 'page': generate_page(12, 700)}
+        record = seed_only_record(legacy)
+        assert 'page' not in record and 'page' in legacy, "Page not dropped from a copy"
+        assert record['length'] == 700 and record['generator_version'] == GENERATOR_VERSION
+        assert record['notes'] == 'x'
+        assert str(record_page(record)) == legacy['page']
+        assert seed_only_record({'seed': 4, 'index': 0, 'phrase': 'a'}, 300)['length'] == 300
+        assert len(json.dumps(record)) < 200, "Record still holds page-sized data"
+        
+        try:
+            record_page(dict(record, generator_version=GENERATOR_VERSION + 1))
+            raise AssertionError("Page from another generator version accepted")
+        except ValueError:
+            pass
+        
+        print("✓ Seed-only records working - pages regenerate from seed and length")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Seed-only record test failed: {e}")
+        return False
+
+def test_longest_common_substring():
+    """Test the suffix-automaton longest common substring against the DP table"""
+    try:
+        import random
+        from babel_core import (longest_common_substring, find_longest_common_substring,
+                                generate_page)
+        
+        def reference(a, b):
+            best, end1, end2 = 0, 0, 0
+            row = [0] * (len(b) + 1)
+            for i in range(1, len(a) + 1):
+                prev = 0
+                for j in range(1, len(b) + 1):
+                    prev, row[j] = row[j], (prev + 1 if a[i - 1] == b[j - 1] else 0)
+                    if row[j] > best:
+                        best, end1, end2 = row[j], i, j
+            return best, end1 - best, end2 - best
+        
+        rng = random.Random(11)
+        for _ in range(500):
+            a = ''.join(rng.choices("abc", k=rng.randint(0, 30)))
+            b = ''.join(rng.choices("abc", k=rng.randint(0, 30)))
+            assert find_longest_common_substring(a, b) == reference(a, b), f"Mismatch for {a!r}, {b!r}"
+        assert longest_common_substring("hello world", "hello there") == "hello "
+        
+        page1, page2 = generate_page(1), generate_page(2)
+        length, start1, start2 = find_longest_common_substring(page1, page2)
+        assert length > 0 and page1[start1:start1 + length] == page2[start2:start2 + length]
+        
+        print(f"✓ Longest common substring working - {length} characters shared by two pages")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Longest common substring test failed: {e}")
+        return False
+
+def test_page_statistics():
+    """Test fused page statistics against the per-walk helpers"""
+    try:
+        import math
+        import random
+        from collections import Counter
+        from babel_core import (get_page_statistics, batch_page_statistics, generate_pages,
+                                decode_page, compute_entropy, analyze_page_patterns, ALPHABET)
+        
+        rng = random.Random(18)
+        for _ in range(300):
+            page = ''.join(rng.choices(ALPHABET[:rng.randint(1, 29)], k=rng.randint(0, 40)))
+            stats = get_page_statistics(page)
+            assert math.isclose(stats['entropy'], compute_entropy(page), abs_tol=1e-12)
+            assert stats['unique_chars'] == len(set(page))
+            assert stats['most_common_char'] == (Counter(page).most_common(1)[0] if page else None)
+            assert stats['patterns_3char'] == len(analyze_page_patterns(page, 3))
+            assert stats['patterns_4char'] == len(analyze_page_patterns(page, 4))
+        
+        # Code arrays and texts give the same columns
+        codes = generate_pages(range(20), 300)
+        from_codes = batch_page_statistics(codes)
+        from_text = batch_page_statistics([decode_page(row) for row in codes])
+        assert all((from_codes[key] == from_text[key]).all() for key in from_codes)
+        assert from_codes['histogram'].sum() == 20 * 300
+        
+        try:
+            batch_page_statistics(["ABC"])
+            raise AssertionError("Characters outside the alphabet accepted")
+        except ValueError:
+            pass
+        
+        # Other text falls back to counting characters directly
+        for page in ["Hello, World!\nHello, World!", "café café"]:
+            stats = get_page_statistics(page)
+            assert stats['length'] == len(page)
+            assert math.isclose(stats['entropy'], compute_entropy(page), abs_tol=1e-12)
+            assert stats['most_common_char'] == Counter(page).most_common(1)[0]
+            assert stats['patterns_3char'] == len(analyze_page_patterns(page, 3)) > 0
+        
+        print("✓ Page statistics working - fused batch matches per-page helpers")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Page statistics test failed: {e}")
+        return False
+
+def test_pattern_detection():
+    """Test vectorized n-gram patterns within and across pages"""
+    try:
+        import random
+        from collections import Counter
+        from babel_core import analyze_page_patterns, ALPHABET
+        from babel_tools import detect_page_patterns
+        
+        def repeats(page, n):
+            counts = Counter(page[i:i + n] for i in range(len(page) - n + 1))
+            return {pattern: count for pattern, count in counts.items() if count > 1}
+        
+        rng = random.Random(19)
+        for _ in range(200):
+            n = rng.choice([1, 2, 3, 13])
+            symbols = rng.choice([ALPHABET[:3], "aB\n", "é. "])
+            pages = [''.join(rng.choices(symbols, k=rng.randint(0, 30)))
+                     for _ in range(rng.randint(1, 5))]
+            per_page = [repeats(page, n) for page in pages]
+            assert analyze_page_patterns(pages[0], n) == per_page[0]
+            assert list(analyze_page_patterns(pages[0], n)) == list(per_page[0]), "Order changed"
+            
+            result = detect_page_patterns(pages, n)
+            totals = Counter()
+            for patterns in per_page:
+                totals.update(patterns)
+            assert result['unique_patterns'] == len(totals)
+            assert result['most_common_patterns'] == totals.most_common(20)
+            assert result['page_pattern_counts'] == [len(patterns) for patterns in per_page]
+            for pattern, info in result['cross_page_patterns'].items():
+                assert info['pages_containing'] == sum(pattern in pp for pp in per_page) > 1
+                assert info['total_count'] == totals[pattern]
+        
+        print("✓ Pattern detection working - n-gram counts match per-substring counting")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Pattern detection test failed: {e}")
+        return False
+
 def test_module_integration():
     """Test that modules work together"""
     try:
@@ -101,6 +870,26 @@ def main():
     tests = [
         test_core_module,
         test_tools_module, 
+        test_batch_generation,
+        test_phrase_matcher,
+        test_parallel_search,
+        test_windowed_search,
+        test_scan_progress,
+        test_result_store,
+        test_progress_flush,
+        test_streaming_search,
+        test_page_bus,
+        test_search_ledger,
+        test_levenshtein,
+        test_twin_index,
+        test_page_cache,
+        test_page_view,
+        test_page_corpus,
+        test_page_stats_cache,
+        test_seed_only_records,
+        test_longest_common_substring,
+        test_page_statistics,
+        test_pattern_detection,
         test_module_integration
     ]
     